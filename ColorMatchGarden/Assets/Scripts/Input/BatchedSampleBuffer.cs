@@ -0,0 +1,127 @@
+using System;
+using System.Collections.Generic;
+using System.Diagnostics;
+
+namespace ColorMatchGarden.Core
+{
+    /// <summary>
+    /// Playback buffer for batched sensor datagrams from the Python bridges
+    /// (--batch). A batch is "B:count" followed by "offset_us|message" lines.
+    /// Samples are placed on a local timeline with their original spacing and
+    /// read back slightly behind real time, interpolating between neighbours.
+    /// AddBatch is called from the UDP thread, Sample from Update().
+    /// </summary>
+    public class BatchedSampleBuffer
+    {
+        private const int MaxSamples = 256;
+
+        private struct TimedSample
+        {
+            public double Time;
+            public float[] Values;
+        }
+
+        private readonly int channels;
+        private readonly List<TimedSample> samples = new List<TimedSample>();
+        private readonly Stopwatch clock = Stopwatch.StartNew();
+        private readonly object sync = new object();
+
+        public BatchedSampleBuffer(int channels)
+        {
+            this.channels = channels;
+        }
+
+        public static bool IsBatch(string message)
+        {
+            return message.StartsWith("B:", StringComparison.Ordinal);
+        }
+
+        /// <summary>
+        /// Adds every sample of a batch. parseMessage fills the values array
+        /// from one sample's message and returns false to skip it.
+        /// </summary>
+        public void AddBatch(string message, Func<string, float[], bool> parseMessage)
+        {
+            // The newest sample is "now"; earlier ones are placed by offset
+            double now = clock.Elapsed.TotalSeconds;
+            string[] lines = message.Split('\n');
+            var offsets = new List<long>(lines.Length);
+            var parsed = new List<float[]>(lines.Length);
+
+            for (int i = 1; i < lines.Length; i++)
+            {
+                int bar = lines[i].IndexOf('|');
+                if (bar <= 0 || !long.TryParse(lines[i].Substring(0, bar), out long offset)) continue;
+                float[] values = new float[channels];
+                if (!parseMessage(lines[i].Substring(bar + 1), values)) continue;
+                offsets.Add(offset);
+                parsed.Add(values);
+            }
+            if (parsed.Count == 0) return;
+
+            long lastOffset = offsets[offsets.Count - 1];
+            lock (sync)
+            {
+                for (int i = 0; i < parsed.Count; i++)
+                {
+                    double time = now - (lastOffset - offsets[i]) / 1e6;
+                    // Keep the timeline ordered when batches overlap
+                    if (samples.Count > 0 && time < samples[samples.Count - 1].Time)
+                    {
+                        time = samples[samples.Count - 1].Time;
+                    }
+                    samples.Add(new TimedSample { Time = time, Values = parsed[i] });
+                }
+                if (samples.Count > MaxSamples)
+                {
+                    samples.RemoveRange(0, samples.Count - MaxSamples);
+                }
+            }
+        }
+
+        /// <summary>
+        /// Interpolated values at (now - delay) seconds. Returns false until
+        /// the first batch has arrived.
+        /// </summary>
+        public bool Sample(double delay, float[] result)
+        {
+            double time = clock.Elapsed.TotalSeconds - delay;
+            lock (sync)
+            {
+                if (samples.Count == 0) return false;
+
+                // Drop samples that are fully in the past, keep the last one
+                int passed = 0;
+                while (passed + 1 < samples.Count && samples[passed + 1].Time <= time)
+                {
+                    passed++;
+                }
+                if (passed > 0) samples.RemoveRange(0, passed);
+
+                TimedSample a = samples[0];
+                if (samples.Count == 1 || time <= a.Time)
+                {
+                    Array.Copy(a.Values, result, channels);
+                    return true;
+                }
+
+                TimedSample b = samples[1];
+                double span = b.Time - a.Time;
+                float t = span > 0 ? (float)((time - a.Time) / span) : 1f;
+                for (int i = 0; i < channels; i++)
+                {
+                    result[i] = a.Values[i] + (b.Values[i] - a.Values[i]) * t;
+                }
+                return true;
+            }
+        }
+
+        public void Clear()
+        {
+            lock (sync)
+            {
+                samples.Clear();
+            }
+        }
+    }
+}
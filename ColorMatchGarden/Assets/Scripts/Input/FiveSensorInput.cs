@@ -16,6 +16,7 @@ namespace ColorMatchGarden.Core
         [Header("Network Settings")]
         [SerializeField] private int udpPort = 5005;
         [SerializeField] private bool autoConnect = true;
+        [SerializeField] private int playerId = 0; // Hub "P<n>|" tag to accept, 0 = any glove
         
         [Header("Sensor Values (0-1)")]
         [SerializeField] [Range(0, 1)] private float sensor1Value = 0f; // Thumb (Red)
@@ -35,6 +36,13 @@ namespace ColorMatchGarden.Core
         [SerializeField] private bool stabilizeValues = true;
         [SerializeField] private int stabilitySteps = 5; // Snap to 0, 0.2, 0.4, 0.6, 0.8, 1.0
         
+        [Header("Shared Memory (bridge --shm, same machine)")]
+        [SerializeField] private bool useSharedMemory = false;
+        [SerializeField] private string sharedMemoryFile = "cmg_five_sensors.shm"; // In the temp folder
+        
+        [Header("Batched Datagrams (bridge --batch)")]
+        [SerializeField] private float batchPlaybackDelay = 0.02f; // Seconds behind real time, >= bridge --batch-ms
+        
         [Header("Test Mode (Keyboard)")]
         [SerializeField] private bool testMode = true;
         
@@ -46,6 +54,15 @@ namespace ColorMatchGarden.Core
         private Thread receiveThread;
         private bool isRunning = false;
         
+        // Batched samples, replayed with interpolation in Update()
+        private readonly BatchedSampleBuffer batchBuffer = new BatchedSampleBuffer(5);
+        private readonly float[] batchValues = new float[5];
+        private volatile bool receivingBatches = false;
+        
+        // Shared-memory ring, polled in Update() instead of the UDP thread
+        private SharedMemoryRingReader sharedMemory;
+        private readonly float[] sharedValues = new float[5];
+        
         // Events
         public event Action<Color> OnColorChanged;
         public event Action<float, float, float, float, float> OnSensorValuesChanged;
@@ -69,7 +86,11 @@ namespace ColorMatchGarden.Core
         
         private void Start()
         {
-            if (autoConnect && !testMode) StartUDPListener();
+            if (autoConnect && !testMode)
+            {
+                if (useSharedMemory) sharedMemory = new SharedMemoryRingReader(sharedMemoryFile, 5);
+                else StartUDPListener();
+            }
         }
         
         private void Update()
@@ -78,6 +99,19 @@ namespace ColorMatchGarden.Core
             
             // Handle Keyboard Test Input
             if (testMode) HandleTestInput();
+            else if (sharedMemory != null)
+            {
+                if (sharedMemory.TryOpen() && sharedMemory.TryReadLatest(sharedValues))
+                {
+                    SetSensorValues(Mathf.Clamp01(sharedValues[0]), Mathf.Clamp01(sharedValues[1]),
+                                    Mathf.Clamp01(sharedValues[2]), Mathf.Clamp01(sharedValues[3]),
+                                    Mathf.Clamp01(sharedValues[4]));
+                }
+            }
+            else if (receivingBatches && batchBuffer.Sample(batchPlaybackDelay, batchValues))
+            {
+                SetSensorValues(batchValues[0], batchValues[1], batchValues[2], batchValues[3], batchValues[4]);
+            }
             
             // Apply Stability (Quantization) to Targets
             // This prevents shaky hands from flickering the color
@@ -211,21 +245,46 @@ namespace ColorMatchGarden.Core
         {
             try
             {
-                string[] parts = data.Trim().Split(',');
-                if (parts.Length >= 5)
+                if (!PlayerTag.TryStrip(ref data, playerId)) return;
+                
+                if (BatchedSampleBuffer.IsBatch(data))
                 {
-                    target1 = Mathf.Clamp01(float.Parse(parts[0]));
-                    target2 = Mathf.Clamp01(float.Parse(parts[1]));
-                    target3 = Mathf.Clamp01(float.Parse(parts[2]));
-                    target4 = Mathf.Clamp01(float.Parse(parts[3]));
-                    target5 = Mathf.Clamp01(float.Parse(parts[4]));
+                    batchBuffer.AddBatch(data, TryParseValues);
+                    receivingBatches = true;
+                    return;
+                }
+                
+                float[] values = new float[5];
+                if (TryParseValues(data, values))
+                {
+                    receivingBatches = false;
+                    SetSensorValues(values[0], values[1], values[2], values[3], values[4]);
                 }
             }
             catch {}
         }
         
+        /// <summary>
+        /// "0.5,0.3,0.8,0.2,0.1" or "T:0.5,I:0.3,M:0.8,R:0.2,P:0.1" -> 5 clamped values
+        /// </summary>
+        private static bool TryParseValues(string data, float[] values)
+        {
+            string[] parts = data.Trim().Split(',');
+            if (parts.Length < 5) return false;
+            for (int i = 0; i < 5; i++)
+            {
+                string part = parts[i];
+                int colon = part.IndexOf(':');
+                if (colon >= 0) part = part.Substring(colon + 1);
+                if (!float.TryParse(part, out float value)) return false;
+                values[i] = Mathf.Clamp01(value);
+            }
+            return true;
+        }
+        
         private void OnDestroy()
         {
+            sharedMemory?.Dispose();
             isRunning = false;
             udpClient?.Close();
             receiveThread?.Abort();
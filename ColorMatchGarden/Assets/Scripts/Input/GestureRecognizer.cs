@@ -1,6 +1,7 @@
 using UnityEngine;
 using UnityEngine.Events;
 using System;
+using System.Collections.Generic;
 using System.Net;
 using System.Net.Sockets;
 using System.Text;
@@ -16,6 +17,8 @@ namespace ColorMatchGarden.Core
     {
         [Header("Connection Settings")]
         [SerializeField] private int listenPort = 5001;
+        [Tooltip("Multi-player stations: only react to \"P<id>|gesture\" messages for this player (0 = any)")]
+        [SerializeField] private int playerId = 0;
         [SerializeField] private bool useSimulation = true;
         
         [Header("Gesture Settings")]
@@ -43,11 +46,17 @@ namespace ColorMatchGarden.Core
         private float lastGestureTime = 0f;
         private bool gestureConfirmed = false;
         
-        private UdpClient udpClient;
-        private Thread receiveThread;
-        private bool isRunning = false;
         private string latestGestureMessage = "";
 
+        // One socket per port, shared by every recognizer listening on it,
+        // so each player's recognizer can read the same tagged stream
+        private class PortListener
+        {
+            public UdpClient Client;
+            public readonly List<GestureRecognizer> Recognizers = new List<GestureRecognizer>();
+        }
+        private static readonly Dictionary<int, PortListener> portListeners = new Dictionary<int, PortListener>();
+
         private void Start()
         {
             if (!useSimulation)
@@ -233,12 +242,20 @@ namespace ColorMatchGarden.Core
         {
             try
             {
-                udpClient = new UdpClient(listenPort);
-                isRunning = true;
-                receiveThread = new Thread(ReceiveData);
-                receiveThread.IsBackground = true;
-                receiveThread.Start();
-                Debug.Log($"[Gesture] Listening on port {listenPort}");
+                lock (portListeners)
+                {
+                    if (!portListeners.TryGetValue(listenPort, out PortListener listener))
+                    {
+                        listener = new PortListener { Client = new UdpClient(listenPort) };
+                        portListeners[listenPort] = listener;
+                        Thread receiveThread = new Thread(() => ReceiveData(listener));
+                        receiveThread.IsBackground = true;
+                        receiveThread.Start();
+                    }
+                    listener.Recognizers.Add(this);
+                }
+                Debug.Log($"[Gesture] Listening on port {listenPort}" +
+                          (playerId > 0 ? $" (player {playerId})" : ""));
             }
             catch (Exception e)
             {
@@ -246,21 +263,32 @@ namespace ColorMatchGarden.Core
             }
         }
 
-        private void ReceiveData()
+        private static void ReceiveData(PortListener listener)
         {
             IPEndPoint remoteEndPoint = new IPEndPoint(IPAddress.Any, 0);
             
-            while (isRunning)
+            while (true)
             {
                 try
                 {
-                    byte[] data = udpClient.Receive(ref remoteEndPoint);
-                    latestGestureMessage = Encoding.UTF8.GetString(data);
-                    lastGestureTime = Time.time;
+                    byte[] data = listener.Client.Receive(ref remoteEndPoint);
+                    string message = Encoding.UTF8.GetString(data);
+                    lock (portListeners)
+                    {
+                        foreach (GestureRecognizer recognizer in listener.Recognizers)
+                        {
+                            recognizer.HandleMessage(message);
+                        }
+                    }
                 }
                 catch (SocketException)
                 {
                     // Socket closed
+                    return;
+                }
+                catch (ObjectDisposedException)
+                {
+                    return;
                 }
                 catch (Exception e)
                 {
@@ -269,11 +297,27 @@ namespace ColorMatchGarden.Core
             }
         }
 
+        /// <summary>
+        /// Accepts "gesture" or player-tagged "P2|gesture" messages (see PlayerTag).
+        /// Tagged messages for another player are ignored when playerId is set.
+        /// </summary>
+        private void HandleMessage(string message)
+        {
+            if (!PlayerTag.TryStrip(ref message, playerId)) return;
+            latestGestureMessage = message;
+        }
+
         private void OnDestroy()
         {
-            isRunning = false;
-            udpClient?.Close();
-            receiveThread?.Abort();
+            lock (portListeners)
+            {
+                if (portListeners.TryGetValue(listenPort, out PortListener listener) &&
+                    listener.Recognizers.Remove(this) && listener.Recognizers.Count == 0)
+                {
+                    portListeners.Remove(listenPort);
+                    listener.Client.Close();
+                }
+            }
         }
 
         private void OnGUI()
@@ -0,0 +1,25 @@
+using System;
+
+namespace ColorMatchGarden.Core
+{
+    /// <summary>
+    /// Player tags from the multi-glove hub (bridge_service.py --hub --route tag).
+    /// Every glove shares one UDP port and prefixes its messages with "P&lt;n&gt;|".
+    /// </summary>
+    public static class PlayerTag
+    {
+        /// <summary>
+        /// Removes a "P&lt;n&gt;|" tag. Returns false if the message belongs to another
+        /// player. playerId 0 accepts every glove; untagged messages always pass.
+        /// </summary>
+        public static bool TryStrip(ref string message, int playerId)
+        {
+            if (message.Length < 3 || message[0] != 'P') return true;
+            int bar = message.IndexOf('|');
+            if (bar < 2 || !int.TryParse(message.Substring(1, bar - 1), out int player)) return true;
+
+            message = message.Substring(bar + 1);
+            return playerId == 0 || player == playerId;
+        }
+    }
+}
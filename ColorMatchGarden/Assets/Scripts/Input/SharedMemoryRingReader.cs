@@ -0,0 +1,115 @@
+using System;
+using System.IO;
+using System.IO.MemoryMappedFiles;
+using System.Threading;
+
+namespace ColorMatchGarden.Core
+{
+    /// <summary>
+    /// Reads the newest sample from the shared-memory ring written by the
+    /// Python bridges (--shm). Layout is documented in Python/shm_transport.py.
+    /// Poll it from Update() - no socket, receive thread or string parsing.
+    /// </summary>
+    public class SharedMemoryRingReader : IDisposable
+    {
+        private const long Magic = 0x00004D4853474D43; // "CMGSHM\0\0"
+        private const int Version = 1;
+        private const int HeaderSize = 64;
+        private const int SequenceOffset = 24;
+        private const int RetryIntervalMs = 1000;
+
+        private readonly string path;
+        private readonly int channels;
+        private MemoryMappedFile file;
+        private MemoryMappedViewAccessor view;
+        private int slots;
+        private int slotSize;
+        private long lastSequence;
+        private int nextOpenAttempt;
+
+        /// <summary>Samples written between two reads (not shown, by design).</summary>
+        public long Skipped { get; private set; }
+        public bool IsOpen => view != null;
+        public string FilePath => path;
+
+        public SharedMemoryRingReader(string fileName, int channels)
+        {
+            // Relative names live in the temp directory, like the bridge
+            path = Path.IsPathRooted(fileName) ? fileName : Path.Combine(Path.GetTempPath(), fileName);
+            this.channels = channels;
+        }
+
+        /// <summary>
+        /// Maps the ring if the bridge has created it. Cheap to call every
+        /// frame: a missing file is only checked once per second.
+        /// </summary>
+        public bool TryOpen()
+        {
+            if (view != null) return true;
+            if (Environment.TickCount - nextOpenAttempt < 0) return false;
+            nextOpenAttempt = Environment.TickCount + RetryIntervalMs;
+            if (!File.Exists(path)) return false;
+
+            try
+            {
+                var stream = new FileStream(path, FileMode.Open, FileAccess.Read, FileShare.ReadWrite);
+                file = MemoryMappedFile.CreateFromFile(stream, null, 0, MemoryMappedFileAccess.Read,
+                                                       HandleInheritability.None, false);
+                view = file.CreateViewAccessor(0, 0, MemoryMappedFileAccess.Read);
+                if (view.ReadInt64(0) != Magic || view.ReadInt32(8) != Version || view.ReadInt32(12) != channels)
+                {
+                    Dispose();
+                    return false;
+                }
+                slots = view.ReadInt32(16);
+                slotSize = view.ReadInt32(20);
+                return true;
+            }
+            catch (Exception)
+            {
+                Dispose();
+                return false;
+            }
+        }
+
+        /// <summary>
+        /// Copies the newest sample into values. Returns false if there is
+        /// nothing new since the last call (or the slot was mid-write).
+        /// </summary>
+        public bool TryReadLatest(float[] values)
+        {
+            if (view == null) return false;
+
+            long sequence = view.ReadInt64(SequenceOffset);
+            if (sequence == 0 || sequence == lastSequence) return false;
+
+            // Closing sequence, data, opening sequence - the reverse of the
+            // writer's order, so an overlapping write changes one of them
+            long offset = HeaderSize + ((sequence - 1) % slots) * slotSize;
+            long end = view.ReadInt64(offset + 16 + channels * 4);
+            Interlocked.MemoryBarrier();
+            for (int i = 0; i < channels; i++)
+            {
+                values[i] = view.ReadSingle(offset + 16 + i * 4);
+            }
+            Interlocked.MemoryBarrier();
+            long begin = view.ReadInt64(offset);
+            if (begin != sequence || end != sequence) return false;
+
+            if (lastSequence > 0 && sequence > lastSequence + 1)
+            {
+                Skipped += sequence - lastSequence - 1;
+            }
+            lastSequence = sequence;
+            return true;
+        }
+
+        public void Dispose()
+        {
+            view?.Dispose();
+            file?.Dispose();
+            view = null;
+            file = null;
+        }
+    }
+}
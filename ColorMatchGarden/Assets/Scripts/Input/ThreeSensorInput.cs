@@ -17,6 +17,7 @@ namespace ColorMatchGarden.Core
         [Header("Network Settings")]
         [SerializeField] private int udpPort = 5005;
         [SerializeField] private bool autoConnect = true;
+        [SerializeField] private int playerId = 0; // Hub "P<n>|" tag to accept, 0 = any glove
         
         [Header("Sensor Values (0-1)")]
         [SerializeField] [Range(0, 1)] private float redSensorValue = 0f;
@@ -26,6 +27,13 @@ namespace ColorMatchGarden.Core
         [Header("Smoothing")]
         [SerializeField] private float smoothSpeed = 5f;
         
+        [Header("Shared Memory (bridge --shm, same machine)")]
+        [SerializeField] private bool useSharedMemory = false;
+        [SerializeField] private string sharedMemoryFile = "cmg_three_sensors.shm"; // In the temp folder
+        
+        [Header("Batched Datagrams (bridge --batch)")]
+        [SerializeField] private float batchPlaybackDelay = 0.02f; // Seconds behind real time, >= bridge --batch-ms
+        
         [Header("Test Mode (No Hardware)")]
         [SerializeField] private bool testMode = false;
         
@@ -37,6 +45,15 @@ namespace ColorMatchGarden.Core
         private Thread receiveThread;
         private bool isRunning = false;
         
+        // Batched samples, replayed with interpolation in Update()
+        private readonly BatchedSampleBuffer batchBuffer = new BatchedSampleBuffer(3);
+        private readonly float[] batchValues = new float[3];
+        private volatile bool receivingBatches = false;
+        
+        // Shared-memory ring, polled in Update() instead of the UDP thread
+        private SharedMemoryRingReader sharedMemory;
+        private readonly float[] sharedValues = new float[3];
+        
         // Target values (for smoothing)
         private float targetRed = 0f;
         private float targetGreen = 0f;
@@ -56,7 +73,15 @@ namespace ColorMatchGarden.Core
             
             if (autoConnect && !testMode)
             {
-                StartUDPListener();
+                if (useSharedMemory)
+                {
+                    sharedMemory = new SharedMemoryRingReader(sharedMemoryFile, 3);
+                    Debug.Log($"[ThreeSensorInput] Reading shared memory {sharedMemory.FilePath}");
+                }
+                else
+                {
+                    StartUDPListener();
+                }
             }
             
             if (testMode)
@@ -67,6 +92,16 @@ namespace ColorMatchGarden.Core
         
         private void Update()
         {
+            if (sharedMemory != null && sharedMemory.TryOpen() && sharedMemory.TryReadLatest(sharedValues))
+            {
+                SetSensorValues(sharedValues[0], sharedValues[1], sharedValues[2]);
+            }
+            
+            if (!testMode && receivingBatches && batchBuffer.Sample(batchPlaybackDelay, batchValues))
+            {
+                SetSensorValues(batchValues[0], batchValues[1], batchValues[2]);
+            }
+            
             // Smooth the sensor values
             redSensorValue = Mathf.Lerp(redSensorValue, targetRed, Time.deltaTime * smoothSpeed);
             greenSensorValue = Mathf.Lerp(greenSensorValue, targetGreen, Time.deltaTime * smoothSpeed);
@@ -175,9 +210,20 @@ namespace ColorMatchGarden.Core
                 {
                     byte[] data = udpClient.Receive(ref endPoint);
                     string message = Encoding.UTF8.GetString(data);
+                    if (!PlayerTag.TryStrip(ref message, playerId)) continue;
                     
-                    // Expected format: "R:0.5,G:0.3,B:0.8" or "0.5,0.3,0.8"
-                    ParseSensorData(message);
+                    // Expected format: "R:0.5,G:0.3,B:0.8" or "0.5,0.3,0.8",
+                    // or a "B:n" batch of timestamped samples
+                    if (BatchedSampleBuffer.IsBatch(message))
+                    {
+                        batchBuffer.AddBatch(message, TryParseRgb);
+                        receivingBatches = true;
+                    }
+                    else
+                    {
+                        receivingBatches = false;
+                        ParseSensorData(message);
+                    }
                 }
                 catch (Exception)
                 {
@@ -221,6 +267,20 @@ namespace ColorMatchGarden.Core
             }
         }
         
+        /// <summary>
+        /// One batched sample "R:0.5,G:0.3,B:0.8" -> values
+        /// </summary>
+        private static bool TryParseRgb(string data, float[] values)
+        {
+            string[] parts = data.Replace("R:", "").Replace("G:", "").Replace("B:", "").Split(',');
+            if (parts.Length < 3) return false;
+            for (int i = 0; i < 3; i++)
+            {
+                if (!float.TryParse(parts[i].Trim(), out values[i])) return false;
+            }
+            return true;
+        }
+        
         /// <summary>
         /// Manually set sensor values (for testing or webcam input)
         /// </summary>
@@ -254,6 +314,7 @@ namespace ColorMatchGarden.Core
         
         private void OnDestroy()
         {
+            sharedMemory?.Dispose();
             isRunning = false;
             udpClient?.Close();
             receiveThread?.Abort();
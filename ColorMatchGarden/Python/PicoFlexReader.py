@@ -1,9 +1,15 @@
 # PicoFlexReader.py - MicroPython for Raspberry Pi Pico
 # Copy this to your Pico and save as 'main.py'
+# Also copy pico_filters.py and pico_calibration.py to the Pico
+# (and auto_calibration.py for AUTO_CALIBRATE)
+# Type "c" + Enter in the Thonny shell to calibrate (saved to calibration.json)
 
 from machine import ADC
 import time
 
+from pico_calibration import ConsoleCommands, capture_average, load_calibration, save_calibration
+from pico_filters import MovingAverage
+
 # -----------------------------
 # ADC setup
 # -----------------------------
@@ -11,11 +17,23 @@ import time
 flex = [ADC(26), ADC(27), ADC(28)]
 
 # -----------------------------
-# YOUR calibration values
+# Calibration (defaults until calibration.json is saved)
 # -----------------------------
 FLAT = [50000, 51120, 32570]
 BENT = [53178, 51736, 32789]
 
+calibration, profile = load_calibration(
+    {i: {"flat": FLAT[i], "bent": BENT[i]} for i in range(3)})
+FLAT = [calibration[i]["flat"] for i in range(3)]
+BENT = [calibration[i]["bent"] for i in range(3)]
+
+# Learn each sensor's range while playing; FLAT/BENT are the starting point
+AUTO_CALIBRATE = False
+auto = None
+if AUTO_CALIBRATE:
+    from auto_calibration import AutoCalibrator
+    auto = AutoCalibrator(3, FLAT, BENT)
+
 # -----------------------------
 # Filtering + stability
 # -----------------------------
@@ -23,43 +41,128 @@ SAMPLE_SIZE = 5
 DEAD_ZONE = 1.5        # %
 HYSTERESIS = 2.0       # %
 
-buffers = [[0]*SAMPLE_SIZE for _ in range(3)]
+# 0 = sample in the print loop, e.g. 500 = exact timer-driven rate in Hz
+# (copy pico_sampler.py to the Pico). Output stays at one line per 50 ms.
+SAMPLE_RATE_HZ = 0
+
+# Change-only output (copy pico_change_gate.py to the Pico): a line is
+# printed only when a value passed the HYSTERESIS filter above, plus a
+# heartbeat every HEARTBEAT_MS. Lines then end in ",S:<seq>".
+CHANGE_ONLY = False
+HEARTBEAT_MS = 1000
+
+# Percent values are kept as percent x 100 integers (0-10000)
+DEAD_ZONE_X100 = int(DEAD_ZONE * 100)
+HYSTERESIS_X100 = int(HYSTERESIS * 100)
+
+averages = [MovingAverage(SAMPLE_SIZE) for _ in range(3)]
 last_percent = [0, 0, 0]
 
-def read_flex(i):
-    raw = flex[i].read_u16()
+gate = None
+if CHANGE_ONLY:
+    from pico_change_gate import ChangeGate
+    # Hysteresis already holds the value still - any change is real
+    gate = ChangeGate(3, 1, HEARTBEAT_MS)
+
+def percent_text(p):
+    """percent x 100 -> "37.45" without float maths"""
+    return "%d.%02d" % (p // 100, p % 100)
+
+def emit(values):
+    """Print one CSV line, unless the change gate holds it back"""
+    if gate is not None and not gate.check(values):
+        return
+    line = percent_text(values[0]) + "," + percent_text(values[1]) + "," + percent_text(values[2])
+    if gate is not None:
+        line += ",S:" + str(gate.next_seq())
+    print(line)
 
-    buffers[i].pop(0)
-    buffers[i].append(raw)
-    avg = sum(buffers[i]) / SAMPLE_SIZE
+def read_flex(i, raw=None):
+    if raw is None:
+        raw = flex[i].read_u16()
 
-    flat = FLAT[i]
-    bent = BENT[i]
+    avg = averages[i].update(raw)
 
-    if avg <= flat:
-        percent = 0.0
-    elif avg >= bent:
-        percent = 100.0
+    if auto is None:
+        # Full 16-bit average: the FLAT/BENT spans are only a few hundred
+        # counts, too narrow for a 12-bit code table
+        flat = FLAT[i]
+        bent = BENT[i]
+        if avg <= flat:
+            percent = 0
+        elif avg >= bent:
+            percent = 10000
+        else:
+            percent = (avg - flat) * 10000 // (bent - flat)
     else:
-        percent = (avg - flat) * 100 / (bent - flat)
+        percent = int(auto.update_channel(i, avg) * 10000)
 
     # Dead-zone
-    if percent < DEAD_ZONE:
-        percent = 0.0
-    if percent > 100 - DEAD_ZONE:
-        percent = 100.0
+    if percent < DEAD_ZONE_X100:
+        percent = 0
+    if percent > 10000 - DEAD_ZONE_X100:
+        percent = 10000
 
     # Hysteresis
-    if abs(percent - last_percent[i]) < HYSTERESIS:
+    if abs(percent - last_percent[i]) < HYSTERESIS_X100:
         percent = last_percent[i]
 
     last_percent[i] = percent
-    return percent, int(avg)
+    return percent, avg
+
+def calibrate():
+    """Capture flat and bent readings, apply them and save to flash"""
+    read_raw = lambda: [adc.read_u16() for adc in flex]
+    input("Keep all sensors FLAT and press Enter...")
+    flat = capture_average(read_raw)
+    input("BEND all sensors fully and press Enter...")
+    bent = capture_average(read_raw)
+    name = input("Profile name (Enter = default): ").strip() or "default"
+    
+    for i in range(3):
+        FLAT[i] = int(flat[i])
+        BENT[i] = int(bent[i])
+        if FLAT[i] > BENT[i]:
+            # read_flex expects flat < bent
+            FLAT[i], BENT[i] = BENT[i], FLAT[i]
+    save_calibration({i: {"flat": FLAT[i], "bent": BENT[i]} for i in range(3)}, name)
+    if auto is not None:
+        auto.reset()
+    print(f"Saved '{name}': FLAT={FLAT} BENT={BENT}")
 
 # -----------------------------
 # Main loop
 # -----------------------------
 print("--- Pico Flex Reader Started (STABLE) ---")
+print(f"Calibration: {profile or 'defaults'} (c + Enter = calibrate)")
+commands = ConsoleCommands()
+
+def run_timer_loop():
+    """Filter every timer-captured frame, print at the usual 50 ms pace"""
+    from pico_sampler import FixedRateSampler
+    
+    sampler = FixedRateSampler(flex, rate_hz=SAMPLE_RATE_HZ)
+    frame = sampler.new_frame()
+    sampler.start()
+    last_print = time.ticks_ms()
+    
+    while True:
+        while sampler.read(frame) is not None:
+            for i in range(3):
+                read_flex(i, frame[i])
+        
+        now = time.ticks_ms()
+        if time.ticks_diff(now, last_print) >= 50:
+            last_print = now
+            emit(last_percent)
+            if commands.poll() == "c":
+                sampler.stop()
+                calibrate()
+                sampler.start()
+        time.sleep_ms(1)
+
+if SAMPLE_RATE_HZ:
+    run_timer_loop()
 
 while True:
     percents = []
@@ -70,6 +173,9 @@ while True:
 
     # PRINT CSV FORMAT FOR THE BRIDGE
     # This is exactly what ThonnyUnityBridge.py expects
-    print(f"{percents[0]},{percents[1]},{percents[2]}")
+    emit(percents)
+    
+    if commands.poll() == "c":
+        calibrate()
     
     time.sleep(0.05)
@@ -1,62 +1,93 @@
 # ThonnyUnityBridge.py - Run this in Thonny on your COMPUTER
 # This bridges the gap between your Pico and Unity
 
-import serial
 import socket
 import time
 
+from serial_ingest import SequenceTracker
+from serial_supervisor import SupervisedSerial, LastValueHold
+
 # ============ CONFIGURATION ============
 SERIAL_PORT = "COM5"      # <-- CHANGE THIS to your Pico's port (e.g., COM3, COM4)
 BAUD_RATE = 115200
 UNITY_IP = "127.0.0.1"    # Localhost
 UNITY_PORT = 5006         # Must match FiveSensorInput.cs
+UNPLUGGED = "hold"        # While the Pico is unplugged: "hold" or "decay" the last values
 # =======================================
 
-print("--- Unity Flex Bridge Started ---")
-print(f"Connecting to Pico on {SERIAL_PORT}...")
+def main():
+    print("--- Unity Flex Bridge Started ---")
+    print(f"Connecting to Pico on {SERIAL_PORT}...")
 
-# Setup UDP socket for Unity
-sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    # Setup UDP socket for Unity
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
-try:
-    # Open Serial connection
-    ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=0.1)
-    print("✅ Connected to Pico!")
+    # Open Serial connection (reconnects by itself if the Pico is unplugged)
+    ser = SupervisedSerial(SERIAL_PORT, BAUD_RATE, timeout=0.1)
+    if ser.open():
+        print("✅ Connected to Pico!")
+    else:
+        print(f"❌ Error: {ser.last_error}")
+        print("💡 Make sure your Pico is plugged in and the SERIAL_PORT is correct.")
+        print("🔌 Waiting for the Pico...")
     print("🎮 Sending data to Unity. Press Ctrl+C to stop.")
-except Exception as e:
-    print(f"❌ Error: {e}")
-    print("💡 Make sure your Pico is plugged in and the SERIAL_PORT is correct.")
-    exit()
-
-try:
-    while True:
-        if ser.in_waiting:
-            # Read line from Pico (expected: "p1,p2,p3")
-            line = ser.readline().decode('utf-8').strip()
-            
-            if "," in line:
-                try:
-                    # Convert percentages (0-100) to normalized values (0.0-1.0)
-                    parts = line.split(",")
-                    if len(parts) >= 3:
-                        r = float(parts[0]) / 100.0
-                        g = float(parts[1]) / 100.0
-                        b = float(parts[2]) / 100.0
-                        
-                        # Send to Unity: "T:val,I:val,M:val"
-                        # T=Thumb (Red), I=Index (Green), M=Middle (Blue)
-                        message = f"T:{r:.2f},I:{g:.2f},M:{b:.2f}"
-                        sock.sendto(message.encode(), (UNITY_IP, UNITY_PORT))
-                        
-                        # Print visual status
-                        print(f"\r🔴 {r:.2f} | 🟢 {g:.2f} | 🔵 {b:.2f}   ", end="")
-                except ValueError:
-                    continue # Skip malformed lines
-                    
-        time.sleep(0.01)
-
-except KeyboardInterrupt:
-    print("\n👋 Bridge stopped.")
-finally:
-    ser.close()
-    sock.close()
+
+    # PicoFlexReader with CHANGE_ONLY = True only sends when a finger moves
+    sequence = SequenceTracker()
+    holder = LastValueHold(UNPLUGGED)
+
+    try:
+        while True:
+            if not ser.connected:
+                # Retry the port (bounded wait) and keep Unity on the last values
+                ser.read()
+                values = holder.fill(time.perf_counter())
+                if values is not None:
+                    r, g, b = values
+                    sock.sendto(f"T:{r:.2f},I:{g:.2f},M:{b:.2f}".encode(), (UNITY_IP, UNITY_PORT))
+                    print(f"\r🔌 Pico disconnected {ser.outage_seconds():.0f}s - {UNPLUGGED}   ", end="")
+                continue
+
+            if not ser.in_waiting and not sequence.check_alive(time.perf_counter()):
+                print(f"\r⚠️  No data from the Pico for {sequence.silence(time.perf_counter()):.0f}s "
+                      f"(heartbeat missing)  ", end="")
+
+            if ser.in_waiting:
+                # Read line from Pico (expected: "p1,p2,p3", or "p1,p2,p3,S:seq")
+                line = ser.readline().decode('utf-8').strip()
+                sequence.add_line(line, time.perf_counter())
+
+                if "," in line:
+                    try:
+                        # Convert percentages (0-100) to normalized values (0.0-1.0)
+                        parts = line.split(",")
+                        if len(parts) >= 3:
+                            r = float(parts[0]) / 100.0
+                            g = float(parts[1]) / 100.0
+                            b = float(parts[2]) / 100.0
+
+                            # Send to Unity: "T:val,I:val,M:val"
+                            # T=Thumb (Red), I=Index (Green), M=Middle (Blue)
+                            message = f"T:{r:.2f},I:{g:.2f},M:{b:.2f}"
+                            sock.sendto(message.encode(), (UNITY_IP, UNITY_PORT))
+                            holder.update((r, g, b))
+
+                            # Print visual status
+                            print(f"\r🔴 {r:.2f} | 🟢 {g:.2f} | 🔵 {b:.2f}   ", end="")
+                    except ValueError:
+                        continue # Skip malformed lines
+
+            time.sleep(0.01)
+
+    except KeyboardInterrupt:
+        print("\n👋 Bridge stopped.")
+        if sequence.lines:
+            print(f"   Change-only: {sequence.status()}")
+        print(f"   Serial link: {ser.status()}")
+    finally:
+        ser.close()
+        sock.close()
+
+
+if __name__ == "__main__":
+    main()
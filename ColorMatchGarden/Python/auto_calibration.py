@@ -0,0 +1,176 @@
+"""
+Automatic Online Calibration for Color Match Garden
+===================================================
+Self-calibrating normalization: instead of fixed FLAT_VALUE/BENT_VALUE,
+each channel tracks the lowest and highest readings it has actually
+seen and maps that range to 0.0-1.0. New players and temperature or
+glove-fit drift need no calibration step.
+
+This file runs on BOTH sides (no imports, plain lists and floats):
+- Computer: three_sensor_bridge.py / flex_sensor_bridge.py --auto
+- Pico (MicroPython): copy it next to main.py for PicoFlexReader.py
+
+PER SAMPLE, PER CHANNEL (constant time, no history kept):
+  1. Outlier rejection - a reading more than `outlier` x expected span
+     beyond the tracked range only moves it after `confirm` consecutive
+     readings on the same side, so a single spike never stretches it.
+  2. Slow decay - both extremes creep towards each other with the given
+     half-life (in samples), so stale extremes are forgotten and the
+     range follows drift. Revisited extremes are simply re-learned.
+  3. Confidence - tracked span / expected span (0.0-1.0). Until a
+     channel is confident its output is blended with the fixed flat/bent
+     mapping, so the very first samples already look sensible.
+
+The flat/bent arguments set both the fallback mapping and the direction
+(flat > bent for the usual voltage divider: the reading drops as the
+sensor bends).
+"""
+
+DEFAULT_HALF_LIFE = 6000    # Samples (1 minute at 100 Hz)
+DEFAULT_OUTLIER = 0.25      # Fraction of the expected span
+DEFAULT_CONFIRM = 3         # Consecutive readings that confirm a new extreme
+
+
+def _per_channel(value, channels):
+    if isinstance(value, (list, tuple)):
+        return [float(v) for v in value]
+    return [float(value)] * channels
+
+
+class AutoCalibrator:
+    """Decaying min/max tracker with outlier rejection for N channels."""
+
+    def __init__(self, channels, flat, bent, min_span=None,
+                 half_life=DEFAULT_HALF_LIFE, outlier=DEFAULT_OUTLIER,
+                 confirm=DEFAULT_CONFIRM):
+        """
+        Args:
+            channels: Number of channels
+            flat: Reading when flat (number or one per channel) - fallback
+            bent: Reading when fully bent (number or one per channel)
+            min_span: Range that counts as fully calibrated
+                      (default: half of |bent - flat|)
+            half_life: Samples for an unrefreshed range to shrink by half
+            outlier: Jump beyond the range, as a fraction of min_span,
+                     that needs confirming
+            confirm: Consecutive readings that confirm such a jump
+        """
+        self.channels = channels
+        self.flat = _per_channel(flat, channels)
+        self.bent = _per_channel(bent, channels)
+        self.inverted = [f > b for f, b in zip(self.flat, self.bent)]
+        if min_span is None:
+            self.min_span = [abs(b - f) * 0.5 for f, b in zip(self.flat, self.bent)]
+        else:
+            self.min_span = _per_channel(min_span, channels)
+        self.limit = [span * outlier for span in self.min_span]
+        self.keep = 0.5 ** (1.0 / half_life)
+        self.confirm = confirm
+
+        self.low = [0.0] * channels
+        self.high = [0.0] * channels
+        self.last = [0.0] * channels
+        self.pending = [0] * channels     # +n above / -n below, unconfirmed
+        self.started = [False] * channels
+        self.rejected = 0
+        self.samples = 0
+
+    def reset(self):
+        """Forget everything learned (e.g. a new player puts the glove on)."""
+        for i in range(self.channels):
+            self.started[i] = False
+            self.pending[i] = 0
+
+    def update_channel(self, i, raw):
+        """Track one reading and return it normalized to 0.0-1.0."""
+        if not self.started[i]:
+            self.low[i] = raw
+            self.high[i] = raw
+            self.last[i] = raw
+            self.started[i] = True
+
+        low = self.low[i]
+        high = self.high[i]
+        limit = self.limit[i]
+
+        # 1. Extend the range, spikes only once confirmed
+        if raw > high:
+            if raw - high <= limit:
+                high = raw
+                self.pending[i] = 0
+            else:
+                count = self.pending[i] + 1 if self.pending[i] > 0 else 1
+                if count >= self.confirm:
+                    high = raw
+                    count = 0
+                else:
+                    self.rejected += 1
+                    raw = self.last[i]  # Hold the previous reading
+                self.pending[i] = count
+        elif raw < low:
+            if low - raw <= limit:
+                low = raw
+                self.pending[i] = 0
+            else:
+                count = self.pending[i] - 1 if self.pending[i] < 0 else -1
+                if -count >= self.confirm:
+                    low = raw
+                    count = 0
+                else:
+                    self.rejected += 1
+                    raw = self.last[i]
+                self.pending[i] = count
+        else:
+            self.pending[i] = 0
+
+        # 2. Decay both extremes towards the middle
+        middle = (low + high) * 0.5
+        keep = self.keep
+        low = middle + (low - middle) * keep
+        high = middle + (high - middle) * keep
+        self.low[i] = low
+        self.high[i] = high
+        self.last[i] = raw
+
+        # 3. Normalize, blended with the fixed mapping until confident
+        flat = self.flat[i]
+        bent = self.bent[i]
+        fixed = (raw - flat) / (bent - flat) if bent != flat else 0.0
+        span = high - low
+        confidence = span / self.min_span[i] if self.min_span[i] > 0 else 1.0
+        if confidence > 1.0:
+            confidence = 1.0
+        if span > 0:
+            if self.inverted[i]:
+                learned = (high - raw) / span
+            else:
+                learned = (raw - low) / span
+            value = confidence * learned + (1.0 - confidence) * fixed
+        else:
+            value = fixed
+        if value < 0.0:
+            return 0.0
+        if value > 1.0:
+            return 1.0
+        return value
+
+    def update(self, raws):
+        """Track one reading per channel and return the normalized tuple."""
+        self.samples += 1
+        return tuple(self.update_channel(i, raws[i]) for i in range(self.channels))
+
+    def channel_confidence(self, i):
+        if not self.started[i] or self.min_span[i] <= 0:
+            return 0.0
+        return min(1.0, (self.high[i] - self.low[i]) / self.min_span[i])
+
+    def confidence(self):
+        """Lowest channel confidence, 0.0 (nothing seen) - 1.0 (calibrated)"""
+        return min(self.channel_confidence(i) for i in range(self.channels))
+
+    def status(self):
+        return "auto-cal {}% | {} spikes rejected".format(int(self.confidence() * 100), self.rejected)
+
+    def ranges(self):
+        """Learned (low, high) per channel, rounded for display"""
+        return [(round(self.low[i]), round(self.high[i])) for i in range(self.channels)]
@@ -0,0 +1,166 @@
+"""
+Binary Sensor Frame Protocol for Color Match Garden
+===================================================
+Compact alternative to the printed CSV/JSON lines from the Pico.
+
+This file runs on BOTH sides:
+- Pico (MicroPython): copy it next to main.py and use FrameEncoder
+- Computer: the bridges use FrameDecoder on the raw serial bytes
+
+FRAME LAYOUT (little-endian):
+  Offset | Size | Field
+  -------|------|---------------------------------------------
+     0   |  1   | SYNC (0xA5)
+     1   |  2   | Sequence number (wraps at 65535)
+     3   |  4   | time.ticks_us() on the Pico when sampled (wraps
+         |      | at 2**30 - see TICKS_MASK)
+     7   |  1   | Channel count N
+     8   | 2*N  | Channel values (uint16)
+   8+2N  |  1   | CRC-8 (poly 0x07) over bytes 1 .. 7+2N
+
+A 5-channel frame is 19 bytes, versus ~200 bytes for the JSON line.
+Channel meaning depends on the sender: five_flex_sensors_mux sends
+percent x 100 (0-10000), pico_3_sensors sends raw ADC (0-65535).
+"""
+
+import struct
+
+SYNC = 0xA5
+HEADER_SIZE = 8           # SYNC + seq + ticks + count
+MAX_CHANNELS = 32         # Larger counts are treated as corruption
+PERCENT_SCALE = 100       # percent * 100 fits in uint16 with 0.01% steps
+TICKS_MASK = 0x3FFFFFFF   # MicroPython ticks_us() period is 2**30 us (~17.9 min)
+
+
+def _make_crc8_table():
+    table = bytearray(256)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            if crc & 0x80:
+                crc = ((crc << 1) ^ 0x07) & 0xFF
+            else:
+                crc = (crc << 1) & 0xFF
+        table[i] = crc
+    return table
+
+
+CRC8_TABLE = _make_crc8_table()
+
+
+def crc8(data, start, end):
+    """CRC-8 (poly 0x07) of data[start:end] without slicing."""
+    crc = 0
+    table = CRC8_TABLE
+    for i in range(start, end):
+        crc = table[crc ^ data[i]]
+    return crc
+
+
+def frame_size(channel_count):
+    """Total bytes of a frame carrying channel_count values."""
+    return HEADER_SIZE + 2 * channel_count + 1
+
+
+class FrameEncoder:
+    """Packs channel values into a reused frame buffer (Pico side)."""
+
+    def __init__(self, channel_count):
+        self.channel_count = channel_count
+        self.buffer = bytearray(frame_size(channel_count))
+        self.format = "<BHIB%dH" % channel_count
+        self.seq = 0
+
+    def encode(self, ticks_us, values):
+        """
+        Fill the frame buffer and return it.
+
+        Args:
+            ticks_us: Sample timestamp (time.ticks_us() on the Pico)
+            values: channel_count integers in 0-65535
+        """
+        buf = self.buffer
+        struct.pack_into(self.format, buf, 0, SYNC, self.seq,
+                         ticks_us & 0xFFFFFFFF, self.channel_count, *values)
+        buf[-1] = crc8(buf, 1, len(buf) - 1)
+        self.seq = (self.seq + 1) & 0xFFFF
+        return buf
+
+
+class FrameDecoder:
+    """
+    Streaming frame decoder with resync and loss accounting (computer side).
+
+    Feed it whatever bytes the serial port returned; it keeps partial
+    frames between calls and skips garbage until the next valid frame.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._last_seq = None
+        self.frames = 0         # Valid frames decoded
+        self.lost = 0           # Frames missing from the sequence
+        self.crc_errors = 0     # Candidate frames rejected by CRC
+        self.skipped = 0        # Bytes discarded while resyncing
+
+    def feed(self, data):
+        """
+        Decode every complete frame in data (plus leftovers).
+
+        Returns:
+            List of (seq, ticks_us, values) tuples, values as a tuple of ints
+        """
+        buf = self._buffer
+        buf += data
+        out = []
+        pos = 0
+        size = len(buf)
+
+        while True:
+            start = buf.find(SYNC, pos)
+            if start < 0:
+                self.skipped += size - pos
+                pos = size
+                break
+            self.skipped += start - pos
+            pos = start
+
+            if size - pos < HEADER_SIZE:
+                break
+            count = buf[pos + 7]
+            if count == 0 or count > MAX_CHANNELS:
+                # Not a real header - resync on the next byte
+                self.skipped += 1
+                pos += 1
+                continue
+
+            end = pos + frame_size(count)
+            if end > size:
+                break
+            if crc8(buf, pos + 1, end - 1) != buf[end - 1]:
+                self.crc_errors += 1
+                self.skipped += 1
+                pos += 1
+                continue
+
+            seq, ticks_us = struct.unpack_from("<HI", buf, pos + 1)
+            values = struct.unpack_from("<%dH" % count, buf, pos + HEADER_SIZE)
+            self._track_sequence(seq)
+            out.append((seq, ticks_us, values))
+            pos = end
+
+        del buf[:pos]
+        return out
+
+    def _track_sequence(self, seq):
+        if self._last_seq is not None:
+            gap = (seq - self._last_seq - 1) & 0xFFFF
+            # A huge "gap" is a Pico reset, not 60k lost frames
+            if gap < 0x8000:
+                self.lost += gap
+        self._last_seq = seq
+        self.frames += 1
+
+    def status(self):
+        """Short counters text for status lines."""
+        return f"frames {self.frames} lost {self.lost} crc {self.crc_errors}"
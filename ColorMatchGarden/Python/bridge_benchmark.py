@@ -0,0 +1,355 @@
+"""
+Bridge Latency & Throughput Benchmark for Color Match Garden
+============================================================
+Drives the real bridge scripts through a fake Pico (a pseudo-terminal)
+and a local UDP sink, without any hardware or Unity:
+
+    benchmark --> pty master ~~> bridge (pty slave as SERIAL_PORT)
+                                   |
+    benchmark <-- UDP sink <-------+  (UNITY_PORT)
+
+Every line carries a sample id encoded in its values, so each datagram is
+matched to the moment its line was written. Each case reports p50/p95/p99
+serial-to-UDP latency, delivery, and bridge CPU time per sample; the max
+sustainable rate is the highest swept rate that still delivers
+>= 99% of samples with p99 under 50 ms.
+
+Results are appended to bench_results.jsonl, tagged with the git commit,
+so runs can be compared across commits.
+
+USAGE (Linux/macOS - needs pty support):
+  python bridge_benchmark.py                           (full sweep)
+  python bridge_benchmark.py --bridge five --rates 100 1000 --duration 2
+  python bridge_benchmark.py --compare abc1234         (vs. an older commit)
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import tty
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_FILE = os.path.join(HERE, "bench_results.jsonl")
+
+DEFAULT_RATES = [50, 200, 500, 1000, 2000]
+DEFAULT_DURATION = 3.0          # Seconds measured per case
+STARTUP_TIMEOUT = 10.0          # Seconds to wait for the first datagram
+DRAIN_TIME = 0.5                # Seconds to wait for stragglers
+SUSTAINED_DELIVERY = 0.99
+SUSTAINED_P99_MS = 50.0
+LEVELS = 101                    # Values are sent as 0.00-1.00 in 0.01 steps
+
+# bridge -> module, host constant name, line formats, sensor channels
+BRIDGES = {
+    "five": ("five_sensor_bridge", "UNITY_HOST", ["csv", "json"], 5),
+    "three": ("three_sensor_bridge", "UNITY_HOST", ["rgb", "csv"], 3),
+    "thonny": ("ThonnyUnityBridge", "UNITY_IP", ["csv"], 3),
+}
+FINGERS = ["thumb", "index", "middle", "ring", "pinky"]
+
+
+def id_to_levels(sample_id, channels):
+    """Sample id -> per-channel levels 0-100 (base-101 digits)."""
+    levels = []
+    for _ in range(channels):
+        levels.append(sample_id % LEVELS)
+        sample_id //= LEVELS
+    return levels
+
+
+def levels_to_id(levels):
+    sample_id = 0
+    for level in reversed(levels):
+        sample_id = sample_id * LEVELS + level
+    return sample_id
+
+
+def make_line(bridge, fmt, levels, extra_channels):
+    """Build the line a Pico would print for these levels."""
+    padding = [0] * extra_channels
+    if bridge == "three":
+        # three_sensor_bridge normalizes raw ADC with FLAT=50000, BENT=20000
+        raw = [50000 - 300 * level for level in levels] + padding
+        if fmt == "rgb":
+            text = f"R:{raw[0]},G:{raw[1]},B:{raw[2]}"
+            if extra_channels:
+                text += "," + ",".join(map(str, raw[3:]))
+            return text
+        return ",".join(map(str, raw))
+    if fmt == "json":
+        data = {name: {"voltage": 1.5, "percent": level}
+                for name, level in zip(FINGERS, levels)}
+        return json.dumps(data)
+    return ",".join(map(str, levels + padding))
+
+
+def message_to_id(message):
+    """Unity datagram ("T:0.12,I:..." / "R:0.12,...") -> sample id."""
+    levels = []
+    for part in message.decode().split(","):
+        levels.append(round(float(part.split(":")[-1]) * 100))
+    return levels_to_id(levels)
+
+
+def percentile(ordered, p):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def start_bridge(bridge, port_path, udp_port):
+    module, host_name, _, _ = BRIDGES[bridge]
+    code = (f"import sys; sys.argv = [{module!r}]; import {module} as b; "
+            f"b.SERIAL_PORT = {port_path!r}; b.{host_name} = '127.0.0.1'; "
+            f"b.UNITY_PORT = {udp_port}; b.main()")
+    return subprocess.Popen([sys.executable, "-c", code], cwd=HERE,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def process_cpu(pid):
+    """CPU seconds used so far by a running process (Linux /proc), or None."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    # utime and stime are fields 14 and 15 of /proc/PID/stat
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def stop_bridge(proc):
+    """
+    SIGINT the bridge (clean KeyboardInterrupt) and return its CPU seconds.
+
+    A bridge that already exited (e.g. failed at start-up) is only reaped;
+    its CPU time is unknown then and 0.0 is returned.
+    """
+    if proc.poll() is not None:
+        return 0.0
+    # Last /proc reading, in case the child is reaped before wait4 sees it
+    cpu = process_cpu(proc.pid) or 0.0
+    # os.kill, not send_signal() / kill(): those poll first and may reap it
+    os.kill(proc.pid, signal.SIGINT)
+    deadline = time.time() + 5
+    try:
+        while time.time() < deadline:
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                proc.returncode = os.waitstatus_to_exitcode(status)
+                return usage.ru_utime + usage.ru_stime
+            time.sleep(0.02)
+        os.kill(proc.pid, signal.SIGKILL)
+        _, status, usage = os.wait4(proc.pid, 0)
+    except ChildProcessError:
+        return cpu
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_case(bridge, fmt, channels, rate, duration):
+    """Benchmark one bridge/format/channel-count/rate combination."""
+    sensor_channels = BRIDGES[bridge][3]
+    extra = max(0, channels - sensor_channels)
+
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    sink.settimeout(0.2)
+
+    sent_at = {}
+    latencies = []
+    received = [0]
+    stop = threading.Event()
+
+    def receive():
+        while not stop.is_set():
+            try:
+                data = sink.recv(2048)
+            except socket.timeout:
+                continue
+            now = time.perf_counter()
+            try:
+                sample_id = message_to_id(data)
+            except ValueError:
+                continue
+            start = sent_at.pop(sample_id, None)
+            if start is not None:
+                latencies.append((now - start) * 1000.0)
+                received[0] += 1
+
+    receiver = threading.Thread(target=receive, daemon=True)
+    receiver.start()
+    proc = start_bridge(bridge, os.ttyname(slave), sink.getsockname()[1])
+
+    # Warm up until the bridge answers (id 0 is never measured)
+    warm_line = (make_line(bridge, fmt, [0] * sensor_channels, extra) + "\n").encode()
+    deadline = time.time() + STARTUP_TIMEOUT
+    while received[0] == 0 and time.time() < deadline:
+        sent_at[0] = time.perf_counter()
+        os.write(master, warm_line)
+        time.sleep(0.05)
+    if received[0] == 0:
+        stop.set()
+        stop_bridge(proc)
+        os.close(master)
+        os.close(slave)
+        sink.close()
+        return None
+    time.sleep(0.2)
+    received[0] = 0
+    latencies.clear()
+    sent_at.clear()
+    # Exclude interpreter start-up from CPU per sample where possible
+    cpu_before = process_cpu(proc.pid) or 0.0
+
+    # Paced writer
+    period = 1.0 / rate
+    total = int(rate * duration)
+    start = time.perf_counter()
+    for n in range(total):
+        due = start + n * period
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        sample_id = n % (LEVELS ** sensor_channels - 1) + 1
+        line = make_line(bridge, fmt, id_to_levels(sample_id, sensor_channels), extra)
+        sent_at[sample_id] = time.perf_counter()
+        os.write(master, (line + "\n").encode())
+    elapsed = time.perf_counter() - start
+
+    time.sleep(DRAIN_TIME)
+    cpu_seconds = max(0.0, stop_bridge(proc) - cpu_before)
+    stop.set()
+    receiver.join()
+    os.close(master)
+    os.close(slave)
+    sink.close()
+
+    ordered = sorted(latencies)
+    return {
+        "bridge": bridge,
+        "format": fmt,
+        "channels": max(channels, sensor_channels),
+        "rate": rate,
+        "achieved_rate": round(total / elapsed, 1),
+        "sent": total,
+        "received": received[0],
+        "delivery": round(received[0] / total, 4) if total else 0.0,
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "cpu_us_per_sample": round(cpu_seconds * 1e6 / max(received[0], 1), 1),
+    }
+
+
+def is_sustained(result):
+    return (result["delivery"] >= SUSTAINED_DELIVERY
+            and result["p99_ms"] <= SUSTAINED_P99_MS)
+
+
+def case_key(result):
+    return (result["bridge"], result["format"], result["channels"], result["rate"])
+
+
+def print_table(results, baseline=None):
+    print(f"\n{'bridge':7} {'fmt':5} {'ch':>3} {'rate':>6} {'deliv':>6} "
+          f"{'p50':>8} {'p95':>8} {'p99':>8} {'cpu/smp':>9}")
+    for r in results:
+        line = (f"{r['bridge']:7} {r['format']:5} {r['channels']:3d} {r['rate']:6d} "
+                f"{r['delivery']:6.1%} {r['p50_ms']:7.2f}m {r['p95_ms']:7.2f}m "
+                f"{r['p99_ms']:7.2f}m {r['cpu_us_per_sample']:7.1f}us")
+        old = baseline.get(case_key(r)) if baseline else None
+        if old:
+            line += f"  (p99 was {old['p99_ms']:.2f}m, cpu {old['cpu_us_per_sample']:.1f}us)"
+        print(line)
+
+
+def print_max_rates(results):
+    best = {}
+    for r in results:
+        key = (r["bridge"], r["format"], r["channels"])
+        best.setdefault(key, 0)
+        if is_sustained(r):
+            best[key] = max(best[key], r["rate"])
+    print("\nMax sustainable rate (>= 99% delivered, p99 <= 50 ms):")
+    for (bridge, fmt, channels), rate in best.items():
+        print(f"  {bridge:7} {fmt:5} {channels:3d} ch: {rate or 'below lowest swept'} Hz")
+
+
+def load_results(commit):
+    """Latest stored result for each case recorded at `commit`."""
+    baseline = {}
+    if not os.path.exists(RESULTS_FILE):
+        return baseline
+    with open(RESULTS_FILE) as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get("commit", "").startswith(commit):
+                baseline[case_key(record)] = record
+    return baseline
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bridge latency/throughput benchmark")
+    parser.add_argument("--bridge", choices=list(BRIDGES), action="append",
+                        help="Bridge(s) to test (default: all)")
+    parser.add_argument("--format", action="append", dest="formats",
+                        help="Line format(s): csv, json, rgb (default: all per bridge)")
+    parser.add_argument("--channels", type=int, nargs="+", default=[0],
+                        help="Channel counts per line (extra channels are padding)")
+    parser.add_argument("--rates", type=int, nargs="+", default=DEFAULT_RATES)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION)
+    parser.add_argument("--compare", metavar="COMMIT",
+                        help="Show stored results from COMMIT next to this run")
+    parser.add_argument("--no-save", action="store_true", help="Don't append results")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    baseline = load_results(args.compare) if args.compare else None
+    results = []
+
+    print(f"Benchmarking bridges at commit {commit}")
+    for bridge in args.bridge or list(BRIDGES):
+        formats = [f for f in BRIDGES[bridge][2] if not args.formats or f in args.formats]
+        for fmt in formats:
+            for channels in args.channels:
+                for rate in args.rates:
+                    print(f"  {bridge} {fmt} {channels or BRIDGES[bridge][3]}ch @ {rate} Hz ...",
+                          end="", flush=True)
+                    result = run_case(bridge, fmt, channels, rate, args.duration)
+                    if result is None:
+                        print(" bridge did not start")
+                        continue
+                    print(f" p99 {result['p99_ms']:.2f} ms, {result['delivery']:.1%} delivered")
+                    result["commit"] = commit
+                    result["time"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+                    results.append(result)
+
+    print_table(results, baseline)
+    print_max_rates(results)
+
+    if results and not args.no_save:
+        with open(RESULTS_FILE, "a") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+        print(f"\nSaved {len(results)} results to {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Metrics for the Unity Bridges
+=============================
+Shared by five_sensor_bridge.py, three_sensor_bridge.py and bridge_service.py
+
+Counters and latency histograms for every stage of a bridge:
+
+    read       serial wake -> lines / frames decoded
+    parse      one line -> values
+    normalize  calibration profile (--profile / --calibrate)
+    send       UDP / batch / shared-memory hand-off
+    latency    serial wake -> sample sent (end to end)
+
+plus lines read, samples sent, parse errors, ignored lines and samples
+per wake (how far behind the bridge runs). Counters the bridges already
+keep (coalescing, binary frame loss, reconnects) are read only when the
+metrics are exported, so they cost nothing per sample.
+
+On the hot path a counter is one addition and a histogram observation
+one bisect over ~12 fixed buckets (well under a microsecond), so the
+metrics are always collected; exporting is optional:
+
+  --metrics [PORT]          Prometheus text on http://127.0.0.1:PORT/metrics
+  --stats-datagram [PORT]   JSON stats datagram to 127.0.0.1:PORT every second
+
+Run this on your COMPUTER (not Pico)
+"""
+
+import json
+import socket
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ============ CONFIGURATION ============
+METRICS_PORT = 9108       # --metrics HTTP port (Prometheus scrape target)
+STATS_PORT = 5099         # --stats-datagram UDP port
+STATS_INTERVAL = 1.0      # Seconds between stats datagrams
+PREFIX = "cmg_bridge_"
+# =======================================
+
+# Stage timing buckets (seconds): 20 us .. 250 ms
+LATENCY_BUCKETS = (0.00002, 0.00005, 0.0001, 0.00025, 0.0005, 0.001,
+                   0.0025, 0.005, 0.01, 0.025, 0.1, 0.25)
+# Samples per serial wake
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+STAGES = ("read", "parse", "normalize", "send", "latency")
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+class Counter:
+    """Monotonic count; read=function makes it a view of an existing counter."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels, read=None):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.read = read
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def get(self):
+        return self.read() if self.read is not None else self.value
+
+    def render(self):
+        return [f"{self.name}{_label_text(self.labels)} {self.get()}"]
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus cumulative buckets on export)."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.bounds = list(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)     # Last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (0-100)."""
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.bounds[i] if i < len(self.bounds) else float("inf")
+        return float("inf")
+
+    def render(self):
+        lines = []
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            labels = dict(self.labels, le=f"{bound:g}")
+            lines.append(f"{self.name}_bucket{_label_text(labels)} {seen}")
+        labels = dict(self.labels, le="+Inf")
+        lines.append(f"{self.name}_bucket{_label_text(labels)} {self.count}")
+        lines.append(f"{self.name}_sum{_label_text(self.labels)} {self.sum:.6f}")
+        lines.append(f"{self.name}_count{_label_text(self.labels)} {self.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """All metrics of one process, rendered in Prometheus text format."""
+
+    def __init__(self):
+        self.metrics = []
+        self.started = time.time()
+
+    def counter(self, name, help_text, labels=None, read=None):
+        metric = Counter(PREFIX + name, help_text, labels or {}, read)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, labels=None, buckets=LATENCY_BUCKETS):
+        metric = Histogram(PREFIX + name, help_text, labels or {}, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Prometheus text exposition (HELP/TYPE once per metric name)."""
+        lines = []
+        described = set()
+        for metric in sorted(self.metrics, key=lambda m: m.name):
+            if metric.name not in described:
+                described.add(metric.name)
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        lines.append(f"# HELP {PREFIX}uptime_seconds Seconds since the bridge started")
+        lines.append(f"# TYPE {PREFIX}uptime_seconds gauge")
+        lines.append(f"{PREFIX}uptime_seconds {time.time() - self.started:.1f}")
+        return "\n".join(lines) + "\n"
+
+
+class BridgeMetrics:
+    """The standard set of metrics for one bridge (or one bridge_service source)."""
+
+    def __init__(self, registry=None, **labels):
+        """
+        Args:
+            registry: MetricsRegistry to add to (a private one if None)
+            labels: e.g. bridge="three", source="P1@COM5"
+        """
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.labels = labels
+        r = self.registry
+        self.lines = r.counter("lines_total", "Lines or frames read from the Pico", labels)
+        self.samples = r.counter("samples_total", "Samples sent to Unity", labels)
+        self.parse_errors = r.counter("parse_errors_total", "Malformed lines or frames", labels)
+        self.ignored = r.counter("ignored_lines_total", "Lines that are not sensor data", labels)
+        self.batch = r.histogram("samples_per_wake", "Lines or frames per serial wake",
+                                 labels, BATCH_BUCKETS)
+        self.stages = {}
+        for stage in STAGES:
+            self.stages[stage] = r.histogram(
+                "stage_seconds", "Time spent per stage", dict(labels, stage=stage))
+        self.read = self.stages["read"]
+        self.parse = self.stages["parse"]
+        self.normalize = self.stages["normalize"]
+        self.send = self.stages["send"]
+        self.latency = self.stages["latency"]
+        self.last_error = None
+
+    def parse_error(self, line):
+        self.parse_errors.inc()
+        self.last_error = line
+
+    def watch(self, name, help_text, read):
+        """Export an existing counter (read() is only called on export)."""
+        self.registry.counter(name, help_text, self.labels, read)
+
+    def snapshot(self):
+        """Plain dict for the stats datagram."""
+        return {
+            "lines": self.lines.get(),
+            "samples": self.samples.get(),
+            "parse_errors": self.parse_errors.get(),
+            "ignored": self.ignored.get(),
+            "stages_ms": {stage: {"p50": round(h.percentile(50) * 1000, 3),
+                                  "p99": round(h.percentile(99) * 1000, 3)}
+                          for stage, h in self.stages.items()},
+        }
+
+    def summary(self):
+        """One line for the bridge's stop message."""
+        text = (f"{self.lines.get()} lines | {self.samples.get()} sent | "
+                f"{self.parse_errors.get()} parse errors | {self.ignored.get()} ignored")
+        if self.last_error is not None:
+            text += f" | last bad line {self.last_error[:40]!r}"
+        return text
+
+
+def serve_metrics(registry, port=METRICS_PORT, host="127.0.0.1"):
+    """Serve /metrics from a daemon thread. Returns the server (shutdown() to stop)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass    # Keep the bridge's status line clean
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class StatsReporter:
+    """Sends a JSON stats datagram every interval from a background thread."""
+
+    def __init__(self, sources, port=STATS_PORT, host="127.0.0.1", interval=STATS_INTERVAL):
+        """
+        Args:
+            sources: BridgeMetrics to report (one per bridge / service source)
+        """
+        self.sources = sources
+        self.address = (host, port)
+        self.interval = interval
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.stop_event = threading.Event()
+        self.previous = {}
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def message(self):
+        """{"t": ..., "sources": [{labels, counters, rates/s, stage p50/p99}]}"""
+        sources = []
+        for metrics in self.sources:
+            data = dict(metrics.labels)
+            data.update(metrics.snapshot())
+            # Rates since the previous datagram
+            key = id(metrics)
+            counts = (data["lines"], data["samples"], data["parse_errors"])
+            before = self.previous.get(key, (0, 0, 0))
+            self.previous[key] = counts
+            data["lines_per_s"] = round((counts[0] - before[0]) / self.interval, 1)
+            data["samples_per_s"] = round((counts[1] - before[1]) / self.interval, 1)
+            data["errors_per_s"] = round((counts[2] - before[2]) / self.interval, 1)
+            sources.append(data)
+        return json.dumps({"t": round(time.time(), 3), "sources": sources})
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.sock.sendto(self.message().encode(), self.address)
+            except OSError:
+                pass    # Nobody listening / network down - try again next time
+
+    def stop(self):
+        self.stop_event.set()
+        self.sock.close()
+
+
+def start_export(sources, metrics_port=None, stats_port=None):
+    """
+    Start the exporters asked for on the command line.
+
+    Returns:
+        Function that stops them
+    """
+    server = reporter = None
+    if metrics_port:
+        registry = sources[0].registry
+        server = serve_metrics(registry, metrics_port)
+        print(f"📈 Metrics on http://127.0.0.1:{metrics_port}/metrics")
+    if stats_port:
+        reporter = StatsReporter(sources, stats_port)
+        print(f"📈 Stats datagrams to 127.0.0.1:{stats_port} every {STATS_INTERVAL:g}s")
+
+    def stop():
+        if server is not None:
+            server.shutdown()
+        if reporter is not None:
+            reporter.stop()
+    return stop
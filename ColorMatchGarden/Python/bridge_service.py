@@ -0,0 +1,389 @@
+"""
+Bridge Service for Color Match Garden
+=====================================
+One asyncio process that hosts any mix of sensor and camera sources for a
+booth, instead of running flex_sensor_bridge.py, three_sensor_bridge.py,
+five_sensor_bridge.py, ThonnyUnityBridge.py and gesture_detection.py as
+separate scripts.
+
+SOURCES:
+  --serial KIND:PORT[:UDP_PORT,UDP_PORT...]   (repeatable)
+      KIND = five   (CSV/JSON percentages -> T:..,I:..,M:..,R:..,P:..)
+             three  (raw ADC "R:..,G:..,B:.."  -> R:..,G:..,B:..)
+             flex   (single raw ADC value      -> percentage)
+             thonny (3 percentages "p1,p2,p3"  -> T:..,I:..,M:..)
+  --gesture CAMERA[:UDP_PORT,UDP_PORT...]     (repeatable)
+  --hub KIND[:UDP_PORT]                       (every plugged-in Pico)
+
+If no UDP ports are given, the same default port as the matching
+standalone bridge is used.
+
+MULTI-GLOVE HUB:
+  --hub finds all Picos by USB serial number (glove_discovery.py, no
+  SERIAL_PORT to edit) and gives each a fixed player number.
+  --route ports   player N -> UDP_PORT + (N-1)*100 (one Unity listener each)
+  --route tag     all on UDP_PORT as "P<n>|message" (set playerId in Unity)
+
+EXAMPLE:
+  python bridge_service.py --serial five:COM5 --serial three:COM6:5005,5105 --gesture 0
+  python bridge_service.py --hub five --route tag
+
+Serial reads and the camera loop run in executor threads (blocking reads
+with a timeout), so nothing busy-waits. Unplugged Picos are reopened when
+they come back (serial_supervisor.py); hub gloves are found again by USB
+serial number even if the port name changed. Run this on your COMPUTER.
+"""
+
+import argparse
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+import five_sensor_bridge
+import three_sensor_bridge
+import flex_sensor_bridge
+from serial_ingest import PARSE_ERRORS, LineReader, LatencyStats, Coalescer
+from glove_discovery import GloveRegistry, GLOVES_FILE, find_device, tag_message
+from serial_supervisor import SupervisedSerial
+from bridge_metrics import BridgeMetrics, MetricsRegistry, start_export, METRICS_PORT, STATS_PORT
+
+# ============ CONFIGURATION ============
+BAUD_RATE = 115200
+UNITY_HOST = "127.0.0.1"
+GESTURE_PORT = 5001       # Must match GestureRecognizer.cs
+STATUS_INTERVAL = 1.0     # Seconds between status lines
+# =======================================
+
+
+def parse_flex(line):
+    """Single raw ADC value -> percentage (0-100)"""
+    return flex_sensor_bridge.normalize_flex_value(float(line))
+
+
+def format_flex(percentage):
+    return str(percentage)
+
+
+def parse_thonny(line):
+    """PicoFlexReader "p1,p2,p3" percentages -> normalized (r, g, b)"""
+    if "," not in line:
+        return None
+    parts = line.split(",")
+    if len(parts) < 3:
+        return None
+    return tuple(five_sensor_bridge.clamp01(float(parts[i]) / 100.0) for i in range(3))
+
+
+def format_thonny(values):
+    r, g, b = values
+    return f"T:{r:.2f},I:{g:.2f},M:{b:.2f}"
+
+
+# KIND -> (line parser, Unity message formatter, default UDP port)
+SERIAL_KINDS = {
+    "five": (five_sensor_bridge.parse_line, five_sensor_bridge.format_fingers,
+             five_sensor_bridge.UNITY_PORT),
+    "three": (three_sensor_bridge.parse_line, three_sensor_bridge.format_rgb,
+              three_sensor_bridge.UNITY_PORT),
+    "flex": (parse_flex, format_flex, flex_sensor_bridge.UNITY_PORT),
+    "thonny": (parse_thonny, format_thonny, five_sensor_bridge.UNITY_PORT),
+}
+
+
+class UdpFanout:
+    """Sends each message to every configured Unity port."""
+
+    def __init__(self, transport, host, ports):
+        self.transport = transport
+        self.addresses = [(host, port) for port in ports]
+        self.sent = 0
+
+    def send(self, payload):
+        for address in self.addresses:
+            self.transport.sendto(payload, address)
+        self.sent += 1
+
+
+class SourceStats:
+    """Per-source counters for the shared status line."""
+
+    def __init__(self, name, metrics):
+        self.name = name
+        self.metrics = metrics  # BridgeMetrics labelled with this source
+        self.latency = LatencyStats()
+        self.samples = 0
+        self.errors = 0
+        self.connected = False
+        self.link = None        # SupervisedSerial of serial sources
+
+    def status(self):
+        if not self.connected:
+            return f"{self.name}: offline"
+        if self.link is not None and not self.link.connected:
+            return f"{self.name}: unplugged {self.link.outage_seconds():.0f}s"
+        return f"{self.name}: {self.samples} ok {self.errors} bad {self.latency.status()}"
+
+
+async def serial_source(kind, port, fanout, stats, stop_event, coalesce=False, player=None,
+                        serial_number=None):
+    """Read one Pico and forward every parsed sample to Unity (player = hub tag)."""
+    parse, format_message, _ = SERIAL_KINDS[kind]
+    loop = asyncio.get_running_loop()
+
+    find_port = None
+    if serial_number is not None:
+        find_port = lambda: find_device(serial_number)
+    ser = SupervisedSerial(port, BAUD_RATE, timeout=0.5, find_port=find_port)
+    if not await loop.run_in_executor(None, ser.open):
+        print(f"\n[{stats.name}] Cannot open {port}: {ser.last_error} - waiting for it")
+
+    stats.connected = True
+    stats.link = ser
+    reader = LineReader(ser)
+    coalescer = Coalescer()
+    metrics = stats.metrics
+    metrics.watch("superseded_total", "Samples replaced by a newer one (--coalesce)",
+                  lambda: coalescer.superseded)
+    metrics.watch("reconnects_total", "Serial reconnects after an unplug", lambda: ser.reconnects)
+
+    def on_parse_error(line):
+        stats.errors += 1
+        metrics.parse_error(line)
+
+    try:
+        while not stop_event.is_set():
+            # Blocking read with timeout in a worker thread - no polling
+            wake_time, lines = await loop.run_in_executor(None, reader.read_lines)
+            if not ser.connected:
+                # Unplugged: drop the half line, reads retry the port
+                reader.reset()
+                continue
+            if not lines:
+                continue
+            # Includes the hop from the reader thread back to the event loop
+            metrics.read.observe(time.perf_counter() - wake_time)
+            metrics.lines.inc(len(lines))
+            metrics.batch.observe(len(lines))
+
+            start = time.perf_counter()
+            if coalesce:
+                values = coalescer.newest_line(lines, parse, on_parse_error)
+                batch = [] if values is None else [values]
+            else:
+                batch = []
+                for line in lines:
+                    try:
+                        values = parse(line)
+                    except PARSE_ERRORS:
+                        # One bad line must not end this source (and with it
+                        # every other source gathered in run_service)
+                        on_parse_error(line)
+                        continue
+                    if values is None:
+                        metrics.ignored.inc()
+                    else:
+                        batch.append(values)
+            if batch:
+                metrics.parse.observe((time.perf_counter() - start) / len(batch))
+
+            for values in batch:
+                start = time.perf_counter()
+                message = format_message(values)
+                if player is not None:
+                    message = tag_message(player, message)
+                fanout.send(message.encode())
+                sent = time.perf_counter()
+                metrics.send.observe(sent - start)
+                metrics.latency.observe(sent - wake_time)
+                metrics.samples.inc()
+                stats.latency.add(sent - wake_time)
+                stats.samples += 1
+    finally:
+        stats.connected = False
+        ser.close()
+
+
+async def gesture_source(camera_index, fanout, stats, stop_event):
+    """Run the MediaPipe gesture loop in an executor and forward changes."""
+    # Imported here so sensor-only booths don't need OpenCV/MediaPipe
+    import gesture_detection
+
+    loop = asyncio.get_running_loop()
+
+    def on_gesture(gesture):
+        # Called from the camera thread
+        loop.call_soon_threadsafe(fanout.send, gesture.encode())
+        stats.samples += 1
+        stats.metrics.samples.inc()
+
+    stats.connected = True
+    try:
+        await loop.run_in_executor(
+            None, gesture_detection.run_headless, camera_index, on_gesture, stop_event)
+    finally:
+        stats.connected = False
+
+
+async def print_status(all_stats, stop_event):
+    while not stop_event.is_set():
+        await asyncio.sleep(STATUS_INTERVAL)
+        print("\r" + " | ".join(s.status() for s in all_stats) + "  ", end="")
+
+
+def parse_ports(text, default_port):
+    if not text:
+        return [default_port]
+    return [int(p) for p in text.split(",")]
+
+
+def parse_serial_spec(spec):
+    """'five:COM5:5006,5106' -> ('five', 'COM5', [5006, 5106])"""
+    kind, _, rest = spec.partition(":")
+    if kind not in SERIAL_KINDS or not rest:
+        raise argparse.ArgumentTypeError(
+            f"expected KIND:PORT[:UDP_PORTS] with KIND in {', '.join(SERIAL_KINDS)}")
+    port, _, ports = rest.partition(":")
+    return kind, port, parse_ports(ports, SERIAL_KINDS[kind][2])
+
+
+def parse_hub_spec(spec):
+    """'five:5006' -> ('five', 5006)"""
+    kind, _, port = spec.partition(":")
+    if kind not in SERIAL_KINDS:
+        raise argparse.ArgumentTypeError(
+            f"expected KIND[:UDP_PORT] with KIND in {', '.join(SERIAL_KINDS)}")
+    return kind, int(port) if port else SERIAL_KINDS[kind][2]
+
+
+def hub_specs(hub, route, gloves_file=GLOVES_FILE):
+    """
+    One serial source per discovered glove.
+
+    Returns:
+        list of (name, kind, device, udp_ports, player tag or None, serial number)
+    """
+    kind, base_port = hub
+    specs = []
+    for glove in GloveRegistry(gloves_file).discover():
+        if route == "tag":
+            specs.append((glove.name, kind, glove.device, [base_port], glove.player,
+                          glove.serial_number))
+        else:
+            specs.append((glove.name, kind, glove.device, [glove.udp_port(base_port)], None,
+                          glove.serial_number))
+    return specs
+
+
+def parse_gesture_spec(spec):
+    """'0:5001' -> (0, [5001])"""
+    camera, _, ports = spec.partition(":")
+    return int(camera), parse_ports(ports, GESTURE_PORT)
+
+
+async def run_service(serial_specs, gesture_specs, host=UNITY_HOST, coalesce=False, glove_specs=(),
+                      metrics_port=None, stats_port=None):
+    loop = asyncio.get_running_loop()
+    # Every source parks one worker in a blocking read; the default pool
+    # (cpu_count + 4) would make the 9th glove wait for a free thread
+    loop.set_default_executor(ThreadPoolExecutor(
+        max_workers=len(serial_specs) + len(glove_specs) + len(gesture_specs) + 4))
+    transport, _ = await loop.create_datagram_endpoint(
+        asyncio.DatagramProtocol, local_addr=("0.0.0.0", 0))
+    stop_event = threading.Event()
+
+    registry = MetricsRegistry()
+    tasks = []
+    all_stats = []
+    for kind, port, ports in serial_specs:
+        name = f"{kind}@{port}"
+        stats = SourceStats(name, BridgeMetrics(registry, bridge=kind, source=name))
+        all_stats.append(stats)
+        fanout = UdpFanout(transport, host, ports)
+        tasks.append(serial_source(kind, port, fanout, stats, stop_event, coalesce))
+        print(f"  [{stats.name}] -> {host}:{','.join(map(str, ports))}")
+    for name, kind, port, ports, player, serial_number in glove_specs:
+        stats = SourceStats(f"{name}@{port}",
+                            BridgeMetrics(registry, bridge=kind, source=name))
+        all_stats.append(stats)
+        fanout = UdpFanout(transport, host, ports)
+        tasks.append(serial_source(kind, port, fanout, stats, stop_event, coalesce, player,
+                                   serial_number))
+        tag = f" as P{player}|" if player is not None else ""
+        print(f"  [{stats.name}] -> {host}:{','.join(map(str, ports))}{tag}")
+    for camera, ports in gesture_specs:
+        name = f"camera{camera}"
+        stats = SourceStats(name, BridgeMetrics(registry, bridge="gesture", source=name))
+        all_stats.append(stats)
+        fanout = UdpFanout(transport, host, ports)
+        tasks.append(gesture_source(camera, fanout, stats, stop_event))
+        print(f"  [{stats.name}] -> {host}:{','.join(map(str, ports))}")
+
+    stop_export = start_export([stats.metrics for stats in all_stats], metrics_port, stats_port)
+    status_task = asyncio.ensure_future(print_status(all_stats, stop_event))
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # Executor threads check this between blocking reads
+        stop_event.set()
+        stop_export()
+        status_task.cancel()
+        transport.close()
+        print()
+        for stats in all_stats:
+            print(f"  {stats.name}: {stats.samples} samples, {stats.errors} errors | "
+                  f"{stats.latency.summary()}")
+            if stats.metrics.parse_errors.get():
+                print(f"    {stats.metrics.summary()}")
+            if stats.link is not None and stats.link.outages:
+                print(f"    {stats.link.status()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Color Match Garden bridge service")
+    parser.add_argument("--serial", action="append", default=[], type=parse_serial_spec,
+                        metavar="KIND:PORT[:UDP_PORTS]", help="Serial sensor source")
+    parser.add_argument("--gesture", action="append", default=[], type=parse_gesture_spec,
+                        metavar="CAMERA[:UDP_PORTS]", help="Camera gesture source")
+    parser.add_argument("--hub", type=parse_hub_spec, metavar="KIND[:UDP_PORT]",
+                        help="Serve every plugged-in Pico of this kind (multi-glove hub)")
+    parser.add_argument("--route", choices=("ports", "tag"), default="ports",
+                        help="Hub: one UDP port per player, or a shared port with P<n>| tags")
+    parser.add_argument("--gloves", default=GLOVES_FILE,
+                        help="Hub: USB serial number -> player file")
+    parser.add_argument("--host", default=UNITY_HOST, help="Unity host")
+    parser.add_argument("--metrics", nargs="?", type=int, const=METRICS_PORT, metavar="PORT",
+                        help=f"Serve Prometheus metrics on http://127.0.0.1:PORT/metrics (default {METRICS_PORT})")
+    parser.add_argument("--stats-datagram", nargs="?", type=int, const=STATS_PORT, metavar="PORT",
+                        help=f"Send a JSON stats datagram every second (default port {STATS_PORT})")
+    parser.add_argument("--coalesce", action="store_true",
+                        help="Forward only the newest sample per serial read")
+    args = parser.parse_args()
+
+    if not args.serial and not args.gesture and not args.hub:
+        parser.error("add at least one --serial, --gesture or --hub source")
+
+    print("=" * 60)
+    print("  🌸 Color Match Garden - Bridge Service 🌸")
+    print("=" * 60)
+
+    glove_specs = []
+    if args.hub:
+        # Gloves already listed with --serial are not opened twice
+        taken = {port for _, port, _ in args.serial}
+        glove_specs = [spec for spec in hub_specs(args.hub, args.route, args.gloves)
+                       if spec[2] not in taken]
+        print(f"🧤 Hub found {len(glove_specs)} glove(s)")
+        if not glove_specs and not args.serial and not args.gesture:
+            print("❌ No Pico found - plug in a glove (python glove_discovery.py lists them)")
+            return
+
+    try:
+        asyncio.run(run_service(args.serial, args.gesture, args.host, args.coalesce, glove_specs,
+                                args.metrics, args.stats_datagram))
+    except KeyboardInterrupt:
+        print("\n👋 Bridge service stopped")
+
+
+if __name__ == "__main__":
+    main()
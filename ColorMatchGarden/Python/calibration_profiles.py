@@ -0,0 +1,172 @@
+"""
+Player Calibration Profiles for Color Match Garden
+==================================================
+Named per-player calibration for the bridges, kept on the computer in
+calibration_profiles.json. Hands differ: one player bends the sensors
+all the way, the next only half way. A profile stores, per channel, the
+flat and bent levels that player actually reaches (in the bridge's
+normalized 0.0-1.0 values) and stretches that range to the full 0.0-1.0.
+
+Switching players is a command-line option - no Pico re-flash and no
+source edits. Recording a profile takes a few seconds: start the bridge
+with --calibrate NAME and have the player open and close the hand fully
+a couple of times. The bridge keeps streaming while it records.
+
+USAGE:
+  python five_sensor_bridge.py --calibrate alice    (record, save, use)
+  python five_sensor_bridge.py --profile alice      (use a saved profile)
+  python calibration_profiles.py                    (list profiles)
+  python calibration_profiles.py --delete alice
+"""
+
+import argparse
+import json
+import os
+import time
+
+PROFILES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "calibration_profiles.json")
+RECORD_SECONDS = 5.0      # Length of a --calibrate capture
+MIN_RANGE = 0.05          # Channels that barely moved keep the full range
+
+
+class ChannelProfile:
+    """Per-channel flat..bent range mapped to 0.0-1.0."""
+
+    def __init__(self, flat, bent):
+        self.flat = [float(v) for v in flat]
+        self.bent = [float(v) for v in bent]
+        self.scales = []
+        for low, high in zip(self.flat, self.bent):
+            span = high - low
+            self.scales.append(1.0 / span if abs(span) >= MIN_RANGE else None)
+
+    def apply(self, values):
+        """Stretch one sample to the player's range (clamped to 0.0-1.0)"""
+        out = []
+        for value, low, scale in zip(values, self.flat, self.scales):
+            if scale is not None:
+                value = (value - low) * scale
+            out.append(max(0.0, min(1.0, value)))
+        return tuple(out)
+
+    def to_dict(self):
+        return {"flat": self.flat, "bent": self.bent}
+
+
+class ProfileStore:
+    """Named profiles in a JSON file: {name: {kind: {"flat": [...], "bent": [...]}}}."""
+
+    def __init__(self, path=PROFILES_FILE):
+        self.path = path
+        self.profiles = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.profiles = json.load(f)
+
+    def names(self):
+        return sorted(self.profiles)
+
+    def get(self, name, kind):
+        """ChannelProfile for one bridge kind ("five", "three"); KeyError if missing"""
+        data = self.profiles[name][kind]
+        return ChannelProfile(data["flat"], data["bent"])
+
+    def put(self, name, kind, profile):
+        entry = self.profiles.setdefault(name, {})
+        entry[kind] = profile.to_dict()
+        entry[kind]["saved"] = time.strftime("%Y-%m-%d %H:%M")
+        self.save()
+
+    def delete(self, name):
+        del self.profiles[name]
+        self.save()
+
+    def save(self):
+        # Write-then-rename: a crash never leaves a truncated file
+        temp = self.path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(self.profiles, f, indent=2)
+        os.replace(temp, self.path)
+
+
+class PlayerProfile:
+    """
+    Calibration stage for one bridge session.
+
+    With record=False the named profile is loaded and applied to every
+    sample. With record=True samples pass through unchanged for
+    RECORD_SECONDS while the per-channel extremes are tracked; the result
+    is then saved under the name and applied from the next sample on.
+    """
+
+    def __init__(self, name, kind, channels, record=False, store=None,
+                 seconds=RECORD_SECONDS):
+        self.name = name
+        self.kind = kind
+        self.store = store if store is not None else ProfileStore()
+        self.profile = None
+        self.recording = record
+        if record:
+            self.seconds = seconds
+            self.started = None
+            self.low = [1.0] * channels
+            self.high = [0.0] * channels
+        else:
+            self.profile = self.store.get(name, kind)
+
+    def apply(self, values):
+        """Calibrated values for one sample"""
+        if self.recording:
+            self._record(values)
+            return values
+        return self.profile.apply(values)
+
+    def _record(self, values):
+        now = time.perf_counter()
+        if self.started is None:
+            self.started = now
+        for i, value in enumerate(values):
+            if value < self.low[i]:
+                self.low[i] = value
+            if value > self.high[i]:
+                self.high[i] = value
+        if now - self.started >= self.seconds:
+            self.profile = ChannelProfile(self.low, self.high)
+            self.store.put(self.name, self.kind, self.profile)
+            self.recording = False
+            print(f"\n💾 Saved profile '{self.name}' ({self.store.path})")
+            print(f"   {self.describe()}")
+
+    def describe(self):
+        if self.recording:
+            return f"recording profile '{self.name}'..."
+        ranges = " ".join(f"{low:.2f}-{high:.2f}"
+                          for low, high in zip(self.profile.flat, self.profile.bent))
+        return f"profile '{self.name}': {ranges}"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="List or delete player calibration profiles")
+    parser.add_argument("--file", default=PROFILES_FILE, help="Profiles file")
+    parser.add_argument("--delete", metavar="NAME", help="Remove a profile")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    store = ProfileStore(args.file)
+    if args.delete:
+        if args.delete not in store.profiles:
+            print(f"❌ No profile named '{args.delete}'")
+        else:
+            store.delete(args.delete)
+            print(f"🗑️  Deleted '{args.delete}'")
+    elif not store.profiles:
+        print(f"No profiles yet in {store.path}")
+        print("Record one with: python five_sensor_bridge.py --calibrate NAME")
+    else:
+        for name in store.names():
+            kinds = ", ".join(f"{kind} ({data.get('saved', '?')})"
+                              for kind, data in store.profiles[name].items())
+            print(f"  {name:<16} {kinds}")
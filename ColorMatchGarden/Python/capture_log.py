@@ -0,0 +1,207 @@
+"""
+Sensor Session Capture and Replay for Color Match Garden
+========================================================
+Records exactly what a glove sent over serial during a real session and
+plays it back through the same bridge code (parse -> normalize -> send),
+without any hardware.
+
+FILE FORMAT (append-only, little-endian):
+  Header:  b"CMGCAP" + uint16 version
+  Records: uint64 time.time_ns() when the bytes arrived
+           uint32 payload length
+           payload (raw serial bytes - text lines or binary frames)
+
+Several sessions can be appended to one file. The reader memory-maps the
+file and walks records in place; a truncated last record (e.g. the bridge
+was killed) is ignored.
+
+USAGE:
+  python five_sensor_bridge.py --record session.cap
+  python five_sensor_bridge.py --replay session.cap            (real time)
+  python five_sensor_bridge.py --replay session.cap --speed 4  (4x)
+  python five_sensor_bridge.py --replay session.cap --speed 0  (max speed)
+  python capture_log.py session.cap                            (summary)
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+
+MAGIC = b"CMGCAP"
+VERSION = 1
+HEADER = struct.Struct("<6sH")
+RECORD = struct.Struct("<QI")
+MAX_REPLAY_GAP_NS = 1000000000   # Gaps between appended sessions play as 1 s
+
+
+class ReplayFinished(Exception):
+    """Raised by ReplaySerial.read() when the capture is exhausted."""
+
+
+class CaptureWriter:
+    """Appends timestamped raw serial chunks to a capture file."""
+
+    def __init__(self, path):
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new_file:
+            check_header(path)
+        self.file = open(path, "ab")
+        if new_file:
+            self.file.write(HEADER.pack(MAGIC, VERSION))
+        self.records = 0
+        self.bytes = 0
+
+    def write(self, chunk, timestamp_ns=None):
+        if not chunk:
+            return
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        self.file.write(RECORD.pack(timestamp_ns, len(chunk)))
+        self.file.write(chunk)
+        self.records += 1
+        self.bytes += len(chunk)
+
+    def close(self):
+        self.file.close()
+
+
+def check_header(path):
+    with open(path, "rb") as f:
+        magic, version = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a Color Match Garden capture (v{VERSION})")
+
+
+class CaptureReader:
+    """Memory-mapped, zero-copy iterator over capture records."""
+
+    def __init__(self, path):
+        check_header(path)
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+    def __iter__(self):
+        """Yield (timestamp_ns, payload memoryview) for every record."""
+        view = self._view
+        size = len(view)
+        pos = HEADER.size
+        while pos + RECORD.size <= size:
+            timestamp_ns, length = RECORD.unpack_from(view, pos)
+            start = pos + RECORD.size
+            if start + length > size:
+                break   # Truncated last record
+            yield timestamp_ns, view[start:start + length]
+            pos = start + length
+
+    def summary(self):
+        """(records, payload bytes, duration in seconds)"""
+        records = 0
+        total = 0
+        first = last = None
+        for timestamp_ns, payload in self:
+            records += 1
+            total += len(payload)
+            if first is None:
+                first = timestamp_ns
+            last = timestamp_ns
+            payload.release()
+        duration = (last - first) / 1e9 if records else 0.0
+        return records, total, duration
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+
+class RecordingSerial:
+    """Wraps an open serial port and records every chunk that is read."""
+
+    def __init__(self, ser, writer):
+        self.ser = ser
+        self.writer = writer
+
+    @property
+    def in_waiting(self):
+        return self.ser.in_waiting
+
+    def read(self, size=1):
+        chunk = self.ser.read(size)
+        self.writer.write(chunk)
+        return chunk
+
+    def close(self):
+        self.writer.close()
+        self.ser.close()
+
+
+class ReplaySerial:
+    """
+    Serial-port stand-in that plays back a capture file.
+
+    Supports the read()/in_waiting interface used by serial_ingest, so the
+    bridges run unchanged. speed=1 is real time, N is N times faster and
+    0 replays as fast as possible.
+    """
+
+    def __init__(self, path, speed=1.0):
+        self.reader = CaptureReader(path)
+        self.speed = speed
+        self._records = iter(self.reader)
+        self._pending = b""
+        self._start_wall = None
+        self._play_ns = 0           # Capture time elapsed (gaps capped)
+        self._last_ts = None
+        self.records = 0
+
+    @property
+    def in_waiting(self):
+        return len(self._pending)
+
+    def _next_record(self):
+        try:
+            timestamp_ns, payload = next(self._records)
+        except StopIteration:
+            raise ReplayFinished()
+
+        if self._last_ts is not None:
+            self._play_ns += min(max(timestamp_ns - self._last_ts, 0), MAX_REPLAY_GAP_NS)
+        self._last_ts = timestamp_ns
+
+        if self.speed > 0:
+            if self._start_wall is None:
+                self._start_wall = time.perf_counter()
+            due = self._start_wall + self._play_ns / 1e9 / self.speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        self._pending = bytes(payload)
+        payload.release()
+        self.records += 1
+
+    def read(self, size=1):
+        if not self._pending:
+            self._next_record()
+        chunk = self._pending[:size]
+        self._pending = self._pending[size:]
+        return chunk
+
+    def close(self):
+        self._records.close()
+        self.reader.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python capture_log.py FILE.cap")
+        sys.exit(1)
+    reader = CaptureReader(sys.argv[1])
+    records, total, duration = reader.summary()
+    reader.close()
+    rate = records / duration if duration > 0 else 0
+    print(f"{sys.argv[1]}: {records} records, {total} bytes, "
+          f"{duration:.1f} s ({rate:.0f} reads/s)")
@@ -1,7 +1,10 @@
 # Flex Sensor "Snap-to-Zero" Test
+# Also copy pico_filters.py to the Pico
 from machine import ADC
 import time
 
+from pico_filters import SnapFilter
+
 # --- CONFIGURATION ---
 flex = ADC(26)
 FLAT_VALUE = 51000  # Updated based on your logs
@@ -9,29 +12,13 @@ BENT_VALUE = 65000  # Updated based on your logs
 SAMPLE_SIZE = 5     # Size of the smoothing buffer
 # ---------------------
 
-buffer = [FLAT_VALUE] * SAMPLE_SIZE
-last_avg = FLAT_VALUE
+# SMART LOGIC:
+# 1. If bending (Value going UP): Smooth it (Standard Buffer)
+# 2. If flattening (Value going DOWN by 500+): SNAP immediately (Fill Buffer)
+snap = SnapFilter(SAMPLE_SIZE, threshold=500, initial=FLAT_VALUE)
 
 def read_smart_flex():
-    global last_avg, buffer
-    
-    raw = flex.read_u16()
-    
-    # SMART LOGIC:
-    # 1. If bending (Value going UP): Smooth it (Standard Buffer)
-    # 2. If flattening (Value going DOWN): SNAP immediately (Fill Buffer)
-    
-    if raw < (last_avg - 500): # If dropping significantly (released)
-        # SNAP DOWN! Clear history to reach 0% instantly
-        buffer = [raw] * SAMPLE_SIZE
-    else:
-        # SMOOTH UP. Keep the history to filter noise
-        buffer.pop(0)
-        buffer.append(raw)
-        
-    # Calculate Average
-    avg = sum(buffer) // SAMPLE_SIZE
-    last_avg = avg
+    avg = snap.update(flex.read_u16())
     
     # Percent Calculation
     # Clamp range first
@@ -13,21 +13,74 @@ FINGER MAPPING:
 Run this on your COMPUTER (not Pico), reads serial from Pico
 """
 
-import serial
+import argparse
 import socket
 import time
-import sys
 import json
 import math
 
+from serial_ingest import PARSE_ERRORS, LineReader, LatencyStats, Coalescer, read_available
+from capture_log import CaptureWriter, RecordingSerial, ReplaySerial, ReplayFinished
+from message_encoder import FiveChannelEncoder
+from shm_transport import SharedMemoryRing
+from udp_batch import UdpBatcher, spread_timestamps
+from calibration_profiles import PlayerProfile, ProfileStore, RECORD_SECONDS
+from binary_protocol import FrameDecoder, PERCENT_SCALE
+from serial_supervisor import SupervisedSerial, LastValueHold
+from bridge_metrics import BridgeMetrics, start_export, METRICS_PORT, STATS_PORT
+
 # ============ CONFIGURATION ============
 SERIAL_PORT = "COM5"      # Your Pico's COM port
 BAUD_RATE = 115200
 UNITY_HOST = "127.0.0.1"
 UNITY_PORT = 5006         # Must match FiveSensorInput.cs
+SHM_FILE = "cmg_five_sensors.shm"  # --shm ring (temp dir), must match FiveSensorInput.cs
 # =======================================
 
-def main():
+# Reused-buffer encoder, byte-identical to format_fingers()
+FINGER_ENCODER = FiveChannelEncoder()
+
+def clamp01(value):
+    """Clamp a value to the 0.0-1.0 range"""
+    return max(0.0, min(1.0, value))
+
+
+def parse_line(line):
+    """
+    Parse one line from the Pico into 5 normalized finger values.
+    
+    Returns:
+        (thumb, index, middle, ring, pinky) in 0.0-1.0, or None if the
+        line is not sensor data. Raises ValueError on malformed numbers.
+    """
+    # Try JSON format first: {"thumb": {"percent": 50.0}, "index": ...}
+    if line.startswith('{'):
+        data = json.loads(line)
+        return (
+            clamp01(data.get('thumb', {}).get('percent', 0) / 100),
+            clamp01(data.get('index', {}).get('percent', 0) / 100),
+            clamp01(data.get('middle', {}).get('percent', 0) / 100),
+            clamp01(data.get('ring', {}).get('percent', 0) / 100),
+            clamp01(data.get('pinky', {}).get('percent', 0) / 100),
+        )
+    
+    # Or simple CSV format: 50.0,30.0,80.0,20.0,10.0 (percentages)
+    if "," in line:
+        parts = line.split(",")
+        if len(parts) >= 5:
+            return (
+                clamp01(float(parts[0]) / 100),
+                clamp01(float(parts[1]) / 100),
+                clamp01(float(parts[2]) / 100),
+                clamp01(float(parts[3]) / 100),
+                clamp01(float(parts[4]) / 100),
+            )
+    return None
+
+
+def main(binary=False, coalesce=False, record=None, replay=None, speed=1.0,
+         batch=1, batch_ms=10.0, shm=None, profile=None, calibrate=None, hold="hold",
+         metrics_port=None, stats_port=None):
     print("=" * 60)
     print("  🖐️  Color Match Garden - 5 Finger Sensor Bridge 🖐️")
     print("=" * 60)
@@ -42,77 +95,298 @@ def main():
     print("  🤙 Pinky  = ✨ MAGIC")
     print("=" * 60)
     
+    # Per-player calibration profile (calibration_profiles.py)
+    player = None
+    if calibrate or profile:
+        try:
+            player = PlayerProfile(calibrate or profile, "five", 5, record=bool(calibrate))
+        except KeyError:
+            print(f"\n❌ No 5-sensor profile named '{profile}'")
+            print(f"   Saved profiles: {', '.join(ProfileStore().names()) or 'none'}")
+            print(f"   Record one with: --calibrate {profile}")
+            return
+        if calibrate:
+            print(f"\n🧑 Recording profile '{calibrate}': open and close the hand fully")
+            print(f"   for {RECORD_SECONDS:g} seconds after the data starts")
+        else:
+            print(f"\n🧑 Using {player.describe()}")
+    
     # Setup UDP socket
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     
-    try:
-        ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
-        print(f"\n✅ Connected to {SERIAL_PORT}")
-    except serial.SerialException as e:
-        print(f"\n❌ Cannot open {SERIAL_PORT}: {e}")
-        print("\n💡 Make sure:")
-        print("   1. Pico is connected via USB")
-        print("   2. Correct COM port is set")
-        print("   3. Thonny is NOT connected to the same port")
-        print("\n🎮 Starting SIMULATION mode instead...")
-        run_simulation(sock)
-        return
+    supervisor = None
+    if replay:
+        # Play a recorded session through the same parse/send path
+        ser = ReplaySerial(replay, speed)
+        pace = "max speed" if speed <= 0 else f"{speed:g}x"
+        print(f"\n▶️  Replaying {replay} at {pace}")
+    else:
+        # Survives unplugs / Pico resets: reconnects when the port is back
+        supervisor = SupervisedSerial(SERIAL_PORT, BAUD_RATE, timeout=1,
+                                      skip_partial_line=not binary)
+        ser = supervisor
+        if supervisor.open():
+            print(f"\n✅ Connected to {SERIAL_PORT}")
+        else:
+            print(f"\n❌ Cannot open {SERIAL_PORT}: {supervisor.last_error}")
+            print("\n💡 Make sure:")
+            print("   1. Pico is connected via USB")
+            print("   2. Correct COM port is set")
+            print("   3. Thonny is NOT connected to the same port")
+            print("\n🔌 Waiting for the Pico (use --sim for simulation mode)...")
+        
+        if record:
+            ser = RecordingSerial(ser, CaptureWriter(record))
+            print(f"⏺️  Recording raw serial data to {record}")
     
     print("\n🎮 Sending 5-finger sensor data to Unity!")
     print("   Bend your fingers to mix colors!\n")
     
+    ring = None
+    batcher = None
+    if shm:
+        # Same-machine transport: Unity reads the ring instead of UDP
+        ring = SharedMemoryRing(shm, 5)
+        print(f"🧠 Writing samples to shared memory {ring.path}\n")
+    elif batch > 1:
+        batcher = UdpBatcher(sock, (UNITY_HOST, UNITY_PORT), batch, batch_ms)
+        print(f"📦 Batching up to {batcher.max_samples} samples / {batch_ms:g} ms per datagram\n")
+    
+    metrics = BridgeMetrics(bridge="five")
+    if supervisor is not None:
+        metrics.watch("reconnects_total", "Serial reconnects after an unplug",
+                      lambda: supervisor.reconnects)
+        metrics.watch("outage_seconds_total", "Time without the Pico",
+                      lambda: round(supervisor.outage_total + supervisor.outage_seconds(), 3))
+    stop_export = start_export([metrics], metrics_port, stats_port)
+    
+    try:
+        if binary:
+            run_binary_bridge(ser, sock, coalesce, batcher, ring, player, supervisor, hold, metrics)
+        else:
+            run_text_bridge(ser, sock, coalesce, batcher, ring, player, supervisor, hold, metrics)
+    finally:
+        stop_export()
+        ser.close()
+        sock.close()
+        if ring is not None:
+            ring.close()
+
+
+def format_fingers(values):
+    """Unity message for 5 finger values, e.g. T:0.5,I:0.3,M:0.8,R:0.2,P:0.1"""
+    thumb, index, middle, ring, pinky = values
+    return f"T:{thumb:.2f},I:{index:.2f},M:{middle:.2f},R:{ring:.2f},P:{pinky:.2f}"
+
+
+def send_fingers(sock, values, batcher=None, timestamp_us=None, ring=None):
+    """Send 5 finger values to Unity (or queue them on a UdpBatcher / SharedMemoryRing)"""
+    if ring is not None:
+        ring.add(values, timestamp_us)
+    elif batcher is not None:
+        batcher.add(format_fingers(values), timestamp_us)
+    else:
+        sock.sendto(FINGER_ENCODER.encode(values), (UNITY_HOST, UNITY_PORT))
+
+
+def show_fingers(values, extra=""):
+    """Live status line"""
+    thumb, index, middle, ring, pinky = values
+    print(f"\r👍{thumb:.0%} 👆{index:.0%} 🖕{middle:.0%} 💍{ring:.0%} 🤙{pinky:.0%}  {extra}  ", end="")
+
+
+def fill_outage(sock, supervisor, holder, now, batcher=None, ring=None):
+    """While the Pico is unplugged: keep Unity on the held / decaying values"""
+    values = holder.fill(now)
+    if values is not None:
+        if batcher is not None:
+            # Fills have no Pico timestamp: close the batch of real samples
+            # and send fills as plain messages, never mixed into a batch
+            batcher.flush()
+        send_fingers(sock, values, None, None, ring)
+        print(f"\r🔌 Pico disconnected {supervisor.outage_seconds():.0f}s - "
+              f"{holder.mode} | {supervisor.status()}  ", end="")
+
+
+def run_text_bridge(ser, sock, coalesce=False, batcher=None, ring=None, profile=None,
+                    supervisor=None, hold="hold", metrics=None):
+    """Forward CSV/JSON lines from the Pico to Unity"""
+    reader = LineReader(ser)
+    latency = LatencyStats()
+    coalescer = Coalescer()
+    holder = LastValueHold(hold)
+    previous_wake = None
+    if metrics is None:
+        metrics = BridgeMetrics(bridge="five")
+    metrics.watch("superseded_total", "Samples replaced by a newer one (--coalesce)",
+                  lambda: coalescer.superseded)
+    
     try:
         while True:
-            if ser.in_waiting:
-                line = ser.readline().decode('utf-8').strip()
+            # Blocks until the Pico sends data, then drains every complete line
+            wake_time, lines = reader.read_lines()
+            metrics.read.observe(time.perf_counter() - wake_time)
+            latest = None
+            
+            if supervisor is not None and not supervisor.connected:
+                # Half a line from before the unplug must not meet new data
+                reader.reset()
+                previous_wake = None
+                fill_outage(sock, supervisor, holder, wake_time, batcher, ring)
+                continue
+            if lines:
+                metrics.lines.inc(len(lines))
+                metrics.batch.observe(len(lines))
+            
+            if coalesce:
+                # Only the newest sample matters - skip the stale backlog
+                start = time.perf_counter()
+                latest = coalescer.newest_line(lines, parse_line, metrics.parse_error)
+                if latest is not None:
+                    parsed = time.perf_counter()
+                    metrics.parse.observe(parsed - start)
+                    if profile is not None:
+                        latest = profile.apply(latest)
+                    normalized = time.perf_counter()
+                    metrics.normalize.observe(normalized - parsed)
+                    send_fingers(sock, latest, batcher, int(wake_time * 1e6), ring)
+                    sent = time.perf_counter()
+                    metrics.send.observe(sent - normalized)
+                    metrics.latency.observe(sent - wake_time)
+                    metrics.samples.inc()
+                    latency.add(sent - wake_time)
+                    holder.update(latest)
+                    show_fingers(latest, f"{latency.status()} | {coalescer.status()}")
+                continue
+            
+            stamps = None
+            if batcher is not None:
+                # Text lines carry no Pico timestamp - estimate arrival times
+                stamps = spread_timestamps(previous_wake, wake_time, len(lines))
+                previous_wake = wake_time
+            
+            for i, line in enumerate(lines):
+                start = time.perf_counter()
                 try:
-                    # Try JSON format first: {"thumb": 0.5, "index": 0.3, ...}
-                    if line.startswith('{'):
-                        data = json.loads(line)
-                        thumb = data.get('thumb', {}).get('percent', 0) / 100
-                        index = data.get('index', {}).get('percent', 0) / 100
-                        middle = data.get('middle', {}).get('percent', 0) / 100
-                        ring = data.get('ring', {}).get('percent', 0) / 100
-                        pinky = data.get('pinky', {}).get('percent', 0) / 100
-                    
-                    # Or simple CSV format: 50.0,30.0,80.0,20.0,10.0 (percentages)
-                    elif "," in line:
-                        parts = line.split(",")
-                        if len(parts) >= 5:
-                            thumb = float(parts[0]) / 100
-                            index = float(parts[1]) / 100
-                            middle = float(parts[2]) / 100
-                            ring = float(parts[3]) / 100
-                            pinky = float(parts[4]) / 100
-                        else:
-                            continue
-                    else:
-                        continue
-                    
-                    # Clamp values
-                    thumb = max(0.0, min(1.0, thumb))
-                    index = max(0.0, min(1.0, index))
-                    middle = max(0.0, min(1.0, middle))
-                    ring = max(0.0, min(1.0, ring))
-                    pinky = max(0.0, min(1.0, pinky))
-                    
-                    # Send to Unity: "T:0.5,I:0.3,M:0.8,R:0.2,P:0.1"
-                    message = f"T:{thumb:.2f},I:{index:.2f},M:{middle:.2f},R:{ring:.2f},P:{pinky:.2f}"
-                    sock.sendto(message.encode(), (UNITY_HOST, UNITY_PORT))
-                    
-                    # Visual display
-                    print(f"\r👍{thumb:.0%} 👆{index:.0%} 🖕{middle:.0%} 💍{ring:.0%} 🤙{pinky:.0%}  ", end="")
-                    
-                except (ValueError, json.JSONDecodeError) as e:
-                    pass  # Ignore parse errors
-                    
-            time.sleep(0.05)
+                    values = parse_line(line)
+                except PARSE_ERRORS:
+                    metrics.parse_error(line)
+                    continue
+                if values is None:
+                    metrics.ignored.inc()
+                    continue
+                parsed = time.perf_counter()
+                metrics.parse.observe(parsed - start)
+                if profile is not None:
+                    values = profile.apply(values)
+                normalized = time.perf_counter()
+                metrics.normalize.observe(normalized - parsed)
+                
+                send_fingers(sock, values, batcher, stamps[i] if stamps else None, ring)
+                sent = time.perf_counter()
+                metrics.send.observe(sent - normalized)
+                metrics.latency.observe(sent - wake_time)
+                metrics.samples.inc()
+                latency.add(sent - wake_time)
+                latest = values
             
-    except KeyboardInterrupt:
+            # Visual display (once per wake, not per line)
+            if latest is not None:
+                holder.update(latest)
+                show_fingers(latest, latency.status())
+            
+    except (KeyboardInterrupt, ReplayFinished):
         print("\n\n👋 Bridge stopped")
-    finally:
-        ser.close()
-        sock.close()
+        print(f"   Serial→UDP latency: {latency.summary()}")
+        print(f"   Metrics: {metrics.summary()}")
+        if supervisor is not None:
+            print(f"   Serial link: {supervisor.status()}")
+        if coalesce:
+            print(f"   Coalescing: {coalescer.status()}")
+        if batcher is not None:
+            batcher.close()
+            print(f"   {batcher.status()}")
+        if ring is not None:
+            print(f"   {ring.status()}")
+        if profile is not None:
+            print(f"   Calibration: {profile.describe()}")
+
+
+def run_binary_bridge(ser, sock, coalesce=False, batcher=None, ring=None, profile=None,
+                      supervisor=None, hold="hold", metrics=None):
+    """Forward binary frames (five_flex_sensors_mux.main_binary) to Unity"""
+    decoder = FrameDecoder()
+    latency = LatencyStats()
+    coalescer = Coalescer()
+    holder = LastValueHold(hold)
+    if metrics is None:
+        metrics = BridgeMetrics(bridge="five")
+    metrics.watch("superseded_total", "Samples replaced by a newer one (--coalesce)",
+                  lambda: coalescer.superseded)
+    metrics.watch("frames_lost_total", "Binary frames missing from the sequence",
+                  lambda: decoder.lost)
+    metrics.watch("crc_errors_total", "Binary frames rejected by CRC",
+                  lambda: decoder.crc_errors)
+    
+    try:
+        while True:
+            wake_time, chunk = read_available(ser)
+            latest = None
+            
+            if supervisor is not None and not supervisor.connected:
+                # The decoder resyncs on the next valid frame by itself
+                fill_outage(sock, supervisor, holder, wake_time, batcher, ring)
+                continue
+            
+            frames = decoder.feed(chunk)
+            metrics.read.observe(time.perf_counter() - wake_time)
+            if frames:
+                metrics.lines.inc(len(frames))
+                metrics.batch.observe(len(frames))
+            if coalesce:
+                frames = coalescer.newest_frames(frames, key=lambda frame: len(frame[2]))
+            
+            for seq, ticks_us, raw in frames:
+                if len(raw) < 5:
+                    metrics.ignored.inc()
+                    continue
+                start = time.perf_counter()
+                # Channels are percent x 100 (0-10000)
+                values = tuple(clamp01(raw[i] / (100 * PERCENT_SCALE)) for i in range(5))
+                parsed = time.perf_counter()
+                metrics.parse.observe(parsed - start)
+                if profile is not None:
+                    values = profile.apply(values)
+                normalized = time.perf_counter()
+                metrics.normalize.observe(normalized - parsed)
+                send_fingers(sock, values, batcher, ticks_us, ring)
+                sent = time.perf_counter()
+                metrics.send.observe(sent - normalized)
+                metrics.latency.observe(sent - wake_time)
+                metrics.samples.inc()
+                latency.add(sent - wake_time)
+                latest = values
+            
+            if latest is not None:
+                holder.update(latest)
+                show_fingers(latest, f"{latency.status()} | {decoder.status()}")
+            
+    except (KeyboardInterrupt, ReplayFinished):
+        print("\n\n👋 Bridge stopped")
+        print(f"   Serial→UDP latency: {latency.summary()}")
+        print(f"   Metrics: {metrics.summary()}")
+        if supervisor is not None:
+            print(f"   Serial link: {supervisor.status()}")
+        print(f"   Binary frames: {decoder.status()} | skipped {decoder.skipped} bytes")
+        if coalesce:
+            print(f"   Coalescing: {coalescer.status()}")
+        if batcher is not None:
+            batcher.close()
+            print(f"   {batcher.status()}")
+        if ring is not None:
+            print(f"   {ring.status()}")
+        if profile is not None:
+            print(f"   Calibration: {profile.describe()}")
 
 
 def run_simulation(sock):
@@ -131,8 +405,7 @@ def run_simulation(sock):
             ring = 0.5 + 0.3 * math.sin(t * 0.2 + 3)       # BRIGHTNESS
             pinky = 0.5 + 0.4 * math.sin(t * 0.9 + 4)      # MAGIC
             
-            message = f"T:{thumb:.2f},I:{index:.2f},M:{middle:.2f},R:{ring:.2f},P:{pinky:.2f}"
-            sock.sendto(message.encode(), (UNITY_HOST, UNITY_PORT))
+            send_fingers(sock, (thumb, index, middle, ring, pinky))
             
             print(f"\r👍{thumb:.0%} 👆{index:.0%} 🖕{middle:.0%} 💍{ring:.0%} 🤙{pinky:.0%}  ", end="")
             
@@ -194,8 +467,7 @@ def run_keyboard_mode(sock):
                 if not ['a', 's', 'd', 'f', 'g'][i] in keys_pressed:
                     values[i] = max(values[i] - 0.02, 0.0)
             
-            message = f"T:{values[0]:.2f},I:{values[1]:.2f},M:{values[2]:.2f},R:{values[3]:.2f},P:{values[4]:.2f}"
-            sock.sendto(message.encode(), (UNITY_HOST, UNITY_PORT))
+            send_fingers(sock, values)
             
             print(f"\r👍{values[0]:.0%} 👆{values[1]:.0%} 🖕{values[2]:.0%} 💍{values[3]:.0%} 🤙{values[4]:.0%}  ", end="")
             
@@ -208,16 +480,46 @@ def run_keyboard_mode(sock):
         sock.close()
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="5 flex sensors to Unity bridge")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--sim", action="store_true", help="Animated values, no hardware")
+    mode.add_argument("--keyboard", action="store_true", help="A/S/D/F/G keys (needs pynput)")
+    mode.add_argument("--replay", metavar="FILE", help="Play back a capture file instead of serial")
+    parser.add_argument("--binary", action="store_true", help="Pico sends binary frames")
+    parser.add_argument("--coalesce", action="store_true", help="Forward only the newest sample")
+    parser.add_argument("--record", metavar="FILE", help="Append raw serial data to a capture file")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Replay speed: 1 = real time, 0 = as fast as possible")
+    parser.add_argument("--batch", type=int, default=1, metavar="N",
+                        help="Pack up to N timestamped samples per UDP datagram")
+    parser.add_argument("--batch-ms", type=float, default=10.0, metavar="MS",
+                        help="Send a partial batch after MS milliseconds")
+    parser.add_argument("--shm", nargs="?", const=SHM_FILE, metavar="FILE",
+                        help=f"Write to a shared-memory ring instead of UDP (default {SHM_FILE})")
+    player = parser.add_mutually_exclusive_group()
+    player.add_argument("--profile", metavar="NAME", help="Apply a saved player calibration profile")
+    player.add_argument("--calibrate", metavar="NAME",
+                        help=f"Record a player profile over the first {RECORD_SECONDS:g} s, save and use it")
+    parser.add_argument("--hold", choices=("hold", "decay"), default="hold",
+                        help="While the Pico is unplugged: hold the last values or fade them out")
+    parser.add_argument("--metrics", nargs="?", type=int, const=METRICS_PORT, metavar="PORT",
+                        help=f"Serve Prometheus metrics on http://127.0.0.1:PORT/metrics (default {METRICS_PORT})")
+    parser.add_argument("--stats-datagram", nargs="?", type=int, const=STATS_PORT, metavar="PORT",
+                        help=f"Send a JSON stats datagram every second (default port {STATS_PORT})")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--sim":
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            run_simulation(sock)
-        elif sys.argv[1] == "--keyboard":
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            run_keyboard_mode(sock)
-        else:
-            print(f"Unknown argument: {sys.argv[1]}")
-            print("Usage: python five_sensor_bridge.py [--sim|--keyboard]")
+    args = parse_args()
+    if args.sim:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        run_simulation(sock)
+    elif args.keyboard:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        run_keyboard_mode(sock)
     else:
-        main()
+        main(binary=args.binary, coalesce=args.coalesce, record=args.record,
+             replay=args.replay, speed=args.speed, batch=args.batch, batch_ms=args.batch_ms,
+             shm=args.shm, profile=args.profile, calibrate=args.calibrate, hold=args.hold,
+             metrics_port=args.metrics, stats_port=args.stats_datagram)
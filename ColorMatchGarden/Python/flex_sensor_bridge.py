@@ -3,11 +3,15 @@ Flex Sensor Bridge for Color Match Garden
 Reads flex sensor values and sends to Unity via UDP
 """
 
+import argparse
 import serial
 import socket
 import time
 import sys
 
+from auto_calibration import AutoCalibrator
+from serial_ingest import LineReader, LatencyStats
+
 # Configuration
 SERIAL_PORT = "COM3"  # Change to your port
 BAUD_RATE = 115200
@@ -18,12 +22,16 @@ UNITY_PORT = 5000
 FLAT_VALUE = 45000
 BENT_VALUE = 20000
 
+# Learn the flat/bent range while playing (FLAT/BENT become the starting point);
+# default for --auto
+AUTO_CALIBRATE = False
+
 def normalize_flex_value(raw_value):
     """Convert raw ADC value to 0-100 percentage"""
     normalized = (FLAT_VALUE - raw_value) / (FLAT_VALUE - BENT_VALUE)
     return max(0, min(100, normalized * 100))
 
-def main():
+def main(auto=AUTO_CALIBRATE):
     print("=" * 50)
     print("  Color Match Garden - Flex Sensor Bridge")
     print("=" * 50)
@@ -44,27 +52,43 @@ def main():
     print("\n[Ready] Sending flex sensor data to Unity")
     print("        Bend the sensor to change flower brightness!\n")
     
+    reader = LineReader(ser)
+    latency = LatencyStats()
+    auto = AutoCalibrator(1, FLAT_VALUE, BENT_VALUE) if auto else None
+    if auto is not None:
+        print("[Auto] Learning the sensor range - bend it fully a few times\n")
+    
     try:
         while True:
-            if ser.in_waiting:
-                line = ser.readline().decode('utf-8').strip()
+            # Blocks until the Pico sends data, then drains every complete line
+            wake_time, lines = reader.read_lines()
+            percentage = None
+            
+            for line in lines:
                 try:
                     raw_value = float(line)
-                    percentage = normalize_flex_value(raw_value)
-                    
-                    # Send to Unity
-                    sock.sendto(str(percentage).encode(), (UNITY_HOST, UNITY_PORT))
-                    
-                    # Visual feedback
-                    level = "Light" if percentage <= 30 else "Medium" if percentage <= 70 else "Bright"
-                    bar = "█" * int(percentage / 5) + "░" * (20 - int(percentage / 5))
-                    print(f"\r[{bar}] {percentage:5.1f}% ({level})  ", end="")
-                    
                 except ValueError:
-                    pass
-            time.sleep(0.05)
+                    continue
+                if auto is not None:
+                    percentage = auto.update_channel(0, raw_value) * 100
+                else:
+                    percentage = normalize_flex_value(raw_value)
+                
+                # Send to Unity
+                sock.sendto(str(percentage).encode(), (UNITY_HOST, UNITY_PORT))
+                latency.add(time.perf_counter() - wake_time)
+            
+            # Visual feedback (once per wake, not per line)
+            if percentage is not None:
+                level = "Light" if percentage <= 30 else "Medium" if percentage <= 70 else "Bright"
+                bar = "█" * int(percentage / 5) + "░" * (20 - int(percentage / 5))
+                status = latency.status() if auto is None else auto.status()
+                print(f"\r[{bar}] {percentage:5.1f}% ({level})  {status}  ", end="")
     except KeyboardInterrupt:
         print("\n\n[Stopped] Flex sensor bridge closed")
+        print(f"[Latency] Serial→UDP: {latency.summary()}")
+        if auto is not None:
+            print(f"[Auto] {auto.status()} | learned range {auto.ranges()[0]}")
     finally:
         ser.close()
         sock.close()
@@ -93,5 +117,12 @@ def run_simulation(sock):
     finally:
         sock.close()
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Flex sensor to Unity bridge")
+    parser.add_argument("--auto", action="store_true", default=AUTO_CALIBRATE,
+                        help="Learn the sensor's flat/bent range while playing")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(auto=args.auto)
@@ -1,55 +1,281 @@
 """
 Gesture Detection for Color Match Garden
 Detects open hand and closed fist gestures using MediaPipe
+(plus point, pinch and thumbs-up with --extended)
+Two-player stations: --cameras 0,1 (one process per camera)
 Sends gesture data to Unity via UDP
 """
 
+import argparse
 import cv2
 import mediapipe as mp
+import multiprocessing
+import queue
 import socket
+import threading
 import time
 
+from gesture_features import (landmarks_to_array, compute_features,
+                              classify_features, classify_basic)
+from glove_discovery import tag_message
+
 # Configuration
 UNITY_HOST = "127.0.0.1"
 UNITY_PORT = 5001
 CAMERA_INDEX = 0
 
+# Also send "point", "pinch" and "thumbs_up". GestureRecognizer.cs ignores
+# names it doesn't know, so leave this off unless Unity handles them.
+EXTENDED_GESTURES = False
+
+# Hand ROI tracking (--roi): after a hand is found, only a box around it
+# is passed to MediaPipe until tracking is lost
+ROI_MARGIN = 0.4        # Border around the last hand box, fraction of its size
+ROI_MIN_SIZE = 96       # Smallest crop side in pixels
+ROI_INPUT_SIZE = 192    # Crops are resized to this square (0 = keep crop size)
+
 # MediaPipe setup
 mp_hands = mp.solutions.hands
 mp_drawing = mp.solutions.drawing_utils
 
-def is_hand_open(hand_landmarks):
-    """Check if hand is open (all fingers extended)"""
-    # Finger tip landmarks
-    finger_tips = [8, 12, 16, 20]  # Index, Middle, Ring, Pinky
-    finger_pips = [6, 10, 14, 18]  # PIP joints
+def classify_gesture(hand_landmarks):
+    """
+    Return the gesture for one detected hand.
+    
+    "open", "fist" or "none" by default; with EXTENDED_GESTURES also
+    "point", "pinch" and "thumbs_up" (see gesture_features.py).
+    """
+    features = compute_features(landmarks_to_array(hand_landmarks))
+    if EXTENDED_GESTURES:
+        return classify_features(features)
+    return classify_basic(features)
+
+def create_hands(static_image_mode=False):
+    """Single-hand MediaPipe tracker used by every detection loop"""
+    return mp_hands.Hands(
+        static_image_mode=static_image_mode,
+        max_num_hands=1,
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.5
+    )
+
+class FramePreprocessor:
+    """
+    Mirror, colour-convert and (optionally) crop frames for MediaPipe.
+    
+    cv2.flip / cvtColor / resize write into buffers kept between frames
+    instead of allocating new images every iteration.
+    
+    With roi=True the previous frame's landmarks pick a square box around
+    the hand; only that box (resized to ROI_INPUT_SIZE) is processed. If the
+    hand is not in the box, the same frame is searched in full and tracking
+    restarts from there. Landmarks are always returned in full-frame
+    coordinates, so classification and drawing are unchanged.
     
-    fingers_extended = 0
-    for tip, pip in zip(finger_tips, finger_pips):
-        if hand_landmarks.landmark[tip].y < hand_landmarks.landmark[pip].y:
-            fingers_extended += 1
+    The box stays square at the frame edges (it is shifted inside instead
+    of clipped), so the resize never stretches the hand. Crops and full
+    frames go to different MediaPipe instances: the caller's tracker only
+    ever sees crops, and full frames are searched by a static-image
+    detector owned here, so no tracking state crosses coordinate spaces.
+    """
     
-    # Thumb check (horizontal movement)
-    thumb_tip = hand_landmarks.landmark[4]
-    thumb_ip = hand_landmarks.landmark[3]
-    if abs(thumb_tip.x - thumb_ip.x) > 0.04:
-        fingers_extended += 1
+    def __init__(self, roi=False):
+        self.roi_enabled = roi
+        self.search_hands = None    # Full-frame detector for --roi, made on first use
+        self.mirrored = None
+        self.rgb = None
+        self.roi_bgr = None
+        self.roi_rgb = None
+        self.box = None             # (x0, y0, x1, y1) in pixels, or None
+        self.roi_frames = 0
+        self.full_frames = 0
+    
+    def process(self, hands, frame):
+        """
+        Returns:
+            (mirrored BGR frame, MediaPipe results)
+        
+        The mirrored frame is a reused buffer - copy it before handing it
+        to another thread.
+        """
+        self.mirrored = cv2.flip(frame, 1, dst=self.mirrored)
+        
+        if self.box is not None:
+            results = self._process_roi(hands)
+            if results.multi_hand_landmarks:
+                self.roi_frames += 1
+                self._track(results)
+                return self.mirrored, results
+        
+        if self.roi_enabled:
+            if self.search_hands is None:
+                self.search_hands = create_hands(static_image_mode=True)
+            detector = self.search_hands
+        else:
+            detector = hands
+        self.rgb = cv2.cvtColor(self.mirrored, cv2.COLOR_BGR2RGB, dst=self.rgb)
+        results = detector.process(self.rgb)
+        self.full_frames += 1
+        self._track(results)
+        return self.mirrored, results
     
-    return fingers_extended >= 4
+    def _process_roi(self, hands):
+        x0, y0, x1, y1 = self.box
+        crop = self.mirrored[y0:y1, x0:x1]
+        if ROI_INPUT_SIZE:
+            self.roi_bgr = cv2.resize(crop, (ROI_INPUT_SIZE, ROI_INPUT_SIZE),
+                                      dst=self.roi_bgr, interpolation=cv2.INTER_AREA)
+            self.roi_rgb = cv2.cvtColor(self.roi_bgr, cv2.COLOR_BGR2RGB, dst=self.roi_rgb)
+            results = hands.process(self.roi_rgb)
+        else:
+            results = hands.process(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB))
+        
+        # Crop-relative -> full-frame normalized coordinates
+        height, width = self.mirrored.shape[:2]
+        sx = (x1 - x0) / width
+        sy = (y1 - y0) / height
+        ox = x0 / width
+        oy = y0 / height
+        for hand_landmarks in results.multi_hand_landmarks or ():
+            for point in hand_landmarks.landmark:
+                point.x = ox + point.x * sx
+                point.y = oy + point.y * sy
+                point.z *= sx
+        return results
+    
+    def _track(self, results):
+        """Update the ROI box from the first hand, or drop it if none."""
+        if not self.roi_enabled or not results.multi_hand_landmarks:
+            self.box = None
+            return
+        
+        height, width = self.mirrored.shape[:2]
+        points = results.multi_hand_landmarks[0].landmark
+        xs = [p.x for p in points]
+        ys = [p.y for p in points]
+        cx = (min(xs) + max(xs)) / 2 * width
+        cy = (min(ys) + max(ys)) / 2 * height
+        side = max((max(xs) - min(xs)) * width, (max(ys) - min(ys)) * height)
+        side = int(min(max(side * (1 + 2 * ROI_MARGIN), ROI_MIN_SIZE), width, height))
+        if side < 16:
+            self.box = None
+            return
+        
+        # Shift (don't clip) the box into the frame so it stays square
+        x0 = min(max(int(cx - side / 2), 0), width - side)
+        y0 = min(max(int(cy - side / 2), 0), height - side)
+        self.box = (x0, y0, x0 + side, y0 + side)
+    
+    def status(self):
+        total = self.roi_frames + self.full_frames
+        if not self.roi_enabled or not total:
+            return "roi off"
+        return f"roi {100.0 * self.roi_frames / total:.0f}% ({self.full_frames} full)"
+    
+    def close(self):
+        if self.search_hands is not None:
+            self.search_hands.close()
+            self.search_hands = None
+
+def run_headless(camera_index, on_gesture, stop_event, roi=False):
+    """
+    Detect gestures without any window and report each change.
+    
+    Used by bridge_service.py, which runs this in an executor thread.
+    
+    Args:
+        camera_index: OpenCV camera index
+        on_gesture: Called with the new gesture string on every change
+        stop_event: threading.Event that ends the loop when set
+        roi: Track the hand and only process a box around it
+    """
+    cap = cv2.VideoCapture(camera_index)
+    if not cap.isOpened():
+        print(f"[Error] Cannot open camera {camera_index}")
+        return
+    
+    hands = create_hands()
+    preprocessor = FramePreprocessor(roi)
+    last_gesture = "none"
+    
+    try:
+        while not stop_event.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                break
+            
+            _, results = preprocessor.process(hands, frame)
+            
+            current_gesture = "none"
+            if results.multi_hand_landmarks:
+                current_gesture = classify_gesture(results.multi_hand_landmarks[0])
+            
+            if current_gesture != last_gesture:
+                on_gesture(current_gesture)
+                last_gesture = current_gesture
+    finally:
+        hands.close()
+        preprocessor.close()
+        cap.release()
+
+# UI overlay text and colours per gesture
+GESTURE_TEXT = {
+    "open": "OPEN HAND (Confirm)",
+    "fist": "CLOSED FIST (Reset)",
+    "point": "POINTING",
+    "pinch": "PINCH",
+    "thumbs_up": "THUMBS UP",
+    "none": "Show your hand..."
+}
+
+GESTURE_COLOR = {
+    "open": (102, 255, 102),
+    "fist": (102, 178, 255),
+    "point": (255, 204, 102),
+    "pinch": (255, 102, 204),
+    "thumbs_up": (102, 255, 255),
+    "none": (200, 200, 200)
+}
 
-def is_fist(hand_landmarks):
-    """Check if hand is closed fist"""
-    finger_tips = [8, 12, 16, 20]
-    finger_pips = [6, 10, 14, 18]
+WINDOW_NAME = "Color Match Garden - Gesture Detection"
+STATS_INTERVAL = 2.0    # Seconds between pipeline timing reports
+
+def draw_hand(frame, hand_landmarks):
+    """Draw the detected hand skeleton onto the frame"""
+    mp_drawing.draw_landmarks(
+        frame, hand_landmarks, mp_hands.HAND_CONNECTIONS,
+        mp_drawing.DrawingSpec(color=(102, 204, 255), thickness=2),
+        mp_drawing.DrawingSpec(color=(255, 204, 102), thickness=2)
+    )
+
+def draw_overlay(frame, current_gesture, gesture_start):
+    """Draw the gesture box, label and hold-time bar"""
+    color = GESTURE_COLOR[current_gesture]
+    
+    # Background box
+    cv2.rectangle(frame, (10, 10), (350, 70), (40, 40, 40), -1)
+    cv2.rectangle(frame, (10, 10), (350, 70), color, 2)
     
-    fingers_closed = 0
-    for tip, pip in zip(finger_tips, finger_pips):
-        if hand_landmarks.landmark[tip].y > hand_landmarks.landmark[pip].y:
-            fingers_closed += 1
+    # Gesture text
+    cv2.putText(frame, GESTURE_TEXT[current_gesture], (20, 50),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
     
-    return fingers_closed >= 3
+    # Hold time indicator
+    if current_gesture != "none":
+        hold_time = time.time() - gesture_start
+        bar_width = min(int(hold_time * 100), 300)
+        cv2.rectangle(frame, (20, 60), (20 + bar_width, 65), color, -1)
 
-def main():
+def print_banner(headless):
+    print("\n[Gestures]")
+    print("  ✋ Open Hand  = Confirm color")
+    print("  ✊ Closed Fist = Reset color")
+    if headless:
+        print("\n[Headless] No window - press Ctrl+C to quit\n")
+    else:
+        print("\nPress 'Q' to quit\n")
+
+def main(headless=False, roi=False):
     print("=" * 50)
     print("  Color Match Garden - Gesture Detection")
     print("=" * 50)
@@ -65,17 +291,10 @@ def main():
         return
     
     print(f"[Camera] Opened camera {CAMERA_INDEX}")
-    print("\n[Gestures]")
-    print("  ✋ Open Hand  = Confirm color")
-    print("  ✊ Closed Fist = Reset color")
-    print("\nPress 'Q' to quit\n")
+    print_banner(headless)
     
-    hands = mp_hands.Hands(
-        static_image_mode=False,
-        max_num_hands=1,
-        min_detection_confidence=0.7,
-        min_tracking_confidence=0.5
-    )
+    hands = create_hands()
+    preprocessor = FramePreprocessor(roi)
     
     last_gesture = "none"
     gesture_start = 0
@@ -86,28 +305,18 @@ def main():
             if not ret:
                 break
             
-            # Mirror and convert
-            frame = cv2.flip(frame, 1)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            results = hands.process(rgb_frame)
+            # Mirror, convert and (with --roi) crop to the tracked hand
+            frame, results = preprocessor.process(hands, frame)
             
             current_gesture = "none"
             
             if results.multi_hand_landmarks:
                 for hand_landmarks in results.multi_hand_landmarks:
-                    # Draw hand
-                    mp_drawing.draw_landmarks(
-                        frame, hand_landmarks, mp_hands.HAND_CONNECTIONS,
-                        mp_drawing.DrawingSpec(color=(102, 204, 255), thickness=2),
-                        mp_drawing.DrawingSpec(color=(255, 204, 102), thickness=2)
-                    )
+                    if not headless:
+                        draw_hand(frame, hand_landmarks)
                     
                     # Detect gesture
-                    if is_hand_open(hand_landmarks):
-                        current_gesture = "open"
-                    elif is_fist(hand_landmarks):
-                        current_gesture = "fist"
+                    current_gesture = classify_gesture(hand_landmarks)
             
             # Send gesture to Unity
             if current_gesture != last_gesture:
@@ -115,34 +324,11 @@ def main():
                 last_gesture = current_gesture
                 gesture_start = time.time()
             
-            # Draw UI overlay
-            gesture_text = {
-                "open": "OPEN HAND (Confirm)",
-                "fist": "CLOSED FIST (Reset)",
-                "none": "Show your hand..."
-            }
-            
-            color = {
-                "open": (102, 255, 102),
-                "fist": (102, 178, 255),
-                "none": (200, 200, 200)
-            }
-            
-            # Background box
-            cv2.rectangle(frame, (10, 10), (350, 70), (40, 40, 40), -1)
-            cv2.rectangle(frame, (10, 10), (350, 70), color[current_gesture], 2)
+            if headless:
+                continue
             
-            # Gesture text
-            cv2.putText(frame, gesture_text[current_gesture], (20, 50),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, color[current_gesture], 2)
-            
-            # Hold time indicator
-            if current_gesture != "none":
-                hold_time = time.time() - gesture_start
-                bar_width = min(int(hold_time * 100), 300)
-                cv2.rectangle(frame, (20, 60), (20 + bar_width, 65), color[current_gesture], -1)
-            
-            cv2.imshow("Color Match Garden - Gesture Detection", frame)
+            draw_overlay(frame, current_gesture, gesture_start)
+            cv2.imshow(WINDOW_NAME, frame)
             
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 break
@@ -150,10 +336,314 @@ def main():
     except KeyboardInterrupt:
         pass
     finally:
+        hands.close()
+        preprocessor.close()
+        cap.release()
+        if not headless:
+            cv2.destroyAllWindows()
+        sock.close()
+        print("\n[Stopped] Gesture detection closed")
+
+
+# ============================================================================
+# PIPELINED MODE
+# ============================================================================
+
+class LatestSlot:
+    """
+    Single-item, latest-wins hand-off between pipeline threads.
+    
+    put() overwrites anything not yet taken (counted as dropped), so a slow
+    consumer always gets the freshest frame instead of a growing queue.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._closed = False
+        self.dropped = 0
+    
+    def put(self, item):
+        with self._cond:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self._cond.notify()
+    
+    def get(self, timeout=0.5):
+        """Wait for the next item; returns None on timeout or close."""
+        with self._cond:
+            if self._item is None and not self._closed:
+                self._cond.wait(timeout)
+            item, self._item = self._item, None
+            return item
+    
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class StageTimer:
+    """Per-stage timing: count and average milliseconds since last report."""
+    
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+    
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+    
+    def take(self, interval):
+        """Return (per-second rate, average ms) and reset."""
+        rate = self.count / interval
+        avg_ms = self.total * 1000.0 / self.count if self.count else 0.0
+        self.count = 0
+        self.total = 0.0
+        return rate, avg_ms
+
+
+def run_pipelined(headless=False, roi=False):
+    """
+    Capture, inference and render on separate threads.
+    
+    capture thread  -> [latest frame] -> inference thread -> [latest result]
+                                                         -> render (main thread)
+    
+    The gesture rate is bounded by the slowest stage instead of the sum of
+    all of them. With headless=True there is no drawing or window at all.
+    """
+    print("=" * 50)
+    print("  Color Match Garden - Gesture Detection (Pipelined)")
+    print("=" * 50)
+    
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    print(f"[UDP] Sending to {UNITY_HOST}:{UNITY_PORT}")
+    
+    cap = cv2.VideoCapture(CAMERA_INDEX)
+    if not cap.isOpened():
+        print(f"[Error] Cannot open camera {CAMERA_INDEX}")
+        return
+    
+    print(f"[Camera] Opened camera {CAMERA_INDEX}")
+    print_banner(headless)
+    
+    frames = LatestSlot()
+    rendered = LatestSlot()
+    stop_event = threading.Event()
+    timers = {name: StageTimer(name) for name in ("capture", "infer", "render")}
+    gestures = StageTimer("gesture")
+    state = {"gesture": "none", "start": 0.0}
+    preprocessor = FramePreprocessor(roi)
+    
+    def capture_loop():
+        while not stop_event.is_set():
+            start = time.perf_counter()
+            ret, frame = cap.read()
+            if not ret:
+                break
+            timers["capture"].add(time.perf_counter() - start)
+            frames.put(frame)
+        stop_event.set()
+        frames.close()
+    
+    def inference_loop():
+        hands = create_hands()
+        try:
+            while not stop_event.is_set():
+                frame = frames.get()
+                if frame is None:
+                    continue
+                start = time.perf_counter()
+                
+                frame, results = preprocessor.process(hands, frame)
+                
+                current_gesture = "none"
+                hand_landmarks = None
+                if results.multi_hand_landmarks:
+                    hand_landmarks = results.multi_hand_landmarks[0]
+                    current_gesture = classify_gesture(hand_landmarks)
+                
+                if current_gesture != state["gesture"]:
+                    sock.sendto(current_gesture.encode(), (UNITY_HOST, UNITY_PORT))
+                    state["gesture"] = current_gesture
+                    state["start"] = time.time()
+                
+                timers["infer"].add(time.perf_counter() - start)
+                gestures.add(0.0)
+                
+                if not headless:
+                    # The mirrored buffer is reused on the next frame
+                    rendered.put((frame.copy(), hand_landmarks, current_gesture))
+        finally:
+            hands.close()
+            preprocessor.close()
+            rendered.close()
+    
+    threads = [
+        threading.Thread(target=capture_loop, name="capture", daemon=True),
+        threading.Thread(target=inference_loop, name="inference", daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+    
+    last_report = time.perf_counter()
+    try:
+        # Render stage stays on the main thread (required by imshow on
+        # several platforms); headless just reports timings
+        while not stop_event.is_set():
+            if headless:
+                time.sleep(0.1)
+            else:
+                item = rendered.get()
+                if item is not None:
+                    start = time.perf_counter()
+                    frame, hand_landmarks, current_gesture = item
+                    if hand_landmarks is not None:
+                        draw_hand(frame, hand_landmarks)
+                    draw_overlay(frame, current_gesture, state["start"])
+                    cv2.imshow(WINDOW_NAME, frame)
+                    timers["render"].add(time.perf_counter() - start)
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+            
+            now = time.perf_counter()
+            if now - last_report >= STATS_INTERVAL:
+                interval = now - last_report
+                last_report = now
+                parts = []
+                for name, timer in timers.items():
+                    rate, avg_ms = timer.take(interval)
+                    if rate:
+                        parts.append(f"{name} {avg_ms:.1f}ms")
+                gesture_fps, _ = gestures.take(interval)
+                parts.append(f"gestures {gesture_fps:.1f} fps")
+                parts.append(f"dropped {frames.dropped}")
+                parts.append(preprocessor.status())
+                print("\r[Pipeline] " + " | ".join(parts) + "  ", end="")
+                
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        frames.close()
+        for thread in threads:
+            thread.join(timeout=2)
         cap.release()
-        cv2.destroyAllWindows()
+        if not headless:
+            cv2.destroyAllWindows()
         sock.close()
         print("\n[Stopped] Gesture detection closed")
 
+
+# ============================================================================
+# MULTI-PLAYER MODE
+# ============================================================================
+
+def camera_worker(player_id, camera_index, results, stop_event, roi, extended):
+    """Worker process: headless detection for one camera / player."""
+    global EXTENDED_GESTURES
+    EXTENDED_GESTURES = extended    # Not inherited by spawned processes
+    
+    def on_gesture(gesture):
+        results.put((player_id, gesture, time.time()))
+    
+    try:
+        run_headless(camera_index, on_gesture, stop_event, roi)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        results.put((player_id, None, time.time()))
+
+
+def run_players(cameras, roi=False):
+    """
+    One MediaPipe process per camera, merged into one UDP stream.
+    
+    Camera N in the list is player N+1. Each change is sent to UNITY_PORT
+    as "P<player>|<gesture>", e.g. "P2|open" (the hub's tag format, see
+    glove_discovery.tag_message); GestureRecognizer.cs picks
+    its own player's messages by its Player Id setting. Every player gets
+    its own interpreter and core, so two stations cost no more per player
+    than one.
+    """
+    print("=" * 50)
+    print(f"  Color Match Garden - Gesture Detection ({len(cameras)} players)")
+    print("=" * 50)
+    
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    print(f"[UDP] Sending to {UNITY_HOST}:{UNITY_PORT}")
+    
+    # spawn: forking a process that already loaded MediaPipe is unsafe
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    stop_event = ctx.Event()
+    workers = []
+    for player_id, camera_index in enumerate(cameras, start=1):
+        worker = ctx.Process(
+            target=camera_worker, name=f"player{player_id}",
+            args=(player_id, camera_index, results, stop_event, roi, EXTENDED_GESTURES))
+        worker.start()
+        workers.append(worker)
+        print(f"[Camera] Player {player_id} -> camera {camera_index}")
+    print_banner(headless=True)
+    
+    counts = {player_id: 0 for player_id in range(1, len(cameras) + 1)}
+    delay_total = 0.0
+    running = len(workers)
+    
+    try:
+        while running:
+            try:
+                player_id, gesture, detected_at = results.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if gesture is None:
+                print(f"\n[Player {player_id}] Camera stopped")
+                running -= 1
+                continue
+            
+            sock.sendto(tag_message(player_id, gesture).encode(), (UNITY_HOST, UNITY_PORT))
+            counts[player_id] += 1
+            delay_total += time.time() - detected_at
+            print("\r[Players] " + " | ".join(
+                f"P{p} {c} changes" for p, c in counts.items()) + "  ", end="")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        for worker in workers:
+            worker.join(timeout=3)
+            if worker.is_alive():
+                worker.terminate()
+        sock.close()
+        sent = sum(counts.values())
+        if sent:
+            print(f"\n[Players] {sent} gestures, merge delay "
+                  f"{delay_total * 1000.0 / sent:.2f}ms avg")
+        print("\n[Stopped] Gesture detection closed")
+
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Color Match Garden gesture detection")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Run capture, inference and render on separate threads")
+    parser.add_argument("--headless", action="store_true",
+                        help="No drawing or window (booth PCs without a display)")
+    parser.add_argument("--extended", action="store_true",
+                        help="Also detect point, pinch and thumbs_up")
+    parser.add_argument("--roi", action="store_true",
+                        help="Only run MediaPipe on a box around the tracked hand")
+    parser.add_argument("--cameras", metavar="0,1",
+                        help="One player per camera, each in its own process (headless)")
+    args = parser.parse_args()
+    EXTENDED_GESTURES = args.extended
+    
+    if args.cameras:
+        run_players([int(c) for c in args.cameras.split(",")], roi=args.roi)
+    elif args.pipeline:
+        run_pipelined(headless=args.headless, roi=args.roi)
+    else:
+        main(headless=args.headless, roi=args.roi)
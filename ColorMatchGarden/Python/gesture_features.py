@@ -0,0 +1,126 @@
+"""
+Hand Landmark Features for Color Match Garden
+=============================================
+Turns MediaPipe hand landmarks into a (21, 3) NumPy array once per frame
+and derives every gesture feature from it with array maths (no per-landmark
+Python loops). All gestures are then classified from the same features in
+one pass, so adding a gesture is a few comparisons, not another loop.
+
+Gestures:
+    open       - all fingers extended (confirm)
+    fist       - fingers curled (reset)
+    point      - only the index finger extended
+    pinch      - thumb and index tips touching, other fingers out ("OK")
+    thumbs_up  - fist with the thumb pointing up
+    none       - anything else
+
+Landmark indices follow MediaPipe: 0 = wrist, then 4 per finger from
+thumb (1-4) to pinky (17-20), base to tip. Coordinates are normalized
+image coordinates, y grows downwards.
+"""
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+WRIST = 0
+THUMB, INDEX, MIDDLE, RING, PINKY = range(5)
+
+FINGER_TIPS = np.array([4, 8, 12, 16, 20])
+FINGER_PIPS = np.array([3, 6, 10, 14, 18])   # Thumb uses its IP joint
+FINGER_MCPS = np.array([2, 5, 9, 13, 17])
+
+# ============ THRESHOLDS ============
+THUMB_SPREAD = 0.04       # Thumb tip/IP x distance that counts as extended
+EXTENSION_RATIO = 1.15    # Tip/PIP distance from the wrist for "straight"
+CURL_RATIO = 0.95         # ... and below this the finger is curled
+PINCH_RATIO = 0.35        # Thumb-index tip gap, in hand sizes
+THUMB_UP_HEIGHT = 0.5     # Thumb tip above every other joint, in hand sizes
+# ====================================
+
+
+def landmarks_to_array(hand_landmarks):
+    """MediaPipe NormalizedLandmarkList -> (21, 3) float32 array of x, y, z"""
+    return np.fromiter(
+        (c for p in hand_landmarks.landmark for c in (p.x, p.y, p.z)),
+        dtype=np.float32, count=NUM_LANDMARKS * 3).reshape(NUM_LANDMARKS, 3)
+
+
+def compute_features(points):
+    """
+    Compute gesture features from a (21, 3) landmark array.
+
+    Returns:
+        dict of NumPy values:
+            tip_above_pip  (5,) bool  - tip higher in the image than its PIP
+            extension      (5,) float - tip/PIP distance from the wrist
+                                        (thumb: from the index MCP)
+            thumb_spread   float      - |thumb tip x - thumb IP x|
+            hand_size      float      - wrist to middle MCP distance
+            pinch          float      - thumb-index tip gap / hand_size
+            palm_normal    (3,) float - unit normal of the palm plane
+            thumb_height   float      - thumb tip height above the highest
+                                        other landmark / hand_size
+    """
+    wrist = points[WRIST]
+    tips = points[FINGER_TIPS]
+    pips = points[FINGER_PIPS]
+
+    # Distances from the wrist for fingers, from the index MCP for the thumb
+    anchors = np.repeat(wrist[None, :], 5, axis=0)
+    anchors[THUMB] = points[FINGER_MCPS[INDEX]]
+    tip_dist = np.linalg.norm(tips[:, :2] - anchors[:, :2], axis=1)
+    pip_dist = np.linalg.norm(pips[:, :2] - anchors[:, :2], axis=1)
+
+    hand_size = float(np.linalg.norm(points[FINGER_MCPS[MIDDLE], :2] - wrist[:2])) or 1e-6
+
+    palm_normal = np.cross(points[FINGER_MCPS[INDEX]] - wrist,
+                           points[FINGER_MCPS[PINKY]] - wrist)
+    palm_normal /= np.linalg.norm(palm_normal) or 1.0
+
+    others_top = points[5:, 1].min()
+
+    return {
+        "tip_above_pip": tips[:, 1] < pips[:, 1],
+        "extension": tip_dist / np.maximum(pip_dist, 1e-6),
+        "thumb_spread": float(abs(tips[THUMB, 0] - pips[THUMB, 0])),
+        "hand_size": hand_size,
+        "pinch": float(np.linalg.norm(tips[THUMB, :2] - tips[INDEX, :2])) / hand_size,
+        "palm_normal": palm_normal,
+        "thumb_height": float(others_top - tips[THUMB, 1]) / hand_size,
+    }
+
+
+def classify_features(features):
+    """Pick one gesture from compute_features() output."""
+    above = features["tip_above_pip"]
+    extension = features["extension"]
+    extended = extension > EXTENSION_RATIO
+    curled = extension < CURL_RATIO
+
+    # Same rules the original open/fist checks used, as vector counts
+    fingers_up = int(above[1:].sum())
+    fingers_down = 4 - fingers_up
+    thumb_out = features["thumb_spread"] > THUMB_SPREAD
+
+    if features["pinch"] < PINCH_RATIO and extended[MIDDLE:].sum() >= 2:
+        return "pinch"
+    if fingers_up + thumb_out >= 4:
+        return "open"
+    if curled[INDEX:].all() and features["thumb_height"] > THUMB_UP_HEIGHT:
+        return "thumbs_up"
+    if extended[INDEX] and above[INDEX] and curled[MIDDLE:].all():
+        return "point"
+    if fingers_down >= 3:
+        return "fist"
+    return "none"
+
+
+def classify_basic(features):
+    """Only "open", "fist" or "none" - what GestureRecognizer.cs understands."""
+    fingers_up = int(features["tip_above_pip"][1:].sum())
+    if fingers_up + (features["thumb_spread"] > THUMB_SPREAD) >= 4:
+        return "open"
+    if 4 - fingers_up >= 3:
+        return "fist"
+    return "none"
@@ -0,0 +1,135 @@
+"""
+Glove Discovery for the Multi-Glove Hub
+=======================================
+Used by bridge_service.py --hub
+
+Finds every plugged-in Pico with serial.tools.list_ports and identifies it
+by its USB serial number (unique per board, unlike COM5 / ttyACM0, which
+change with the USB socket and plug-in order). Each serial number gets a
+fixed player number, stored in gloves.json, so "player 2" is the same
+physical glove on every run:
+
+    {"E66164084319392A": 1, "E6616408431A2B2C": 2}
+
+New gloves are given the next free number. Edit the file to swap players.
+
+LIST THE GLOVES:
+  python glove_discovery.py
+
+Run this on your COMPUTER (not Pico)
+"""
+
+import argparse
+import json
+import os
+
+from serial.tools import list_ports
+
+# ============ CONFIGURATION ============
+GLOVES_FILE = "gloves.json"
+PICO_VID = 0x2E8A         # Raspberry Pi (Pico with MicroPython)
+PLAYER_PORT_STRIDE = 100  # --route ports: player N -> base + (N-1) * stride
+# =======================================
+
+
+class Glove:
+    """One discovered Pico."""
+
+    def __init__(self, serial_number, device, player, description=""):
+        self.serial_number = serial_number
+        self.device = device
+        self.player = player
+        self.description = description
+
+    @property
+    def name(self):
+        return f"P{self.player}"
+
+    def udp_port(self, base_port):
+        """Own Unity port for --route ports"""
+        return base_port + (self.player - 1) * PLAYER_PORT_STRIDE
+
+
+def find_picos(vid=PICO_VID):
+    """
+    Plugged-in Picos, sorted by serial number.
+
+    Returns:
+        list of (serial_number, device, description)
+    """
+    found = []
+    for port in list_ports.comports():
+        if port.vid != vid or not port.serial_number:
+            continue
+        found.append((port.serial_number, port.device, port.description or ""))
+    found.sort()
+    return found
+
+
+def find_device(serial_number, vid=PICO_VID):
+    """Current port of the Pico with this USB serial number, or None"""
+    for serial, device, _ in find_picos(vid):
+        if serial == serial_number:
+            return device
+    return None
+
+
+class GloveRegistry:
+    """USB serial number -> player number, kept in gloves.json."""
+
+    def __init__(self, path=GLOVES_FILE):
+        self.path = path
+        self.players = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.players = {serial: int(player) for serial, player in json.load(f).items()}
+        self.changed = False
+
+    def player_for(self, serial_number):
+        """Stored player number, or the next free one for a new glove."""
+        player = self.players.get(serial_number)
+        if player is None:
+            used = set(self.players.values())
+            player = 1
+            while player in used:
+                player += 1
+            self.players[serial_number] = player
+            self.changed = True
+        return player
+
+    def save(self):
+        if not self.changed:
+            return
+        with open(self.path, "w") as f:
+            json.dump(self.players, f, indent=2, sort_keys=True)
+        self.changed = False
+
+    def discover(self, vid=PICO_VID):
+        """All plugged-in gloves with their player numbers (new ones are saved)."""
+        gloves = [Glove(serial, device, self.player_for(serial), description)
+                  for serial, device, description in find_picos(vid)]
+        self.save()
+        gloves.sort(key=lambda glove: glove.player)
+        return gloves
+
+
+def tag_message(player, message):
+    """Shared-port routing: "P2|T:0.50,..." (Unity's playerId picks its glove)"""
+    return f"P{player}|{message}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List the Pico gloves and their player numbers")
+    parser.add_argument("--file", default=GLOVES_FILE, help="Glove registry file")
+    args = parser.parse_args()
+
+    gloves = GloveRegistry(args.file).discover()
+    if not gloves:
+        print("❌ No Pico found - is it plugged in and running MicroPython?")
+        return
+    for glove in gloves:
+        print(f"  {glove.name}  {glove.device:<14} {glove.serial_number}  {glove.description}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Unity Message Encoder for Color Match Garden
+============================================
+Builds the "T:0.50,I:0.30,M:0.80,R:0.20,P:0.10" / "R:0.50,G:0.30,B:0.80"
+messages without creating a new str and bytes object per sample.
+
+Values are always sent with two decimals, so each channel has only 101
+possible fragments ("T:0.00" ... "T:1.00"). They are prepared once in a
+lookup table indexed by int(value * BUCKETS) - exact, because BUCKETS is
+a power of two - and copied into one reused bytearray. The few buckets
+that straddle a rounding boundary (e.g. 0.125 -> "0.12") and any value
+outside 0.0-1.0 fall back to the original f-string, so the output is
+byte-identical to the old path and the C# receivers need no change.
+
+The returned bytearray is reused: send it before the next encode().
+
+BENCHMARK:
+  python message_encoder.py
+"""
+
+import math
+
+BUCKETS = 1 << 14
+
+
+def build_table(prefix):
+    """
+    Fragment for every bucket int(value * BUCKETS), value in 0.0-1.0.
+
+    Buckets whose values don't all format to the same two decimals are
+    None, which sends encode() down the exact slow path.
+    """
+    fragments = {}
+    table = []
+    for j in range(BUCKETS):
+        low = format(j / BUCKETS, ".2f")
+        high = format(math.nextafter((j + 1) / BUCKETS, 0.0), ".2f")
+        if low != high:
+            table.append(None)
+            continue
+        if low not in fragments:
+            fragments[low] = (prefix + low).encode()
+        table.append(fragments[low])
+    table.append((prefix + "1.00").encode())
+    return table
+
+
+class _FixedEncoder:
+    """Shared set-up for the channel-count specific encoders."""
+
+    def __init__(self, labels):
+        self.template = ",".join(label + ":{:.2f}" for label in labels)
+        self.tables = [build_table(("," if i else "") + label + ":")
+                       for i, label in enumerate(labels)]
+
+        self.slices = []
+        position = 0
+        for table in self.tables:
+            width = len(table[-1])
+            self.slices.append(slice(position, position + width))
+            position += width
+        self.buffer = bytearray(position)
+        self.view = memoryview(self.buffer)
+        self.fallbacks = 0
+
+    def encode_slow(self, values):
+        """The original f-string path (exact for every float)"""
+        self.fallbacks += 1
+        return self.template.format(*values).encode()
+
+
+class FiveChannelEncoder(_FixedEncoder):
+    """T:..,I:..,M:..,R:..,P:.. (five_sensor_bridge.format_fingers)"""
+
+    def __init__(self, labels=("T", "I", "M", "R", "P")):
+        super().__init__(labels)
+        # Closure over locals: no attribute lookups per call
+        t0, t1, t2, t3, t4 = self.tables
+        s0, s1, s2, s3, s4 = self.slices
+        view = self.view
+        buffer = self.buffer
+        encode_slow = self.encode_slow
+
+        def encode(values):
+            """values (5 floats, 0.0-1.0) -> reused bytearray message"""
+            a, b, c, d, e = values
+            if not (0.0 <= a <= 1.0 and 0.0 <= b <= 1.0 and 0.0 <= c <= 1.0
+                    and 0.0 <= d <= 1.0 and 0.0 <= e <= 1.0):
+                return encode_slow(values)
+            try:
+                view[s0] = t0[int(a * BUCKETS)]
+                view[s1] = t1[int(b * BUCKETS)]
+                view[s2] = t2[int(c * BUCKETS)]
+                view[s3] = t3[int(d * BUCKETS)]
+                view[s4] = t4[int(e * BUCKETS)]
+            except TypeError:
+                # Rounding-boundary bucket (None fragment)
+                return encode_slow(values)
+            return buffer
+
+        self.encode = encode
+
+
+class ThreeChannelEncoder(_FixedEncoder):
+    """R:..,G:..,B:.. (three_sensor_bridge.format_rgb)"""
+
+    def __init__(self, labels=("R", "G", "B")):
+        super().__init__(labels)
+        t0, t1, t2 = self.tables
+        s0, s1, s2 = self.slices
+        view = self.view
+        buffer = self.buffer
+        encode_slow = self.encode_slow
+
+        def encode(values):
+            """values (3 floats, 0.0-1.0) -> reused bytearray message"""
+            a, b, c = values
+            if not (0.0 <= a <= 1.0 and 0.0 <= b <= 1.0 and 0.0 <= c <= 1.0):
+                return encode_slow(values)
+            try:
+                view[s0] = t0[int(a * BUCKETS)]
+                view[s1] = t1[int(b * BUCKETS)]
+                view[s2] = t2[int(c * BUCKETS)]
+            except TypeError:
+                return encode_slow(values)
+            return buffer
+
+        self.encode = encode
+
+
+def run_benchmark(samples=200000):
+    import random
+    import timeit
+    import tracemalloc
+
+    random.seed(1)
+    five = FiveChannelEncoder()
+    three = ThreeChannelEncoder()
+
+    def fingers_fstring(values):
+        thumb, index, middle, ring, pinky = values
+        return f"T:{thumb:.2f},I:{index:.2f},M:{middle:.2f},R:{ring:.2f},P:{pinky:.2f}".encode()
+
+    def rgb_fstring(values):
+        r, g, b = values
+        return f"R:{r:.2f},G:{g:.2f},B:{b:.2f}".encode()
+
+    # Byte-identity: random values, exact 2-decimal ties, CSV percentages
+    # parsed the way the bridges do, and the range edges
+    checks = [tuple(random.random() for _ in range(5)) for _ in range(samples)]
+    checks += [tuple((k + 0.5) / 100 for _ in range(5)) for k in range(100)]
+    checks += [tuple(float(f"{p / 10:.1f}") / 100 for _ in range(5)) for p in range(1001)]
+    checks += [(0.0,) * 5, (1.0,) * 5, (0.0, 1.0, 0.005, 0.995, 0.5)]
+    for values in checks:
+        assert bytes(five.encode(values)) == fingers_fstring(values), values
+        assert bytes(three.encode(values[:3])) == rgb_fstring(values[:3]), values
+    print(f"Byte-identical on {len(checks)} samples "
+          f"({five.fallbacks} five / {three.fallbacks} three took the exact slow path)")
+
+    values5 = checks[0]
+    values3 = values5[:3]
+    number = 100000
+    rows = [
+        ("5ch f-string + encode", lambda: fingers_fstring(values5)),
+        ("5ch FiveChannelEncoder", lambda: five.encode(values5)),
+        ("3ch f-string + encode", lambda: rgb_fstring(values3)),
+        ("3ch ThreeChannelEncoder", lambda: three.encode(values3)),
+    ]
+    for name, fn in rows:
+        best = min(timeit.repeat(fn, number=number, repeat=7)) / number
+        tracemalloc.start()
+        for _ in range(1000):
+            fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {name:<24} {best * 1e9:7.0f} ns/message  (peak {peak} B over 1000 calls)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
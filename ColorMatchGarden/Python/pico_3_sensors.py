@@ -50,6 +50,23 @@ NOTE: Do not use high pass filters.
 
 from machine import ADC, Pin
 import time
+import sys
+
+# Set True to send binary frames instead of text
+# (copy binary_protocol.py to the Pico, run three_sensor_bridge.py --binary)
+BINARY_OUTPUT = False
+
+# 0 = print-paced loop (20 Hz), e.g. 500 = exact timer-driven rate in Hz
+# (copy pico_sampler.py to the Pico)
+SAMPLE_RATE_HZ = 0
+
+# Change-only output (copy pico_change_gate.py to the Pico): send only when
+# a sensor moved by CHANGE_THRESHOLD raw ADC steps, plus a heartbeat every
+# HEARTBEAT_MS. Text lines then end in ",S:<seq>" so the computer can tell
+# "nothing changed" from "lost".
+CHANGE_ONLY = False
+CHANGE_THRESHOLD = 400    # ~0.6% of the ADC range
+HEARTBEAT_MS = 1000
 
 # Setup ADC pins (GP26, GP27, GP28)
 sensor_red = ADC(26)    # Red - Sensor 1
@@ -66,15 +83,58 @@ print("=" * 40)
 
 led_state = False
 
+raw_values = [0, 0, 0]
+
+if BINARY_OUTPUT:
+    from binary_protocol import FrameEncoder
+    encoder = FrameEncoder(3)
+    out = sys.stdout.buffer
+
+gate = None
+if CHANGE_ONLY:
+    from pico_change_gate import ChangeGate
+    gate = ChangeGate(3, CHANGE_THRESHOLD, HEARTBEAT_MS)
+
+def emit(ticks, values):
+    """Send one frame (binary or text), unless the change gate holds it back"""
+    if gate is not None and not gate.check(values):
+        return
+    if BINARY_OUTPUT:
+        # Raw ADC values packed in a 15-byte frame
+        out.write(encoder.encode(ticks, values))
+    elif gate is not None:
+        print(f"R:{values[0]},G:{values[1]},B:{values[2]},S:{gate.next_seq()}")
+    else:
+        # Send as comma-separated values
+        # Format: "R:12345,G:23456,B:34567"
+        print(f"R:{values[0]},G:{values[1]},B:{values[2]}")
+
+def run_timer_loop():
+    """Emit every frame captured by the fixed-rate timer sampler"""
+    from pico_sampler import FixedRateSampler
+    
+    sampler = FixedRateSampler([sensor_red, sensor_green, sensor_blue], rate_hz=SAMPLE_RATE_HZ)
+    frame = sampler.new_frame()
+    sampler.start()
+    
+    while True:
+        ticks = sampler.read(frame)
+        if ticks is None:
+            time.sleep_ms(1)
+            continue
+        
+        emit(ticks, frame)
+
+if SAMPLE_RATE_HZ:
+    run_timer_loop()
+
 while True:
     # Read all 3 sensors (0-65535)
-    r = sensor_red.read_u16()
-    g = sensor_green.read_u16()
-    b = sensor_blue.read_u16()
+    raw_values[0] = sensor_red.read_u16()
+    raw_values[1] = sensor_green.read_u16()
+    raw_values[2] = sensor_blue.read_u16()
     
-    # Send as comma-separated values
-    # Format: "R:12345,G:23456,B:34567"
-    print(f"R:{r},G:{g},B:{b}")
+    emit(time.ticks_us(), raw_values)
     
     # Blink LED to show it's working
     led_state = not led_state
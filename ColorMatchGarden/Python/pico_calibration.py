@@ -0,0 +1,100 @@
+# pico_calibration.py - MicroPython for Raspberry Pi Pico
+# Copy this to your Pico next to main.py
+"""
+Persistent Calibration on the Pico
+==================================
+Shared by flex_sensors.py, five_flex_sensors_mux.py and PicoFlexReader.py
+
+The flat/bent values live in a small JSON file on the Pico's flash
+instead of in the source code. The readers load it at boot and start
+streaming straight away; a new calibration is written over it and used
+immediately, so there is nothing to copy back and nothing to re-flash.
+
+File format (calibration.json):
+  {"profile": "alice", "channels": {"flex1": {"flat": 30000, "bent": 50000}, ...}}
+
+Recalibrate while a reader is running: type "c" + Enter in the serial
+console (Thonny shell). The bridges never write to the Pico, so this
+does not interfere with streaming.
+"""
+
+import json
+import os
+import sys
+import time
+
+CALIBRATION_FILE = "calibration.json"
+
+
+def load_calibration(defaults, path=CALIBRATION_FILE):
+    """
+    Calibration from flash, with `defaults` for anything not stored.
+
+    Keys may be names ("flex1") or channel numbers (0); JSON stores them
+    as strings either way. Only "flat" and "bent" are taken from the file.
+
+    Returns:
+        (calibration, profile) - profile is None if nothing was stored
+    """
+    calibration = {}
+    for key, value in defaults.items():
+        calibration[key] = dict(value)
+
+    try:
+        with open(path) as f:
+            stored = json.load(f)
+        channels = stored["channels"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return calibration, None
+
+    for key, cal in calibration.items():
+        saved = channels.get(str(key))
+        if saved:
+            cal["flat"] = saved.get("flat", cal["flat"])
+            cal["bent"] = saved.get("bent", cal["bent"])
+    return calibration, stored.get("profile", "saved")
+
+
+def save_calibration(calibration, profile="default", path=CALIBRATION_FILE):
+    """Write the calibration to flash (temp file + rename, so a power cut never leaves half a file)."""
+    channels = {}
+    for key, cal in calibration.items():
+        channels[str(key)] = {"flat": cal["flat"], "bent": cal["bent"]}
+
+    temp = path + ".tmp"
+    with open(temp, "w") as f:
+        json.dump({"profile": profile, "channels": channels}, f)
+    try:
+        os.rename(temp, path)
+    except OSError:
+        # FAT cannot rename over an existing file
+        os.remove(path)
+        os.rename(temp, path)
+
+
+def capture_average(read_values, samples=50, delay_ms=20):
+    """Average `samples` calls of read_values() (a list per call) per channel."""
+    totals = None
+    for _ in range(samples):
+        values = read_values()
+        if totals is None:
+            totals = [0] * len(values)
+        for i in range(len(values)):
+            totals[i] += values[i]
+        time.sleep_ms(delay_ms)
+    return [total / samples for total in totals]
+
+
+class ConsoleCommands:
+    """Non-blocking check for a command typed in the serial console."""
+
+    def __init__(self):
+        import select
+        self.poller = select.poll()
+        self.poller.register(sys.stdin, select.POLLIN)
+
+    def poll(self):
+        """The typed line (lower case), or None if nothing is waiting."""
+        if not self.poller.poll(0):
+            return None
+        return sys.stdin.readline().strip().lower()
@@ -0,0 +1,93 @@
+# pico_change_gate.py - MicroPython for Raspberry Pi Pico
+# Copy this to your Pico next to main.py
+"""
+Change-Only Emission with Heartbeat
+===================================
+Shared by PicoFlexReader.py and pico_3_sensors.py
+
+Instead of printing every reading, a frame is sent only when at least
+one channel moved by `threshold` since the last frame that was sent.
+While the hand rests, one heartbeat frame (the unchanged values) goes
+out every `heartbeat_ms` so the computer knows the Pico is alive.
+
+Every sent frame carries a sequence number that counts SENT frames
+only (0-65535, then wraps):
+- Text lines end in ",S:<seq>" - the bridges' parsers ignore the extra
+  field, serial_ingest.SequenceTracker reads it
+- Binary frames already have one (binary_protocol.FrameEncoder)
+A gap in the sequence means frames were lost; silence with on-time
+heartbeats just means nothing changed.
+
+Usage:
+    gate = ChangeGate(3, threshold=400, heartbeat_ms=1000)
+    if gate.check(values):
+        print("R:{},G:{},B:{},S:{}".format(r, g, b, gate.next_seq()))
+"""
+
+from array import array
+import time
+
+SEQ_MASK = 0xFFFF
+
+
+class ChangeGate:
+    """Passes changed frames plus a periodic heartbeat."""
+
+    def __init__(self, channels, threshold, heartbeat_ms=1000):
+        """
+        Args:
+            channels: Values per frame
+            threshold: Change (in the values' own units) that triggers a send
+            heartbeat_ms: Longest silence before the frame is re-sent anyway
+        """
+        self.channels = channels
+        self.threshold = threshold
+        self.heartbeat_ms = heartbeat_ms
+        self.last = array('i', [0] * channels)
+        self.last_sent_ms = time.ticks_ms()
+        self.first = True
+        self.seq = 0
+
+        # Statistics
+        self.sent = 0
+        self.heartbeats = 0
+        self.suppressed = 0
+
+    def check(self, values):
+        """True if this frame should be sent (then it becomes the reference)."""
+        now = time.ticks_ms()
+        last = self.last
+        changed = self.first
+        if not changed:
+            threshold = self.threshold
+            for i in range(self.channels):
+                diff = values[i] - last[i]
+                if diff >= threshold or -diff >= threshold:
+                    changed = True
+                    break
+
+        if not changed:
+            if time.ticks_diff(now, self.last_sent_ms) < self.heartbeat_ms:
+                self.suppressed += 1
+                return False
+            self.heartbeats += 1
+
+        for i in range(self.channels):
+            last[i] = values[i]
+        self.last_sent_ms = now
+        self.first = False
+        self.sent += 1
+        return True
+
+    def next_seq(self):
+        """Sequence number for the text line being sent."""
+        seq = self.seq
+        self.seq = (seq + 1) & SEQ_MASK
+        return seq
+
+    def report(self):
+        """One-line stats text."""
+        total = self.sent + self.suppressed
+        share = self.sent * 100 // total if total else 0
+        return "sent {} of {} frames ({}%), {} heartbeats".format(
+            self.sent, total, share, self.heartbeats)
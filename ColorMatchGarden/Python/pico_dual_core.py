@@ -0,0 +1,160 @@
+# pico_dual_core.py - MicroPython for Raspberry Pi Pico
+# Copy this to your Pico next to main.py
+"""
+Dual-Core Sampler for the Pico
+==============================
+Runs the ADC (or mux scan) loop on the RP2040's second core with
+_thread, so core 0 is free for filtering, formatting and the USB serial
+link. A slow or blocked USB write on core 0 no longer changes when
+samples are taken.
+
+Frames are handed over through a double buffer guarded by a lock:
+core 1 fills the back buffer without holding the lock, then takes it
+only to swap buffers; core 0 takes it only to copy the front buffer
+out. Neither side ever waits for more than a few array copies. Core 0
+always gets the newest frame; frames it never picked up are counted as
+skipped (that is the point - the sampler does not wait for the host).
+
+The core 1 loop never allocates (MicroPython's GC is not safe to run
+from both cores at once), so the read function must not allocate
+either: fill a preallocated array and return it.
+
+Usage:
+    from machine import ADC
+    from array import array
+    from pico_dual_core import CoreSampler
+
+    adcs = [ADC(26), ADC(27), ADC(28)]
+    raw = array('H', [0, 0, 0])
+    def read_adcs():
+        for i in range(3):
+            raw[i] = adcs[i].read_u16()
+        return raw
+
+    sampler = CoreSampler(read_adcs, 3, rate_hz=1000)
+    frame = sampler.new_frame()
+    sampler.start()
+    while True:
+        if sampler.read(frame) is not None:
+            ... use frame[0], frame[1], frame[2] ...
+"""
+
+from array import array
+import _thread
+import time
+
+COUNT_MASK = 0x3FFFFFFF     # Frame counter wraps while still a small int
+
+
+class CoreSampler:
+    """Samples on core 1 and publishes the newest frame to core 0."""
+
+    def __init__(self, read, channels, rate_hz=0):
+        """
+        Args:
+            read: Function returning one frame (sequence of ints); runs on core 1
+            channels: Values per frame
+            rate_hz: Fixed sample rate, 0 = as fast as read() allows
+        """
+        self.read_frame = read
+        self.channels = channels
+        self.rate_hz = rate_hz
+        self.period_us = 1000000 // rate_hz if rate_hz else 0
+
+        self.buffers = (array('H', [0] * channels), array('H', [0] * channels))
+        self.front = 0          # Buffer core 0 copies from
+        self.ticks = 0          # ticks_us of the front frame
+        self.published = 0      # Frames swapped to the front
+        self.taken = 0          # published count at the last read()
+        self.lock = _thread.allocate_lock()
+
+        self.running = False
+        self.stopped = True
+        self.skipped = 0
+        self.late = 0           # Periods where read() overran the deadline
+        self.max_loop_us = 0
+
+    def new_frame(self):
+        """Allocate a frame array for read() (do this once, outside loops)."""
+        return array('H', [0] * self.channels)
+
+    def start(self):
+        """Start the sampling loop on core 1."""
+        self.running = True
+        self.stopped = False
+        _thread.start_new_thread(self._run, ())
+
+    def stop(self):
+        """Stop the core 1 loop and wait until it has finished."""
+        self.running = False
+        while not self.stopped:
+            time.sleep_ms(1)
+
+    def _run(self):
+        try:
+            self._loop()
+        finally:
+            # Also after an exception, so stop() never waits forever
+            self.stopped = True
+
+    def _loop(self):
+        buffers = self.buffers
+        channels = self.channels
+        lock = self.lock
+        period = self.period_us
+        deadline = time.ticks_us()
+
+        while self.running:
+            start = time.ticks_us()
+            values = self.read_frame()
+            back = buffers[1 - self.front]
+            for i in range(channels):
+                back[i] = values[i]
+
+            # Swap: the only moment core 1 holds the lock
+            lock.acquire()
+            self.front = 1 - self.front
+            self.ticks = start
+            self.published = (self.published + 1) & COUNT_MASK
+            lock.release()
+
+            elapsed = time.ticks_diff(time.ticks_us(), start)
+            if elapsed > self.max_loop_us:
+                self.max_loop_us = elapsed
+
+            if period:
+                deadline = time.ticks_add(deadline, period)
+                wait = time.ticks_diff(deadline, time.ticks_us())
+                if wait > 0:
+                    time.sleep_us(wait)
+                else:
+                    self.late += 1
+                    deadline = time.ticks_us()
+
+    def read(self, frame):
+        """
+        Copy the newest frame into frame (from new_frame()).
+
+        Returns:
+            The frame's ticks_us timestamp, or None if nothing new arrived
+        """
+        lock = self.lock
+        lock.acquire()
+        published = self.published
+        if published == self.taken:
+            lock.release()
+            return None
+        front = self.buffers[self.front]
+        for i in range(self.channels):
+            frame[i] = front[i]
+        ticks = self.ticks
+        lock.release()
+
+        self.skipped += ((published - self.taken) & COUNT_MASK) - 1
+        self.taken = published
+        return ticks
+
+    def report(self):
+        """One-line stats text."""
+        return "core1 {} frames | skipped {} | late {} | max loop {}us".format(
+            self.published, self.skipped, self.late, self.max_loop_us)
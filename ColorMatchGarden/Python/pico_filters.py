@@ -0,0 +1,235 @@
+# pico_filters.py - MicroPython for Raspberry Pi Pico
+# Copy this to your Pico next to main.py
+"""
+Constant-Time Filters for Flex Sensor Readings
+==============================================
+Shared by flex_sensors.py, PicoFlexReader.py and fast_flex_test.py
+
+Every filter keeps its state in preallocated array('H') buffers and
+integers, so update() costs the same on every sample and never allocates
+(no list pop/append, no sum() over the history). That makes heavy
+oversampling affordable on the Pico.
+
+All values are raw ADC readings (0-65535). Integer maths is kept below
+2**30 so MicroPython never switches to heap-allocated big ints.
+
+Filters:
+    MovingAverage(size)                     - running-total boxcar average
+    EMA(alpha_q10)                          - exponential moving average
+    MedianOfN(size)                         - median of the last N (N odd, small)
+    SnapFilter(size, threshold)             - smooth one way, snap the other
+    OneEuroFilter(rate_hz, min_cutoff_mhz, beta) - speed-adaptive low-pass
+"""
+
+from array import array
+
+ALPHA_BITS = 10                 # Filter coefficients are fractions of 1024
+ALPHA_ONE = 1 << ALPHA_BITS
+
+
+class MovingAverage:
+    """Boxcar average over the last `size` samples."""
+
+    def __init__(self, size, initial=0):
+        self.size = size
+        self.buffer = array('H', [initial] * size)
+        self.index = 0
+        self.total = initial * size
+
+    def update(self, value):
+        """Add a sample and return the new average."""
+        i = self.index
+        self.total += value - self.buffer[i]
+        self.buffer[i] = value
+        i += 1
+        self.index = 0 if i == self.size else i
+        return self.total // self.size
+
+    def value(self):
+        """Current average without adding a sample."""
+        return self.total // self.size
+
+    def fill(self, value):
+        """Reset the whole history to one value."""
+        buffer = self.buffer
+        for i in range(self.size):
+            buffer[i] = value
+        self.total = value * self.size
+
+
+class EMA:
+    """Exponential moving average, alpha given as a fraction of 1024."""
+
+    SHIFT = 3                   # State keeps 3 fractional bits
+
+    def __init__(self, alpha_q10, initial=0):
+        """
+        Args:
+            alpha_q10: Smoothing factor 1-1024 (1024 = no smoothing)
+        """
+        self.alpha = alpha_q10
+        self.state = initial << self.SHIFT
+
+    def update(self, value):
+        """Add a sample and return the new smoothed value."""
+        diff = (value << self.SHIFT) - self.state
+        self.state += (diff * self.alpha + (ALPHA_ONE >> 1)) >> ALPHA_BITS
+        return self.state >> self.SHIFT
+
+    def value(self):
+        return self.state >> self.SHIFT
+
+    def fill(self, value):
+        self.state = value << self.SHIFT
+
+
+class MedianOfN:
+    """Median of the last `size` samples (use a small odd size: 3, 5, 7)."""
+
+    def __init__(self, size, initial=0):
+        self.size = size
+        self.ring = array('H', [initial] * size)
+        self.sorted = array('H', [initial] * size)
+        self.index = 0
+
+    def update(self, value):
+        """Add a sample and return the median. Cost is O(size), fixed."""
+        ring = self.ring
+        ordered = self.sorted
+        n = self.size
+        old = ring[self.index]
+        ring[self.index] = value
+        self.index = (self.index + 1) % n
+
+        # Remove the oldest value from the sorted copy...
+        i = 0
+        while ordered[i] != old:
+            i += 1
+        while i < n - 1:
+            ordered[i] = ordered[i + 1]
+            i += 1
+        # ...and insert the new one in place
+        i = n - 1
+        while i > 0 and ordered[i - 1] > value:
+            ordered[i] = ordered[i - 1]
+            i -= 1
+        ordered[i] = value
+        return ordered[n >> 1]
+
+    def value(self):
+        return self.sorted[self.size >> 1]
+
+    def fill(self, value):
+        for i in range(self.size):
+            self.ring[i] = value
+            self.sorted[i] = value
+
+
+class SnapFilter:
+    """
+    Asymmetric "snap-to-zero" filter.
+
+    Movement in the normal direction is smoothed with a moving average.
+    A jump of more than `threshold` the other way (the sensor being
+    released) refills the history instantly so the reading snaps back.
+    """
+
+    def __init__(self, size, threshold=500, initial=0, snap_down=True):
+        """
+        Args:
+            size: Moving-average length
+            threshold: ADC drop (or rise) that triggers a snap
+            snap_down: True = snap on falling values, False = on rising
+        """
+        self.average = MovingAverage(size, initial)
+        self.threshold = threshold
+        self.snap_down = snap_down
+        self.last = initial
+
+    def update(self, value):
+        """Add a sample and return the filtered value."""
+        if self.snap_down:
+            snap = value < self.last - self.threshold
+        else:
+            snap = value > self.last + self.threshold
+        if snap:
+            self.average.fill(value)
+            self.last = value
+        else:
+            self.last = self.average.update(value)
+        return self.last
+
+    def value(self):
+        return self.last
+
+    def fill(self, value):
+        self.average.fill(value)
+        self.last = value
+
+
+class OneEuroFilter:
+    """
+    One-euro filter in fixed-point integers.
+
+    Low cutoff (heavy smoothing) while the finger is still, rising cutoff
+    (low lag) while it moves fast. Cutoffs are in milli-hertz.
+    """
+
+    SHIFT = 3                   # State keeps 3 fractional bits
+    MAX_CUTOFF_MHZ = 30000      # Keeps intermediate products < 2**30
+    DX_LIMIT = 500000           # Speed clamp, in ADC counts per 10 ms
+
+    def __init__(self, rate_hz, min_cutoff_mhz=1000, beta=1,
+                 d_cutoff_mhz=1000, initial=0):
+        """
+        Args:
+            rate_hz: Sample rate the filter is updated at
+            min_cutoff_mhz: Cutoff when still (1000 = 1 Hz)
+            beta: Extra cutoff in mHz per ADC count / 10 ms of speed
+            d_cutoff_mhz: Cutoff for the speed estimate itself
+        """
+        self.rate_hz = rate_hz
+        self.min_cutoff = min(min_cutoff_mhz, self.MAX_CUTOFF_MHZ)
+        self.beta = beta
+        # Largest speed that still adds to the cutoff (avoids overflow)
+        if beta > 0:
+            self.dx_cap = (self.MAX_CUTOFF_MHZ - self.min_cutoff) // beta
+        else:
+            self.dx_cap = 0
+        self.d_alpha = self.alpha_for(d_cutoff_mhz)
+        self.state = initial << self.SHIFT
+        self.dx = 0
+
+    def alpha_for(self, cutoff_mhz):
+        """Smoothing factor (of 1024) for a cutoff at this sample rate."""
+        # alpha = 2*pi*fc / (2*pi*fc + rate), all scaled by 1000
+        k = (6283 * cutoff_mhz) // 1000
+        return (k << ALPHA_BITS) // (k + self.rate_hz * 1000) or 1
+
+    def update(self, value):
+        """Add a sample and return the filtered value."""
+        x = value << self.SHIFT
+        prev = self.state
+
+        # Speed in ADC counts per 10 ms, clamped and low-passed
+        dx = ((x - prev) >> self.SHIFT) * self.rate_hz // 100
+        if dx > self.DX_LIMIT:
+            dx = self.DX_LIMIT
+        elif dx < -self.DX_LIMIT:
+            dx = -self.DX_LIMIT
+        self.dx += ((dx - self.dx) * self.d_alpha + (ALPHA_ONE >> 1)) >> ALPHA_BITS
+
+        speed = self.dx if self.dx >= 0 else -self.dx
+        if speed > self.dx_cap:
+            speed = self.dx_cap
+        alpha = self.alpha_for(self.min_cutoff + speed * self.beta)
+
+        self.state = prev + (((x - prev) * alpha + (ALPHA_ONE >> 1)) >> ALPHA_BITS)
+        return self.state >> self.SHIFT
+
+    def value(self):
+        return self.state >> self.SHIFT
+
+    def fill(self, value):
+        self.state = value << self.SHIFT
+        self.dx = 0
@@ -0,0 +1,116 @@
+# pico_percent_table.py - MicroPython for Raspberry Pi Pico
+# Copy this to your Pico next to main.py
+"""
+ADC Code to Percent Lookup Tables
+=================================
+Shared by flex_sensors.py and five_flex_sensors_mux.py
+
+The RP2040 ADC has 12 bits: read_u16() only scales the 4096 real codes
+up to 0-65535. So the whole calibration - (raw - flat) / (bent - flat),
+the x100, the dead-zone and the 0-100 clamp - can be worked out once per
+code and stored in a table. The hot path is then one shift and one
+index, integer-only and allocation-free:
+
+    percent = table[raw >> 4]
+
+Each table is an array('H') of 4096 entries (8 KB). Entries are
+percent x scale: scale=1 gives whole percents, scale=100 gives the
+percent x 100 (0-10000) used by binary_protocol frames.
+
+Tables are built from the stored calibration (pico_calibration.py) and
+rebuilt whenever it changes. Building one is 4096 float conversions and
+takes tens of milliseconds on a Pico (run_benchmark prints it), so build
+them once, never per sample.
+
+TIMING (on the Pico):
+  >>> import pico_percent_table
+  >>> pico_percent_table.run_benchmark()
+"""
+
+from array import array
+import time
+
+ADC_BITS = 12
+CODES = 1 << ADC_BITS       # 4096
+CODE_SHIFT = 16 - ADC_BITS  # read_u16() >> 4 = ADC code
+
+
+def code_to_u16(code):
+    """The read_u16() value the RP2040 reports for a 12-bit code."""
+    return (code << CODE_SHIFT) | (code >> (ADC_BITS - CODE_SHIFT))
+
+
+def build_table(flat, bent, scale=1, dead_zone=0.0):
+    """
+    Percent table for one channel.
+
+    Args:
+        flat: read_u16() value when flat
+        bent: read_u16() value when fully bent (may be below flat)
+        scale: Entries are percent x scale (max 655)
+        dead_zone: Percent snapped to 0 / 100 at either end
+    """
+    table = array('H', [0] * CODES)
+    span = bent - flat
+    full = 100 * scale
+    for code in range(CODES):
+        if span == 0:
+            break
+        percent = (code_to_u16(code) - flat) * 100 / span
+        if percent < dead_zone:
+            percent = 0
+        elif percent > 100 - dead_zone:
+            percent = 100
+        value = int(percent * scale + 0.5)
+        table[code] = 0 if value < 0 else full if value > full else value
+    return table
+
+
+def volts_to_u16(volts):
+    """Calibration stored in volts (five_flex_sensors_mux) -> read_u16() units"""
+    return int(volts * 65535 / 3.3 + 0.5)
+
+
+def run_benchmark(samples=4096, flat=30000, bent=50000):
+    """Compare the float conversion with a table lookup (prints us/sample)."""
+    table = build_table(flat, bent)
+    raws = array('H', [code_to_u16(code) for code in range(samples)])
+
+    def float_path(raws):
+        total = 0
+        for raw in raws:
+            percent = ((raw - flat) / (bent - flat)) * 100
+            percent = max(0, min(100, percent))
+            total += int(percent)
+        return total
+
+    def table_path(raws):
+        total = 0
+        for raw in raws:
+            total += table[raw >> CODE_SHIFT]
+        return total
+
+    # Same answers for every code (the table rounds, int() truncates)
+    mismatches = 0
+    for raw in raws:
+        exact = max(0, min(100, ((raw - flat) / (bent - flat)) * 100))
+        if abs(table[raw >> CODE_SHIFT] - exact) > 0.5:
+            mismatches += 1
+
+    start = time.ticks_us()
+    float_path(raws)
+    float_us = time.ticks_diff(time.ticks_us(), start)
+
+    start = time.ticks_us()
+    table_path(raws)
+    table_us = time.ticks_diff(time.ticks_us(), start)
+
+    start = time.ticks_us()
+    build_table(flat, bent)
+    build_us = time.ticks_diff(time.ticks_us(), start)
+
+    print("float path: {:.2f} us/sample".format(float_us / samples))
+    print("table path: {:.2f} us/sample ({:.1f}x faster)".format(
+        table_us / samples, float_us / max(1, table_us)))
+    print("table build: {} us, {} codes off by more than half a percent".format(
+        build_us, mismatches))
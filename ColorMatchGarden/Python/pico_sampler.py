@@ -0,0 +1,152 @@
+# pico_sampler.py - MicroPython for Raspberry Pi Pico
+# Copy this to your Pico next to main.py
+"""
+Fixed-Rate Timer Sampler for the Pico
+=====================================
+Samples a set of ADC channels from a machine.Timer at an exact rate
+(e.g. 500 Hz or 1 kHz) into a preallocated ring buffer. The main loop
+(the "emitter") drains frames whenever it likes, so print time and USB
+stalls no longer change the sample rate.
+
+The timer callback never allocates: frames go into array('H') slots and
+timestamps into an array('I'). If the emitter falls behind and the ring
+fills up, new frames are dropped and counted as overruns.
+
+Usage:
+    from machine import ADC
+    from pico_sampler import FixedRateSampler
+
+    sampler = FixedRateSampler([ADC(26), ADC(27), ADC(28)], rate_hz=500)
+    frame = sampler.new_frame()
+    sampler.start()
+    while True:
+        ticks = sampler.read(frame)
+        if ticks is None:
+            time.sleep_ms(1)
+            continue
+        ... use frame[0], frame[1], frame[2] ...
+"""
+
+from machine import Timer
+from array import array
+import time
+
+
+class FixedRateSampler:
+    """Timer-driven ADC sampler with a ring buffer and jitter stats."""
+
+    def __init__(self, adcs, rate_hz=500, capacity=256):
+        """
+        Args:
+            adcs: List of machine.ADC objects, one per channel
+            rate_hz: Sample rate in Hz
+            capacity: Ring buffer size in frames
+        """
+        self.adcs = adcs
+        self.channels = len(adcs)
+        self.rate_hz = rate_hz
+        self.period_us = 1000000 // rate_hz
+        self.capacity = capacity
+
+        self.values = array('H', [0] * (capacity * self.channels))
+        self.ticks = array('I', [0] * capacity)
+        self.head = 0       # Next slot the timer writes
+        self.tail = 0       # Next slot the emitter reads
+
+        # Statistics (updated inside the timer callback)
+        self.samples = 0
+        self.overruns = 0
+        self.jitter_max_us = 0
+        self.jitter_total_us = 0
+        self._last_ticks = 0
+
+        self._timer = None
+        # Bound once - creating a bound method in the IRQ would allocate
+        self._tick_cb = self._tick
+
+    def new_frame(self):
+        """Allocate a frame array for read() (do this once, outside loops)."""
+        return array('H', [0] * self.channels)
+
+    def start(self):
+        """Start sampling."""
+        self._last_ticks = time.ticks_us()
+        self._timer = Timer(freq=self.rate_hz, mode=Timer.PERIODIC,
+                            callback=self._tick_cb)
+
+    def stop(self):
+        """Stop sampling."""
+        if self._timer is not None:
+            self._timer.deinit()
+            self._timer = None
+
+    def _tick(self, timer):
+        now = time.ticks_us()
+
+        # Jitter: how far this tick landed from the ideal period
+        jitter = time.ticks_diff(now, self._last_ticks) - self.period_us
+        if jitter < 0:
+            jitter = -jitter
+        self._last_ticks = now
+        if jitter > self.jitter_max_us:
+            self.jitter_max_us = jitter
+        self.jitter_total_us += jitter
+        self.samples += 1
+
+        head = self.head
+        next_head = head + 1
+        if next_head == self.capacity:
+            next_head = 0
+        if next_head == self.tail:
+            # Ring full - emitter is behind, drop this frame
+            self.overruns += 1
+            return
+
+        base = head * self.channels
+        values = self.values
+        adcs = self.adcs
+        for i in range(self.channels):
+            values[base + i] = adcs[i].read_u16()
+        self.ticks[head] = now & 0xFFFFFFFF
+        self.head = next_head
+
+    def available(self):
+        """Number of frames waiting in the ring."""
+        return (self.head - self.tail) % self.capacity
+
+    def read(self, frame):
+        """
+        Copy the oldest frame into frame (from new_frame()).
+
+        Returns:
+            The frame's ticks_us timestamp, or None if the ring is empty
+        """
+        tail = self.tail
+        if tail == self.head:
+            return None
+        base = tail * self.channels
+        values = self.values
+        for i in range(self.channels):
+            frame[i] = values[base + i]
+        ticks = self.ticks[tail]
+        tail += 1
+        self.tail = 0 if tail == self.capacity else tail
+        return ticks
+
+    def stats(self):
+        """Rate, overrun and jitter numbers for reporting."""
+        avg = self.jitter_total_us // self.samples if self.samples else 0
+        return {
+            "rate_hz": self.rate_hz,
+            "samples": self.samples,
+            "overruns": self.overruns,
+            "jitter_avg_us": avg,
+            "jitter_max_us": self.jitter_max_us,
+        }
+
+    def report(self):
+        """One-line stats text."""
+        s = self.stats()
+        return "rate {}Hz samples {} overruns {} jitter avg {}us max {}us".format(
+            s["rate_hz"], s["samples"], s["overruns"],
+            s["jitter_avg_us"], s["jitter_max_us"])
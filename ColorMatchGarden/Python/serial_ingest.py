@@ -0,0 +1,255 @@
+"""
+Event-Driven Serial Ingest for the Unity Bridges
+================================================
+Shared by five_sensor_bridge.py, three_sensor_bridge.py and flex_sensor_bridge.py
+
+Instead of polling `ser.in_waiting` and sleeping 50 ms between lines, the
+bridges block on the serial port (with its read timeout) and wake as soon as
+the Pico sends a byte. Every complete line in the buffer is drained on each
+wake, so a burst from the Pico never builds up a backlog.
+
+Run this on your COMPUTER (not Pico)
+"""
+
+import time
+
+# What a bridge parser may raise on a malformed line: bad numbers
+# (ValueError, incl. json.JSONDecodeError) and JSON of the wrong shape,
+# e.g. {"thumb": 5} or {"thumb": null} (AttributeError / TypeError)
+PARSE_ERRORS = (ValueError, TypeError, AttributeError, KeyError)
+
+
+def read_available(ser):
+    """
+    Wait for serial data and return everything currently buffered.
+
+    Blocks until at least one byte arrives or the port timeout expires.
+
+    Returns:
+        (wake_time, chunk) - perf_counter() time the data arrived and the
+        raw bytes (empty on timeout)
+    """
+    # Blocks for the first byte, then takes everything already buffered
+    chunk = ser.read(ser.in_waiting or 1)
+    wake_time = time.perf_counter()
+    if chunk:
+        waiting = ser.in_waiting
+        if waiting:
+            chunk += ser.read(waiting)
+    return wake_time, chunk
+
+
+class LineReader:
+    """Blocking line reader that drains every complete line per wake."""
+
+    def __init__(self, ser):
+        """
+        Args:
+            ser: An open serial.Serial with a read timeout (e.g. timeout=1)
+        """
+        self.ser = ser
+        self._pending = bytearray()
+
+    def read_lines(self):
+        """
+        Wait for serial data and return all complete lines.
+
+        Returns:
+            (wake_time, lines) - perf_counter() time the data arrived and a
+            list of decoded, stripped lines (may be empty on timeout)
+        """
+        wake_time, chunk = read_available(self.ser)
+        if not chunk:
+            return wake_time, []
+
+        self._pending += chunk
+        end = self._pending.rfind(b"\n")
+        if end < 0:
+            return wake_time, []
+
+        complete = bytes(self._pending[:end])
+        del self._pending[:end + 1]
+
+        lines = []
+        for raw in complete.split(b"\n"):
+            line = raw.decode("utf-8", "replace").strip()
+            if line:
+                lines.append(line)
+        return wake_time, lines
+
+    def reset(self):
+        """Drop a partial line (the Pico went away mid-line)."""
+        del self._pending[:]
+
+
+class LatencyStats:
+    """Rolling serial-to-UDP latency window (milliseconds)."""
+
+    def __init__(self, window=500):
+        self.window = window
+        self.samples = [0.0] * window
+        self.count = 0          # Samples recorded (the window holds the newest)
+        self.worst = 0.0
+
+    def add(self, seconds):
+        """Record one latency measurement."""
+        ms = seconds * 1000.0
+        self.samples[self.count % self.window] = ms
+        self.count += 1
+        if ms > self.worst:
+            self.worst = ms
+
+    def percentiles(self, *ps):
+        """Return the p-th percentiles (0-100) of the current window, sorting it once."""
+        n = min(self.count, self.window)
+        if n == 0:
+            return tuple(0.0 for _ in ps)
+        ordered = sorted(self.samples[:n])
+        return tuple(ordered[min(n - 1, int(n * p / 100))] for p in ps)
+
+    def percentile(self, p):
+        """Return the p-th percentile (0-100) of the current window."""
+        return self.percentiles(p)[0]
+
+    def status(self):
+        """Short text for the live status line."""
+        p50, p95 = self.percentiles(50, 95)
+        return f"lat p50 {p50:.2f}ms p95 {p95:.2f}ms"
+
+    def summary(self):
+        """Multi-stat text printed when a bridge stops."""
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return (f"{self.count} samples | p50 {p50:.2f}ms | p95 {p95:.2f}ms | "
+                f"p99 {p99:.2f}ms | max {self.worst:.2f}ms")
+
+
+class Coalescer:
+    """
+    Latest-value coalescing with drop accounting.
+
+    When the Pico outpaces the bridge, a single wake can return many
+    samples. Only the newest one per channel set is worth sending to Unity;
+    the rest are counted as superseded so latency stays bounded.
+    """
+
+    def __init__(self):
+        self.forwarded = 0      # Samples sent on
+        self.superseded = 0     # Valid samples replaced by a newer one
+        self.errors = 0         # Lines that failed to parse
+
+    def newest_line(self, lines, parse, on_error=None):
+        """
+        Parse every line in order and return the newest valid result.
+
+        All lines are parsed (in arrival order, so stateful parsers such
+        as the --auto calibrator see every sample); only valid samples
+        count as superseded. Lines that raise PARSE_ERRORS are counted
+        and passed to on_error(line); lines parsing to None (banners,
+        prompts) are skipped.
+
+        Returns:
+            The parsed values of the newest valid line, or None
+        """
+        latest = None
+        valid = 0
+        for line in lines:
+            try:
+                values = parse(line)
+            except PARSE_ERRORS:
+                self.errors += 1
+                if on_error is not None:
+                    on_error(line)
+                continue
+            if values is not None:
+                latest = values
+                valid += 1
+        if valid:
+            self.forwarded += 1
+            self.superseded += valid - 1
+        return latest
+
+    def newest_frames(self, frames, key=len):
+        """
+        Keep only the newest frame for each key (default: channel count).
+
+        Returns:
+            List of surviving frames in arrival order
+        """
+        newest = {}
+        for frame in frames:
+            newest[key(frame)] = frame
+        kept = len(newest)
+        self.forwarded += kept
+        self.superseded += len(frames) - kept
+        return list(newest.values())
+
+    def status(self):
+        """Short counters text for status lines."""
+        return f"sent {self.forwarded} superseded {self.superseded} errors {self.errors}"
+
+
+SEQUENCE_FIELD = ",S:"
+
+
+class SequenceTracker:
+    """
+    Loss and liveness accounting for change-only Pico output.
+
+    pico_change_gate lines end in ",S:<seq>" (0-65535, counting sent lines
+    only). A gap in the sequence means lines were lost; silence is fine as
+    long as the heartbeat keeps arriving. Lines without the field are
+    ignored, so this is harmless with the normal every-sample output.
+    """
+
+    def __init__(self, timeout=3.0):
+        """
+        Args:
+            timeout: Seconds without any line (not even a heartbeat)
+                     before the link counts as stalled
+        """
+        self.timeout = timeout
+        self.last_seq = None
+        self.last_time = None
+        self.lines = 0          # Lines carrying a sequence number
+        self.lost = 0           # Lines missing from the sequence
+        self.stalls = 0         # Times the heartbeat went missing
+        self.stalled = False
+
+    def add(self, seq, now):
+        """Record one received sequence number (now = perf_counter())."""
+        if self.last_seq is not None:
+            gap = (seq - self.last_seq - 1) & 0xFFFF
+            # A huge "gap" is a Pico reset, not 60k lost lines
+            if gap < 0x8000:
+                self.lost += gap
+        self.last_seq = seq
+        self.last_time = now
+        self.lines += 1
+        self.stalled = False
+
+    def add_line(self, line, now):
+        """Record the sequence number of a text line, if it has one."""
+        pos = line.rfind(SEQUENCE_FIELD)
+        if pos < 0:
+            return
+        try:
+            seq = int(line[pos + len(SEQUENCE_FIELD):])
+        except ValueError:
+            return
+        self.add(seq, now)
+
+    def silence(self, now):
+        """Seconds since the last line with a sequence number."""
+        return 0.0 if self.last_time is None else now - self.last_time
+
+    def check_alive(self, now):
+        """False once the heartbeat has been missing for `timeout` seconds."""
+        if self.silence(now) <= self.timeout:
+            return True
+        if not self.stalled:
+            self.stalled = True
+            self.stalls += 1
+        return False
+
+    def status(self):
+        return f"{self.lines} change-only lines | lost {self.lost} | heartbeat stalls {self.stalls}"
@@ -0,0 +1,255 @@
+"""
+Hot-Plug Serial Supervisor for the Unity Bridges
+================================================
+Used by five_sensor_bridge.py, ThonnyUnityBridge.py and bridge_service.py
+
+SupervisedSerial is a drop-in for serial.Serial (read / in_waiting /
+readline / close). When the Pico is unplugged or resets, it does not
+raise: reads simply return nothing while it watches for the port to
+come back (every 0.25 s) and reopens it at once. A port that is there
+but will not open (Thonny still holds it) is retried with a bounded
+backoff (0.25 s doubling up to 2 s), so a cable bump costs about a
+second, not a staff restart. Ports that move on replug (ttyACM0 ->
+ttyACM1) are found again with find_port, e.g. by USB serial number.
+
+After a reconnect the input is flushed and the first (possibly partial)
+line is dropped, so no half line from before the outage is glued to
+new data. Outage count and durations are kept for the status line.
+
+LastValueHold fills the outage toward Unity: the last values are either
+held, or decayed to zero over a few seconds.
+
+Run this on your COMPUTER (not Pico)
+"""
+
+import os
+import time
+
+import serial
+from serial.tools import list_ports
+
+# ============ CONFIGURATION ============
+MIN_BACKOFF = 0.25        # First reconnect attempt after an unplug (seconds)
+MAX_BACKOFF = 2.0         # Longest wait between attempts
+FILL_INTERVAL = 0.1       # LastValueHold resend period during an outage
+DECAY_SECONDS = 2.0       # LastValueHold "decay": time to fade to zero
+# =======================================
+
+SERIAL_ERRORS = (serial.SerialException, OSError)
+
+
+class SupervisedSerial:
+    """serial.Serial stand-in that survives unplugs and Pico resets."""
+
+    def __init__(self, port, baudrate, timeout=1.0, skip_partial_line=True,
+                 find_port=None, min_backoff=MIN_BACKOFF, max_backoff=MAX_BACKOFF):
+        """
+        Args:
+            port: Serial port name (COM5, /dev/ttyACM0)
+            timeout: Read timeout, also the longest read() blocks in an outage
+            skip_partial_line: Drop bytes up to the first newline after a
+                               reconnect (text protocols; binary frames resync
+                               on their own)
+            find_port: Optional function returning the port to try now (or
+                       None), for devices that come back under a new name
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.skip_partial_line = skip_partial_line
+        self.find_port = find_port
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+
+        self.ser = None
+        self.backoff = min_backoff
+        self.next_attempt = 0.0
+        self.skipping = False
+
+        # Statistics
+        self.reconnects = 0
+        self.outages = 0
+        self.outage_started = None
+        self.outage_total = 0.0
+        self.outage_longest = 0.0
+        self.last_error = None
+
+    @property
+    def connected(self):
+        return self.ser is not None
+
+    def open(self):
+        """Try to open the port now. Returns True on success."""
+        port = self.find_port() if self.find_port is not None else self.port
+        if port is None:
+            return False
+        try:
+            self.ser = serial.Serial(port, self.baudrate, timeout=self.timeout)
+        except SERIAL_ERRORS as e:
+            self.last_error = e
+            return False
+
+        self.port = port
+        self.backoff = self.min_backoff
+        if self.outage_started is not None:
+            # Back after an unplug: start clean on a line boundary
+            self.reconnects += 1
+            duration = time.perf_counter() - self.outage_started
+            self.outage_total += duration
+            self.outage_longest = max(self.outage_longest, duration)
+            self.outage_started = None
+            try:
+                self.ser.reset_input_buffer()
+            except SERIAL_ERRORS:
+                pass
+            self.skipping = self.skip_partial_line
+        return True
+
+    def _port_present(self):
+        """Cheap check before an open attempt (by-id symlinks count too)."""
+        if self.find_port is not None:
+            return self.find_port() is not None
+        if os.path.exists(self.port):
+            return True
+        return any(port.device == self.port for port in list_ports.comports())
+
+    def _lost(self, error):
+        """The port went away: close it and start the outage clock."""
+        self.last_error = error
+        try:
+            self.ser.close()
+        except SERIAL_ERRORS:
+            pass
+        self.ser = None
+        self.outages += 1
+        self.outage_started = time.perf_counter()
+        self.next_attempt = self.outage_started + self.min_backoff
+
+    def _wait_for_port(self):
+        """One bounded wait / reconnect attempt; never blocks past timeout."""
+        now = time.perf_counter()
+        if self.outage_started is None:
+            # Never connected yet (Pico not plugged in at start)
+            self.outages += 1
+            self.outage_started = now
+        if now < self.next_attempt:
+            time.sleep(min(self.next_attempt - now, self.timeout, FILL_INTERVAL))
+            return
+        if not self._port_present():
+            # Still unplugged - look again soon, no backoff growth
+            self.next_attempt = now + self.min_backoff
+            return
+        if not self.open():
+            self.next_attempt = time.perf_counter() + self.backoff
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+
+    @property
+    def in_waiting(self):
+        if self.ser is None:
+            return 0
+        try:
+            return self.ser.in_waiting
+        except SERIAL_ERRORS as e:
+            self._lost(e)
+            return 0
+
+    def read(self, size=1):
+        """Like serial.Serial.read(); returns b"" while the Pico is away."""
+        if self.ser is None:
+            self._wait_for_port()
+            return b""
+        try:
+            chunk = self.ser.read(size)
+        except SERIAL_ERRORS as e:
+            self._lost(e)
+            return b""
+        if self.skipping and chunk:
+            end = chunk.find(b"\n")
+            if end < 0:
+                return b""
+            self.skipping = False
+            chunk = chunk[end + 1:]
+        return chunk
+
+    def readline(self):
+        """Like serial.Serial.readline(); returns b"" while the Pico is away."""
+        if self.ser is None:
+            self._wait_for_port()
+            return b""
+        try:
+            line = self.ser.readline()
+            if self.skipping and line:
+                # Possibly the tail of a line sent before the reconnect
+                self.skipping = False
+                line = self.ser.readline()
+        except SERIAL_ERRORS as e:
+            self._lost(e)
+            return b""
+        return line
+
+    def outage_seconds(self):
+        """Length of the current outage (0 when connected)."""
+        if self.outage_started is None:
+            return 0.0
+        return time.perf_counter() - self.outage_started
+
+    def close(self):
+        if self.ser is not None:
+            self.ser.close()
+            self.ser = None
+
+    def status(self):
+        """Short counters text for status lines."""
+        return (f"reconnects {self.reconnects} | outages {self.outages} "
+                f"total {self.outage_total:.1f}s longest {self.outage_longest:.1f}s")
+
+
+class LastValueHold:
+    """What Unity gets while the Pico is away: the last values, held or decayed."""
+
+    def __init__(self, mode="hold", decay_seconds=DECAY_SECONDS, interval=FILL_INTERVAL):
+        """
+        Args:
+            mode: "hold" keeps the last values, "decay" fades them to zero
+            decay_seconds: Fade time for "decay"
+            interval: Seconds between fill messages
+        """
+        if mode not in ("hold", "decay"):
+            raise ValueError(f"unknown hold mode: {mode}")
+        self.mode = mode
+        self.decay_seconds = decay_seconds
+        self.interval = interval
+        self.last = None
+        self.since = None
+        self.next_fill = 0.0
+        self.filled = 0
+
+    def update(self, values):
+        """Remember a real sample (ends any outage fill)."""
+        self.last = values
+        self.since = None
+
+    def fill(self, now):
+        """
+        Values to send during an outage at now (perf_counter()), or None if
+        nothing is due (no sample yet, not time yet, or fully decayed).
+        """
+        if self.last is None or now < self.next_fill:
+            return None
+        if self.since is None:
+            self.since = now
+        self.next_fill = now + self.interval
+
+        if self.mode == "hold":
+            values = self.last
+        else:
+            remaining = 1.0 - (now - self.since) / self.decay_seconds
+            if remaining <= 0.0:
+                if not any(self.last):
+                    return None
+                remaining = 0.0
+            values = tuple(value * remaining for value in self.last)
+            if remaining == 0.0:
+                self.last = values      # Send the zeros once, then stay quiet
+        self.filled += 1
+        return values
@@ -0,0 +1,163 @@
+"""
+Shared-Memory Transport for Color Match Garden
+==============================================
+Same-machine alternative to UDP: the bridge writes every sample into a
+small memory-mapped ring file and Unity reads the newest one directly in
+Update() - no loopback socket, no receive thread and no string parsing.
+
+FILE LAYOUT (little-endian):
+  Header (64 bytes):
+    0  8s   magic b"CMGSHM\\0\\0"
+    8  u32  version
+    12 u32  channels
+    16 u32  slots
+    20 u32  slot size in bytes
+    24 u64  sequence of the newest complete sample (0 = none yet)
+  Slot i (sequence s lives in slot (s - 1) % slots):
+    0  u64  sequence (written first)
+    8  i64  timestamp in microseconds (Pico ticks_us for binary frames,
+            host clock otherwise)
+    16 f32 x channels values, 0.0-1.0
+    .. u64  sequence again (written last)
+
+A reader accepts a slot only when both sequence fields match the one it
+asked for, so it never uses a half-written sample. The ring keeps the
+last `slots` samples, so a reader that polls once per frame can still
+see (or count) everything it missed.
+
+Relative file names are placed in the system temp directory, which is
+where FiveSensorInput.cs / ThreeSensorInput.cs look for them.
+
+USAGE:
+  python five_sensor_bridge.py --shm                  (cmg_five_sensors.shm)
+  python shm_transport.py cmg_five_sensors.shm        (watch a ring)
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+
+MAGIC = b"CMGSHM\0\0"
+VERSION = 1
+HEADER = struct.Struct("<8sIIII")
+HEADER_SIZE = 64
+SEQUENCE = struct.Struct("<Q")
+SEQUENCE_OFFSET = 24
+DEFAULT_SLOTS = 64
+
+
+def resolve_path(name):
+    """Relative names live in the temp directory (shared with Unity)"""
+    if os.path.isabs(name):
+        return name
+    return os.path.join(tempfile.gettempdir(), name)
+
+
+class SharedMemoryRing:
+    """Bridge side: writes samples into the ring file."""
+
+    def __init__(self, name, channels, slots=DEFAULT_SLOTS):
+        self.path = resolve_path(name)
+        self.channels = channels
+        self.slots = slots
+        self.slot_data = struct.Struct(f"<q{channels}f")
+        self.slot_size = SEQUENCE.size + self.slot_data.size + SEQUENCE.size
+        size = HEADER_SIZE + slots * self.slot_size
+
+        # Reuse a matching ring (Unity may still have it mapped, which
+        # blocks truncating it on Windows) and carry on its sequence so
+        # readers never see it go backwards
+        self.sequence = 0
+        if os.path.exists(self.path) and os.path.getsize(self.path) == size:
+            self.file = open(self.path, "r+b")
+            self.map = mmap.mmap(self.file.fileno(), size)
+            if HEADER.unpack_from(self.map, 0) == (MAGIC, VERSION, channels, slots, self.slot_size):
+                self.sequence = SEQUENCE.unpack_from(self.map, SEQUENCE_OFFSET)[0]
+        else:
+            with open(self.path, "wb") as f:
+                f.write(b"\0" * size)
+            self.file = open(self.path, "r+b")
+            self.map = mmap.mmap(self.file.fileno(), size)
+        HEADER.pack_into(self.map, 0, MAGIC, VERSION, channels, slots, self.slot_size)
+
+    def add(self, values, timestamp_us=None):
+        """Publish one sample (values in 0.0-1.0)."""
+        if timestamp_us is None:
+            timestamp_us = time.perf_counter_ns() // 1000
+        self.sequence += 1
+        sequence = self.sequence
+        offset = HEADER_SIZE + ((sequence - 1) % self.slots) * self.slot_size
+        # Opening sequence, data, closing sequence - in that order
+        SEQUENCE.pack_into(self.map, offset, sequence)
+        self.slot_data.pack_into(self.map, offset + SEQUENCE.size, timestamp_us, *values)
+        SEQUENCE.pack_into(self.map, offset + SEQUENCE.size + self.slot_data.size, sequence)
+        SEQUENCE.pack_into(self.map, SEQUENCE_OFFSET, sequence)
+
+    def status(self):
+        return f"shared memory: {self.sequence} samples -> {self.path}"
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+class SharedMemoryReader:
+    """Reads a ring written by SharedMemoryRing (for tools and tests)."""
+
+    def __init__(self, name):
+        self.path = resolve_path(name)
+        self.file = open(self.path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.channels, self.slots, self.slot_size = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a Color Match Garden ring (v{VERSION})")
+        self.slot_data = struct.Struct(f"<q{self.channels}f")
+
+    def latest(self):
+        """(sequence, timestamp_us, values) of the newest sample, or None"""
+        sequence = SEQUENCE.unpack_from(self.map, SEQUENCE_OFFSET)[0]
+        if sequence == 0:
+            return None
+        return self.read(sequence)
+
+    def read(self, sequence):
+        """One sample by sequence, or None if overwritten or mid-write"""
+        offset = HEADER_SIZE + ((sequence - 1) % self.slots) * self.slot_size
+        # Reverse of the writer's order: closing, data, opening. A write
+        # that overlaps the read changes at least one of the two.
+        end = SEQUENCE.unpack_from(self.map, offset + SEQUENCE.size + self.slot_data.size)[0]
+        fields = self.slot_data.unpack_from(self.map, offset + SEQUENCE.size)
+        begin = SEQUENCE.unpack_from(self.map, offset)[0]
+        if begin != sequence or end != sequence:
+            return None
+        return sequence, fields[0], fields[1:]
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python shm_transport.py FILE.shm")
+        sys.exit(1)
+    reader = SharedMemoryReader(sys.argv[1])
+    print(f"{reader.path}: {reader.channels} channels, {reader.slots} slots")
+    last = 0
+    try:
+        while True:
+            sample = reader.latest()
+            if sample is not None and sample[0] != last:
+                sequence, timestamp_us, values = sample
+                missed = sequence - last - 1 if last else 0
+                last = sequence
+                print(f"\r#{sequence} " + " ".join(f"{v:.2f}" for v in values)
+                      + f"  (+{missed} since last poll)  ", end="")
+            time.sleep(1 / 60)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        reader.close()
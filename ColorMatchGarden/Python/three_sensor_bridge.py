@@ -11,28 +11,83 @@ WIRING (on Pico):
 Run this on your COMPUTER (not Pico), reads serial from Pico
 """
 
+import argparse
 import serial
 import socket
 import time
-import sys
+
+from serial_ingest import PARSE_ERRORS, LineReader, LatencyStats, Coalescer, SequenceTracker, read_available
+from capture_log import CaptureWriter, RecordingSerial, ReplaySerial, ReplayFinished
+from message_encoder import ThreeChannelEncoder
+from shm_transport import SharedMemoryRing
+from udp_batch import UdpBatcher, spread_timestamps
+from auto_calibration import AutoCalibrator
+from calibration_profiles import PlayerProfile, ProfileStore, RECORD_SECONDS
+from binary_protocol import FrameDecoder
+from bridge_metrics import BridgeMetrics, start_export, METRICS_PORT, STATS_PORT
 
 # ============ CONFIGURATION ============
 SERIAL_PORT = "COM5"      # Your Pico's COM port
 BAUD_RATE = 115200
 UNITY_HOST = "127.0.0.1"
 UNITY_PORT = 5005         # Must match ThreeSensorInput.cs
+SHM_FILE = "cmg_three_sensors.shm"  # --shm ring (temp dir), must match ThreeSensorInput.cs
 
 # Calibration values (adjust based on YOUR sensors)
+# With --auto these are only the starting point and the bend direction
 FLAT_VALUE = 50000        # ADC value when sensor is flat
 BENT_VALUE = 20000        # ADC value when sensor is fully bent
 # =======================================
 
+# Reused-buffer encoder, byte-identical to format_rgb()
+RGB_ENCODER = ThreeChannelEncoder()
+
 def normalize_value(raw):
     """Convert raw ADC (0-65535) to 0.0-1.0"""
     normalized = (FLAT_VALUE - raw) / (FLAT_VALUE - BENT_VALUE)
     return max(0.0, min(1.0, normalized))
 
-def main():
+def parse_raw(line):
+    """
+    Parse one line from the Pico into raw ADC (r, g, b).
+    
+    Expected format from Pico: "R:12345,G:23456,B:34567"
+    Or just: "12345,23456,34567"
+    
+    Returns None if the line is not sensor data. Raises ValueError on
+    malformed numbers.
+    """
+    if "," not in line:
+        return None
+    
+    parts = line.replace("R:", "").replace("G:", "").replace("B:", "").split(",")
+    if len(parts) < 3:
+        return None
+    
+    return float(parts[0]), float(parts[1]), float(parts[2])
+
+def parse_line(line):
+    """Parse one line from the Pico into normalized (r, g, b), or None"""
+    raw = parse_raw(line)
+    if raw is None:
+        return None
+    
+    # Normalize to 0-1
+    return normalize_value(raw[0]), normalize_value(raw[1]), normalize_value(raw[2])
+
+def make_parser(auto=None):
+    """parse_line, or raw parsing normalized by an AutoCalibrator"""
+    if auto is None:
+        return parse_line
+    
+    def parse_auto(line):
+        raw = parse_raw(line)
+        return None if raw is None else auto.update(raw)
+    return parse_auto
+
+def main(binary=False, coalesce=False, record=None, replay=None, speed=1.0,
+         batch=1, batch_ms=10.0, shm=None, profile=None, calibrate=None, auto=False,
+         metrics_port=None, stats_port=None):
     print("=" * 55)
     print("  🌸 Color Match Garden - 3 Sensor RGB Bridge 🌸")
     print("=" * 55)
@@ -40,63 +95,279 @@ def main():
     print(f"  Unity Target: {UNITY_HOST}:{UNITY_PORT}")
     print("=" * 55)
     
+    # Per-player calibration profile (calibration_profiles.py)
+    player = None
+    if calibrate or profile:
+        try:
+            player = PlayerProfile(calibrate or profile, "three", 3, record=bool(calibrate))
+        except KeyError:
+            print(f"\n❌ No 3-sensor profile named '{profile}'")
+            print(f"   Saved profiles: {', '.join(ProfileStore().names()) or 'none'}")
+            print(f"   Record one with: --calibrate {profile}")
+            return
+        if calibrate:
+            print(f"\n🧑 Recording profile '{calibrate}': open and close the hand fully")
+            print(f"   for {RECORD_SECONDS:g} seconds after the data starts")
+        else:
+            print(f"\n🧑 Using {player.describe()}")
+    
     # Setup UDP socket
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     
-    try:
-        ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
-        print(f"\n✅ Connected to {SERIAL_PORT}")
-    except serial.SerialException as e:
-        print(f"\n❌ Cannot open {SERIAL_PORT}: {e}")
-        print("\n💡 Make sure:")
-        print("   1. Pico is connected via USB")
-        print("   2. Correct COM port is set")
-        print("   3. Thonny is NOT connected to the same port")
-        print("\nStarting SIMULATION mode instead...")
-        run_simulation(sock)
-        return
+    if replay:
+        # Play a recorded session through the same parse/send path
+        ser = ReplaySerial(replay, speed)
+        pace = "max speed" if speed <= 0 else f"{speed:g}x"
+        print(f"\n▶️  Replaying {replay} at {pace}")
+    else:
+        try:
+            ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
+            print(f"\n✅ Connected to {SERIAL_PORT}")
+        except serial.SerialException as e:
+            print(f"\n❌ Cannot open {SERIAL_PORT}: {e}")
+            print("\n💡 Make sure:")
+            print("   1. Pico is connected via USB")
+            print("   2. Correct COM port is set")
+            print("   3. Thonny is NOT connected to the same port")
+            print("\nStarting SIMULATION mode instead...")
+            run_simulation(sock)
+            return
+        
+        if record:
+            ser = RecordingSerial(ser, CaptureWriter(record))
+            print(f"⏺️  Recording raw serial data to {record}")
     
     print("\n🎮 Sending RGB sensor data to Unity!")
     print("   Bend sensors to mix colors!\n")
     
+    ring = None
+    batcher = None
+    if shm:
+        # Same-machine transport: Unity reads the ring instead of UDP
+        ring = SharedMemoryRing(shm, 3)
+        print(f"🧠 Writing samples to shared memory {ring.path}\n")
+    elif batch > 1:
+        batcher = UdpBatcher(sock, (UNITY_HOST, UNITY_PORT), batch, batch_ms)
+        print(f"📦 Batching up to {batcher.max_samples} samples / {batch_ms:g} ms per datagram\n")
+    
+    auto_cal = None
+    if auto:
+        # Learns each sensor's range while playing - no FLAT/BENT tuning
+        auto_cal = AutoCalibrator(3, FLAT_VALUE, BENT_VALUE)
+        print("🎯 Auto-calibration on: bend each sensor fully a few times\n")
+    
+    metrics = BridgeMetrics(bridge="three")
+    stop_export = start_export([metrics], metrics_port, stats_port)
+    
+    try:
+        if binary:
+            run_binary_bridge(ser, sock, coalesce, batcher, ring, player, auto_cal, metrics)
+        else:
+            run_text_bridge(ser, sock, coalesce, batcher, ring, player, auto_cal, metrics)
+    finally:
+        stop_export()
+        ser.close()
+        sock.close()
+        if ring is not None:
+            ring.close()
+
+def format_rgb(values):
+    """Unity message for RGB values, e.g. R:0.5,G:0.3,B:0.8"""
+    r, g, b = values
+    return f"R:{r:.2f},G:{g:.2f},B:{b:.2f}"
+
+def send_rgb(sock, values, batcher=None, timestamp_us=None, ring=None):
+    """Send RGB values to Unity (or queue them on a UdpBatcher / SharedMemoryRing)"""
+    if ring is not None:
+        ring.add(values, timestamp_us)
+    elif batcher is not None:
+        batcher.add(format_rgb(values), timestamp_us)
+    else:
+        sock.sendto(RGB_ENCODER.encode(values), (UNITY_HOST, UNITY_PORT))
+
+def show_rgb(values, extra=""):
+    """Live status line"""
+    r, g, b = values
+    print(f"\r🔴 {r:.0%} 🟢 {g:.0%} 🔵 {b:.0%}  {extra}  ", end="")
+
+def run_text_bridge(ser, sock, coalesce=False, batcher=None, ring=None, profile=None,
+                    auto=None, metrics=None):
+    """Forward "R:..,G:..,B:.." lines from the Pico to Unity"""
+    reader = LineReader(ser)
+    latency = LatencyStats()
+    coalescer = Coalescer()
+    sequence = SequenceTracker()    # pico_3_sensors CHANGE_ONLY lines
+    previous_wake = None
+    parse = make_parser(auto)
+    if metrics is None:
+        metrics = BridgeMetrics(bridge="three")
+    metrics.watch("superseded_total", "Samples replaced by a newer one (--coalesce)",
+                  lambda: coalescer.superseded)
+    metrics.watch("sequence_lost_total", "Change-only lines missing from the sequence",
+                  lambda: sequence.lost)
+    
     try:
         while True:
-            if ser.in_waiting:
-                line = ser.readline().decode('utf-8').strip()
+            # Blocks until the Pico sends data, then drains every complete line
+            wake_time, lines = reader.read_lines()
+            metrics.read.observe(time.perf_counter() - wake_time)
+            latest = None
+            
+            if not lines:
+                # A change-only Pico is quiet while nothing moves; only a
+                # missing heartbeat means trouble
+                if not sequence.check_alive(wake_time):
+                    print(f"\r⚠️  No data from the Pico for {sequence.silence(wake_time):.0f}s "
+                          f"(heartbeat missing)  ", end="")
+                continue
+            for line in lines:
+                sequence.add_line(line, wake_time)
+            metrics.lines.inc(len(lines))
+            metrics.batch.observe(len(lines))
+            
+            if coalesce:
+                # Only the newest sample matters - skip the stale backlog
+                start = time.perf_counter()
+                latest = coalescer.newest_line(lines, parse, metrics.parse_error)
+                if latest is not None:
+                    parsed = time.perf_counter()
+                    metrics.parse.observe(parsed - start)
+                    if profile is not None:
+                        latest = profile.apply(latest)
+                    normalized = time.perf_counter()
+                    metrics.normalize.observe(normalized - parsed)
+                    send_rgb(sock, latest, batcher, int(wake_time * 1e6), ring)
+                    sent = time.perf_counter()
+                    metrics.send.observe(sent - normalized)
+                    metrics.latency.observe(sent - wake_time)
+                    metrics.samples.inc()
+                    latency.add(sent - wake_time)
+                    show_rgb(latest, f"{latency.status()} | {coalescer.status()}")
+                continue
+            
+            stamps = None
+            if batcher is not None:
+                # Text lines carry no Pico timestamp - estimate arrival times
+                stamps = spread_timestamps(previous_wake, wake_time, len(lines))
+                previous_wake = wake_time
+            
+            for i, line in enumerate(lines):
+                start = time.perf_counter()
                 try:
-                    # Expected format from Pico: "R:12345,G:23456,B:34567"
-                    # Or just: "12345,23456,34567"
-                    
-                    if "," in line:
-                        parts = line.replace("R:", "").replace("G:", "").replace("B:", "").split(",")
-                        
-                        if len(parts) >= 3:
-                            raw_r = float(parts[0])
-                            raw_g = float(parts[1])
-                            raw_b = float(parts[2])
-                            
-                            # Normalize to 0-1
-                            r = normalize_value(raw_r)
-                            g = normalize_value(raw_g)
-                            b = normalize_value(raw_b)
-                            
-                            # Send to Unity: "R:0.5,G:0.3,B:0.8"
-                            message = f"R:{r:.2f},G:{g:.2f},B:{b:.2f}"
-                            sock.sendto(message.encode(), (UNITY_HOST, UNITY_PORT))
-                            
-                            # Visual display
-                            print(f"\r🔴 {r:.0%} 🟢 {g:.0%} 🔵 {b:.0%}  ", end="")
-                    
-                except ValueError as e:
-                    pass  # Ignore parse errors
-                    
-            time.sleep(0.05)
+                    values = parse(line)
+                except PARSE_ERRORS:
+                    metrics.parse_error(line)
+                    continue
+                if values is None:
+                    metrics.ignored.inc()
+                    continue
+                parsed = time.perf_counter()
+                metrics.parse.observe(parsed - start)
+                if profile is not None:
+                    values = profile.apply(values)
+                normalized = time.perf_counter()
+                metrics.normalize.observe(normalized - parsed)
+                
+                send_rgb(sock, values, batcher, stamps[i] if stamps else None, ring)
+                sent = time.perf_counter()
+                metrics.send.observe(sent - normalized)
+                metrics.latency.observe(sent - wake_time)
+                metrics.samples.inc()
+                latency.add(sent - wake_time)
+                latest = values
             
-    except KeyboardInterrupt:
+            # Visual display (once per wake, not per line)
+            if latest is not None:
+                show_rgb(latest, latency.status() if auto is None else auto.status())
+            
+    except (KeyboardInterrupt, ReplayFinished):
         print("\n\n👋 Bridge stopped")
-    finally:
-        ser.close()
-        sock.close()
+        print(f"   Serial→UDP latency: {latency.summary()}")
+        print(f"   Metrics: {metrics.summary()}")
+        if sequence.lines:
+            print(f"   Change-only: {sequence.status()}")
+        if coalesce:
+            print(f"   Coalescing: {coalescer.status()}")
+        if batcher is not None:
+            batcher.close()
+            print(f"   {batcher.status()}")
+        if ring is not None:
+            print(f"   {ring.status()}")
+        if profile is not None:
+            print(f"   Calibration: {profile.describe()}")
+        if auto is not None:
+            print(f"   {auto.status()} | learned ranges {auto.ranges()}")
+
+def run_binary_bridge(ser, sock, coalesce=False, batcher=None, ring=None, profile=None,
+                      auto=None, metrics=None):
+    """Forward binary raw-ADC frames (pico_3_sensors BINARY_OUTPUT) to Unity"""
+    decoder = FrameDecoder()
+    latency = LatencyStats()
+    coalescer = Coalescer()
+    if metrics is None:
+        metrics = BridgeMetrics(bridge="three")
+    metrics.watch("superseded_total", "Samples replaced by a newer one (--coalesce)",
+                  lambda: coalescer.superseded)
+    metrics.watch("frames_lost_total", "Binary frames missing from the sequence",
+                  lambda: decoder.lost)
+    metrics.watch("crc_errors_total", "Binary frames rejected by CRC",
+                  lambda: decoder.crc_errors)
+    
+    try:
+        while True:
+            wake_time, chunk = read_available(ser)
+            latest = None
+            
+            frames = decoder.feed(chunk)
+            metrics.read.observe(time.perf_counter() - wake_time)
+            if frames:
+                metrics.lines.inc(len(frames))
+                metrics.batch.observe(len(frames))
+            if coalesce:
+                frames = coalescer.newest_frames(frames, key=lambda frame: len(frame[2]))
+            
+            for seq, ticks_us, raw in frames:
+                if len(raw) < 3:
+                    metrics.ignored.inc()
+                    continue
+                start = time.perf_counter()
+                if auto is not None:
+                    values = auto.update(raw)
+                else:
+                    values = (normalize_value(raw[0]), normalize_value(raw[1]), normalize_value(raw[2]))
+                parsed = time.perf_counter()
+                metrics.parse.observe(parsed - start)
+                if profile is not None:
+                    values = profile.apply(values)
+                normalized = time.perf_counter()
+                metrics.normalize.observe(normalized - parsed)
+                send_rgb(sock, values, batcher, ticks_us, ring)
+                sent = time.perf_counter()
+                metrics.send.observe(sent - normalized)
+                metrics.latency.observe(sent - wake_time)
+                metrics.samples.inc()
+                latency.add(sent - wake_time)
+                latest = values
+            
+            if latest is not None:
+                show_rgb(latest, f"{latency.status()} | {decoder.status()}")
+            
+    except (KeyboardInterrupt, ReplayFinished):
+        print("\n\n👋 Bridge stopped")
+        print(f"   Serial→UDP latency: {latency.summary()}")
+        print(f"   Binary frames: {decoder.status()} | skipped {decoder.skipped} bytes")
+        print(f"   Metrics: {metrics.summary()}")
+        if coalesce:
+            print(f"   Coalescing: {coalescer.status()}")
+        if batcher is not None:
+            batcher.close()
+            print(f"   {batcher.status()}")
+        if ring is not None:
+            print(f"   {ring.status()}")
+        if profile is not None:
+            print(f"   Calibration: {profile.describe()}")
+        if auto is not None:
+            print(f"   {auto.status()} | learned ranges {auto.ranges()}")
 
 def run_simulation(sock):
     """Simulate 3 sensors for testing without hardware"""
@@ -114,8 +385,7 @@ def run_simulation(sock):
             g = 0.5 + 0.5 * math.sin(t * 0.7 + 1)
             b = 0.5 + 0.5 * math.sin(t * 0.3 + 2)
             
-            message = f"R:{r:.2f},G:{g:.2f},B:{b:.2f}"
-            sock.sendto(message.encode(), (UNITY_HOST, UNITY_PORT))
+            send_rgb(sock, (r, g, b))
             
             print(f"\r🔴 {r:.0%} 🟢 {g:.0%} 🔵 {b:.0%}  ", end="")
             
@@ -127,5 +397,35 @@ def run_simulation(sock):
     finally:
         sock.close()
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="3 flex sensors (RGB) to Unity bridge")
+    parser.add_argument("--binary", action="store_true", help="Pico sends binary frames")
+    parser.add_argument("--coalesce", action="store_true", help="Forward only the newest sample")
+    parser.add_argument("--record", metavar="FILE", help="Append raw serial data to a capture file")
+    parser.add_argument("--replay", metavar="FILE", help="Play back a capture file instead of serial")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Replay speed: 1 = real time, 0 = as fast as possible")
+    parser.add_argument("--batch", type=int, default=1, metavar="N",
+                        help="Pack up to N timestamped samples per UDP datagram")
+    parser.add_argument("--batch-ms", type=float, default=10.0, metavar="MS",
+                        help="Send a partial batch after MS milliseconds")
+    parser.add_argument("--shm", nargs="?", const=SHM_FILE, metavar="FILE",
+                        help=f"Write to a shared-memory ring instead of UDP (default {SHM_FILE})")
+    parser.add_argument("--auto", action="store_true",
+                        help="Learn each sensor's flat/bent range while playing")
+    parser.add_argument("--metrics", nargs="?", type=int, const=METRICS_PORT, metavar="PORT",
+                        help=f"Serve Prometheus metrics on http://127.0.0.1:PORT/metrics (default {METRICS_PORT})")
+    parser.add_argument("--stats-datagram", nargs="?", type=int, const=STATS_PORT, metavar="PORT",
+                        help=f"Send a JSON stats datagram every second (default port {STATS_PORT})")
+    player = parser.add_mutually_exclusive_group()
+    player.add_argument("--profile", metavar="NAME", help="Apply a saved player calibration profile")
+    player.add_argument("--calibrate", metavar="NAME",
+                        help=f"Record a player profile over the first {RECORD_SECONDS:g} s, save and use it")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(binary=args.binary, coalesce=args.coalesce, record=args.record,
+         replay=args.replay, speed=args.speed, batch=args.batch, batch_ms=args.batch_ms,
+         shm=args.shm, profile=args.profile, calibrate=args.calibrate,
+         auto=args.auto, metrics_port=args.metrics, stats_port=args.stats_datagram)
@@ -0,0 +1,138 @@
+"""
+Batched UDP Datagrams for Color Match Garden
+============================================
+Packs several timestamped sensor samples into one datagram instead of
+calling sock.sendto() once per reading. A batch is sent when it holds
+max_samples samples or its first sample is max_delay_ms old, whichever
+comes first. The age limit is enforced by a small timer thread, so it
+holds even while the bridge is blocked in a serial read (1 s timeout,
+or much longer gaps with change-only Picos).
+
+DATAGRAM FORMAT (UTF-8 text, one line per sample):
+  B:<count>
+  <offset_us>|<message>
+  <offset_us>|<message>
+  ...
+
+offset_us is the sample time in microseconds after the first sample of
+the batch; message is the usual single-sample text (e.g. "T:0.50,I:...").
+FiveSensorInput.cs and ThreeSensorInput.cs replay the samples on their
+original spacing and interpolate between them, so batching lowers the
+syscall and packet rate without losing temporal resolution.
+
+USAGE:
+  python five_sensor_bridge.py --batch 8 --batch-ms 10
+"""
+
+import threading
+import time
+
+# Pico timestamps wrap at 2**30 us; masking the offset with the same
+# period keeps batches that span a wrap correct (host stamps never wrap,
+# and their offsets within one batch are tiny either way)
+from binary_protocol import TICKS_MASK
+
+BATCH_HEADER = "B:"
+MAX_SAMPLES = 32          # Keeps a 5-finger batch well under one MTU
+
+
+def now_us():
+    """Host monotonic clock in microseconds"""
+    return time.perf_counter_ns() // 1000
+
+
+def spread_timestamps(previous_wake, wake_time, count):
+    """
+    Estimate arrival times for `count` lines read in one wake.
+
+    Text lines carry no Pico timestamp, so the lines of one read are
+    spread evenly between the previous wake and this one (perf_counter
+    seconds in, microseconds out).
+    """
+    if previous_wake is None or count <= 1:
+        return [int(wake_time * 1e6)] * count
+    step = (wake_time - previous_wake) / count
+    return [int((previous_wake + step * (i + 1)) * 1e6) for i in range(count)]
+
+
+class UdpBatcher:
+    """Collects messages and sends them as batched datagrams."""
+
+    def __init__(self, sock, address, max_samples=8, max_delay_ms=10.0):
+        """
+        Args:
+            sock: UDP socket
+            address: (host, port) of the Unity listener
+            max_samples: Samples per datagram (capped at MAX_SAMPLES)
+            max_delay_ms: Longest a sample may wait for its batch
+        """
+        self.sock = sock
+        self.address = address
+        self.max_samples = max(1, min(max_samples, MAX_SAMPLES))
+        self.max_delay = max_delay_ms / 1000.0
+        self.lines = []
+        self.first_us = 0
+        self.opened = 0.0
+        self.datagrams = 0
+        self.samples = 0
+
+        # The timer thread sleeps until the open batch is max_delay old
+        self.cond = threading.Condition()
+        self.closed = False
+        self.timer = threading.Thread(target=self._flush_loop, daemon=True)
+        self.timer.start()
+
+    def add(self, message, timestamp_us=None):
+        """Queue one sample; sends the batch when it is full."""
+        if timestamp_us is None:
+            timestamp_us = now_us()
+        with self.cond:
+            if not self.lines:
+                self.first_us = timestamp_us
+                self.opened = time.perf_counter()
+                self.lines.append("")   # Header slot, filled in by _send()
+                self.cond.notify()
+            offset = (timestamp_us - self.first_us) & TICKS_MASK
+            self.lines.append(f"{offset}|{message}")
+            if len(self.lines) > self.max_samples:
+                self._send()
+
+    def _flush_loop(self):
+        with self.cond:
+            while not self.closed:
+                if not self.lines:
+                    self.cond.wait()
+                    continue
+                remaining = self.opened + self.max_delay - time.perf_counter()
+                if remaining > 0:
+                    self.cond.wait(remaining)
+                else:
+                    self._send()
+
+    def flush(self):
+        """Send whatever is pending now."""
+        with self.cond:
+            self._send()
+
+    def close(self):
+        """Send what is pending and stop the timer thread."""
+        with self.cond:
+            self._send()
+            self.closed = True
+            self.cond.notify()
+
+    def _send(self):
+        if not self.lines:
+            return
+        count = len(self.lines) - 1
+        self.lines[0] = f"{BATCH_HEADER}{count}"
+        self.sock.sendto("\n".join(self.lines).encode(), self.address)
+        self.lines = []
+        self.datagrams += 1
+        self.samples += count
+
+    def status(self):
+        if not self.datagrams:
+            return "batching: nothing sent"
+        return (f"batching: {self.samples} samples in {self.datagrams} datagrams "
+                f"({self.samples / self.datagrams:.1f} per datagram)")
@@ -8,11 +8,27 @@ Wiring:
 - GP10 -> CD4051 Pin 9 (Select A)
 - GP11 -> CD4051 Pin 10 (Select B)
 - GP12 -> CD4051 Pin 11 (Select C)
+
+More sensors (second glove, up to 24): add CD4051s on GP27 (ADC1) and
+GP28 (ADC2) in MUXES below, with CALIBRATION entries for their sensors,
+and use MuxScanner / main_scan().
+
+Copy pico_calibration.py and pico_percent_table.py to the Pico.
+Noise vs speed: set OVERSAMPLE / REDUCTION below; measure_oversampling()
+prints the noise (in 12-bit LSB) and scan time of each setting.
+
+Calibration: calibrate_all() saves to calibration.json, which is loaded
+at boot - type "c" + Enter in the live display, simple or scan mode to
+recalibrate.
 """
 
 from machine import Pin, ADC
+from array import array
 import time
 
+from pico_calibration import ConsoleCommands, load_calibration, save_calibration
+from pico_percent_table import CODE_SHIFT, build_table, volts_to_u16
+
 # ============== CONFIGURATION ==============
 
 # ADC pin connected to multiplexer output
@@ -23,7 +39,7 @@ SELECT_A_PIN = 10  # GP10 - LSB
 SELECT_B_PIN = 11  # GP11
 SELECT_C_PIN = 12  # GP12 - MSB
 
-# Calibration values (adjust based on your flex sensors)
+# Default calibration values, used until calibration.json exists
 # Flat position voltage and bent position voltage
 CALIBRATION = {
     0: {"flat": 1.2, "bent": 2.5, "name": "Thumb"},
@@ -31,12 +47,126 @@ CALIBRATION = {
     2: {"flat": 1.2, "bent": 2.5, "name": "Middle"},
     3: {"flat": 1.2, "bent": 2.5, "name": "Ring"},
     4: {"flat": 1.2, "bent": 2.5, "name": "Pinky"},
+    # More muxes (MUXES) need their own entries: 5-9 for the second glove...
 }
 
+# Oversampling engine (read_raw / read_voltage and the scan engine)
+# Each value is OVERSAMPLE back-to-back ADC reads reduced to one:
+#   "boxcar"  - plain mean (fastest; power-of-two factors use a shift)
+#   "median"  - middle reading (ignores spikes)
+#   "trimmed" - mean without the TRIM_FRACTION lowest and highest reads
+# More reads = less noise but a slower scan; see measure_oversampling()
+# The defaults (10 reads, 50 us apart) are the original fixed read_voltage()
+OVERSAMPLE = 10          # e.g. 4, 16 or 64
+REDUCTION = "boxcar"
+TRIM_FRACTION = 0.25     # Dropped at EACH end for "trimmed"
+SAMPLE_DELAY_US = 50     # Pause between reads (0 = back-to-back)
+
+# Multiplexers for the scan engine (MuxScanner), one per ADC pin.
+# Give each mux its own select pins so the next mux can be switched while
+# the current one is read; shared select pins also work (all muxes then
+# switch and settle together).
+MUXES = [
+    {"adc": 26, "select": (10, 11, 12)},
+    # {"adc": 27, "select": (13, 14, 15)},   # Second glove
+    # {"adc": 28, "select": (16, 17, 18)},   # Third mux (up to 24 sensors)
+]
+# CD4051 input each sensor is wired to, Thumb..Pinky (same on every mux).
+# Scans visit them in Gray-code order; with inputs 0-4 one step (2 -> 4)
+# still flips two select bits. For single-bit steps only, wire the pinky
+# to input 6 and use (0, 1, 2, 3, 6).
+MUX_INPUTS = (0, 1, 2, 3, 4)
+SETTLE_US = 100          # Mux settling time after switching
+SCAN_SAMPLES = 4         # ADC reads per sensor in a scan (reduced with REDUCTION)
+TABLE_SCALE = 100        # Percent tables hold percent x 100 (binary_protocol.PERCENT_SCALE)
+
+# main_scan() / main_binary(): scan on the second core (needs pico_dual_core.py)
+# so USB output never delays sampling. Core 0 only converts and sends.
+DUAL_CORE = False
+CORE1_RATE_HZ = 200      # Scans per second on core 1 (0 = back-to-back)
+
 # ============== SETUP ==============
 
+# Saved calibration replaces the defaults (names are kept)
+CALIBRATION, CALIBRATION_PROFILE = load_calibration(CALIBRATION)
+
+REDUCTIONS = ("boxcar", "median", "trimmed")
+
+
+class Oversampler:
+    """
+    Oversample-and-decimate one ADC into a single read_u16()-scale value.
+    
+    Tight integer loop, no allocation: median and trimmed mean insert
+    each reading into a preallocated sorted array('H') as it arrives.
+    """
+    
+    def __init__(self, adc, factor=OVERSAMPLE, reduction=REDUCTION,
+                 trim=TRIM_FRACTION, delay_us=SAMPLE_DELAY_US):
+        if reduction not in REDUCTIONS:
+            raise ValueError("reduction must be one of " + ", ".join(REDUCTIONS))
+        self.read_u16 = adc.read_u16      # Bound once, not per read
+        self.factor = factor
+        self.reduction = reduction
+        self.delay_us = delay_us
+        # Power-of-two factors decimate with a shift
+        self.shift = factor.bit_length() - 1 if factor & (factor - 1) == 0 else -1
+        self.sorted = array('H', [0] * factor)
+        drop = int(factor * trim)
+        if factor - 2 * drop < 1:
+            drop = (factor - 1) // 2
+        self.keep_from = drop
+        self.keep_to = factor - drop
+    
+    def read(self):
+        """One reduced value (0-65535)."""
+        read_u16 = self.read_u16
+        factor = self.factor
+        delay = self.delay_us
+        
+        if self.reduction == "boxcar":
+            total = 0
+            for _ in range(factor):
+                total += read_u16()
+                if delay:
+                    time.sleep_us(delay)
+            if self.shift >= 0:
+                return total >> self.shift
+            return total // factor
+        
+        # Insertion into the sorted buffer while reading
+        buf = self.sorted
+        for k in range(factor):
+            value = read_u16()
+            j = k
+            while j > 0 and buf[j - 1] > value:
+                buf[j] = buf[j - 1]
+                j -= 1
+            buf[j] = value
+            if delay:
+                time.sleep_us(delay)
+        
+        if self.reduction == "median":
+            middle = factor >> 1
+            if factor & 1:
+                return buf[middle]
+            return (buf[middle - 1] + buf[middle]) >> 1
+        
+        total = 0
+        for k in range(self.keep_from, self.keep_to):
+            total += buf[k]
+        return total // (self.keep_to - self.keep_from)
+    
+    def describe(self):
+        if self.reduction == "trimmed":
+            return "{}x trimmed (keep {} of {})".format(
+                self.factor, self.keep_to - self.keep_from, self.factor)
+        return "{}x {}".format(self.factor, self.reduction)
+
+
 # Initialize ADC
 adc = ADC(Pin(ADC_PIN))
+oversampler = Oversampler(adc)
 
 # Initialize multiplexer select pins
 select_a = Pin(SELECT_A_PIN, Pin.OUT)
@@ -47,7 +177,7 @@ select_c = Pin(SELECT_C_PIN, Pin.OUT)
 def select_channel(channel):
     """
     Select a channel on the CD4051 multiplexer.
-    Channel 0-7, we use 0-4 for 5 sensors.
+    Channel 0-7, we use the MUX_INPUTS ones (0-4) for 5 sensors.
     
     Channel selection table:
     Channel | C (GP12) | B (GP11) | A (GP10)
@@ -66,19 +196,15 @@ def select_channel(channel):
     time.sleep_us(100)
 
 
+def read_raw(channel):
+    """Oversampled read_u16() value of a sensor (integer only, no allocation)."""
+    select_channel(MUX_INPUTS[channel])
+    return oversampler.read()
+
+
 def read_voltage(channel):
     """Read voltage from a specific channel."""
-    select_channel(channel)
-    
-    # Take multiple readings and average for stability
-    readings = []
-    for _ in range(10):
-        readings.append(adc.read_u16())
-        time.sleep_us(50)
-    
-    avg_raw = sum(readings) / len(readings)
-    voltage = (avg_raw / 65535) * 3.3
-    return voltage
+    return (read_raw(channel) / 65535) * 3.3
 
 
 def read_all_sensors():
@@ -104,12 +230,35 @@ def voltage_to_percent(channel, voltage):
     return max(0, min(100, percent))
 
 
+def build_percent_table(channel):
+    """ADC code -> percent x TABLE_SCALE for one finger's calibration."""
+    cal = CALIBRATION[channel]
+    return build_table(volts_to_u16(cal["flat"]), volts_to_u16(cal["bent"]), TABLE_SCALE)
+
+
+# One 4096-entry table per calibrated sensor (8 KB each). Built on first
+# use, not at import (tens of ms and 40 KB for five), and dropped on calibration
+PERCENT_TABLES = [None] * len(CALIBRATION)
+
+
+def percent_table(channel):
+    """The finger's percent table, built the first time it is needed."""
+    table = PERCENT_TABLES[channel]
+    if table is None:
+        table = PERCENT_TABLES[channel] = build_percent_table(channel)
+    return table
+
+
+def raw_to_percent(index, raw):
+    """Frame value -> percent x TABLE_SCALE, using the table of that sensor."""
+    return percent_table(index)[raw >> CODE_SHIFT]
+
+
 def read_all_percentages():
     """Read all sensors and return bend percentages."""
     percentages = {}
     for channel in range(5):
-        voltage = read_voltage(channel)
-        percentages[channel] = voltage_to_percent(channel, voltage)
+        percentages[channel] = raw_to_percent(channel, read_raw(channel)) / TABLE_SCALE
     return percentages
 
 
@@ -139,13 +288,16 @@ def calibrate_sensor(channel):
     
     CALIBRATION[channel]["flat"] = flat_v
     CALIBRATION[channel]["bent"] = bent_v
+    PERCENT_TABLES[channel] = None      # Rebuilt from the new values on next use
     
-    print(f"  Calibration saved!")
+    print(f"  {name} updated")
     return flat_v, bent_v
 
 
-def calibrate_all():
-    """Calibrate all 5 sensors interactively."""
+def calibrate_all(profile=None):
+    """Calibrate all 5 sensors interactively and save to calibration.json."""
+    global CALIBRATION_PROFILE
+    
     print("\n" + "="*50)
     print("    5-FINGER FLEX SENSOR CALIBRATION")
     print("="*50)
@@ -153,12 +305,264 @@ def calibrate_all():
     for channel in range(5):
         calibrate_sensor(channel)
     
+    if profile is None:
+        profile = input("Profile name (Enter = default): ").strip() or "default"
+    save_calibration(CALIBRATION, profile)
+    CALIBRATION_PROFILE = profile
+    
     print("\n=== CALIBRATION COMPLETE ===")
-    print("\nCalibration values (copy to CALIBRATION dict):")
-    print("CALIBRATION = {")
     for ch, cal in CALIBRATION.items():
-        print(f'    {ch}: {{"flat": {cal["flat"]:.3f}, "bent": {cal["bent"]:.3f}, "name": "{cal["name"]}"}},')
-    print("}")
+        print(f'  {cal["name"]:7s} flat {cal["flat"]:.3f}V  bent {cal["bent"]:.3f}V')
+    print(f"Saved '{profile}' to calibration.json (loaded at every boot)")
+
+
+def check_console(commands, sampler=None):
+    """Run calibrate_all() when "c" was typed in the serial console."""
+    if commands.poll() == "c":
+        # Calibration drives the mux itself - pause a core 1 sampler
+        if sampler is not None:
+            sampler.stop()
+        calibrate_all()
+        if sampler is not None:
+            sampler.start()
+
+
+# ============== SCAN ENGINE ==============
+
+# Gray-code order of CD4051 channels: one select bit changes per step,
+# so the mux output glitches less and settles faster. A subset of inputs
+# keeps that only if it is a run of this cycle (see MUX_INPUTS).
+GRAY_ORDER = (0, 1, 3, 2, 6, 7, 5, 4)
+
+# Scan-rate window: small enough that the microsecond sum stays a small
+# int (scan() runs on core 1, which must never allocate)
+RATE_WINDOW = 64
+SCAN_COUNT_MASK = 0x3FFFFFFF
+
+
+class MuxScanner:
+    """
+    Scans up to three CD4051 multiplexers (one per ADC) into one frame.
+    
+    The wired inputs (MUX_INPUTS) are visited in Gray-code order and each
+    reading is stored at its sensor's place. With separate select pins,
+    each mux is switched to its next channel right after it is read, so it
+    settles while the other muxes are being read; only the leftover part
+    of SETTLE_US is ever waited for.
+    
+    scan() fills and returns the same preallocated array('H') every time:
+    frame[mux * sensors_per_mux + sensor] = averaged raw ADC (0-65535).
+    """
+    
+    def __init__(self, muxes=MUXES, inputs=MUX_INPUTS,
+                 settle_us=SETTLE_US, samples=SCAN_SAMPLES):
+        self.adcs = [ADC(Pin(m["adc"])) for m in muxes]
+        self.samplers = [Oversampler(a, samples, delay_us=0) for a in self.adcs]
+        pins = {}
+        self.selects = []
+        for m in muxes:
+            # Reuse Pin objects when muxes share select lines
+            self.selects.append([pins.setdefault(n, Pin(n, Pin.OUT)) for n in m["select"]])
+        self.shared = all(m["select"] == muxes[0]["select"] for m in muxes)
+        
+        self.mux_count = len(muxes)
+        self.sensors_per_mux = sensors_per_mux = len(inputs)
+        self.settle_us = settle_us
+        self.samples = samples
+        # Walk order: mux inputs in Gray order, and the sensor read at each
+        self.order = [c for c in GRAY_ORDER if c in inputs]
+        self.slots = [inputs.index(c) for c in self.order]
+        self.frame = array('H', [0] * (self.mux_count * sensors_per_mux))
+        self.switched_at = array('I', [0] * self.mux_count)
+        
+        # Scan statistics (all stay small ints)
+        self.scans = 0
+        self.last_scan_us = 0
+        self.window_scans = 0
+        self.window_us = 0
+        self.rate_hz = 0
+    
+    def _select(self, mux, channel):
+        pins = self.selects[mux]
+        pins[0].value(channel & 0x01)
+        pins[1].value((channel >> 1) & 0x01)
+        pins[2].value((channel >> 2) & 0x01)
+        self.switched_at[mux] = time.ticks_us()
+    
+    def _wait_settled(self, mux):
+        elapsed = time.ticks_diff(time.ticks_us(), self.switched_at[mux])
+        remaining = self.settle_us - elapsed
+        if remaining > 0:
+            time.sleep_us(remaining)
+    
+    def _read(self, mux):
+        return self.samplers[mux].read()
+    
+    def scan(self):
+        """Read every sensor on every mux and return the frame array."""
+        start = time.ticks_us()
+        order = self.order
+        slots = self.slots
+        steps = len(order)
+        frame = self.frame
+        per_mux = self.sensors_per_mux
+        
+        if self.shared:
+            # One select write (and one settle) serves all muxes
+            for step in range(steps):
+                self._select(0, order[step])
+                self._wait_settled(0)
+                slot = slots[step]
+                for mux in range(self.mux_count):
+                    frame[mux * per_mux + slot] = self._read(mux)
+        else:
+            for mux in range(self.mux_count):
+                self._select(mux, order[0])
+            for step in range(steps):
+                slot = slots[step]
+                next_channel = order[step + 1] if step + 1 < steps else order[0]
+                for mux in range(self.mux_count):
+                    self._wait_settled(mux)
+                    frame[mux * per_mux + slot] = self._read(mux)
+                    # Start the next channel settling while other muxes are read
+                    self._select(mux, next_channel)
+        
+        self.last_scan_us = time.ticks_diff(time.ticks_us(), start)
+        self.scans = (self.scans + 1) & SCAN_COUNT_MASK
+        self.window_us += self.last_scan_us
+        self.window_scans += 1
+        if self.window_scans == RATE_WINDOW:
+            self.rate_hz = RATE_WINDOW * 1000000 // max(1, self.window_us)
+            self.window_scans = 0
+            self.window_us = 0
+        return frame
+    
+    def scan_rate_hz(self):
+        """Full-frame scans per second over the last complete window."""
+        if self.rate_hz == 0 and self.window_us:
+            # Before the first window is complete
+            return self.window_scans * 1000000 // self.window_us
+        return self.rate_hz
+    
+    def report(self):
+        return "{} sensors | last scan {}us | {} frames/s".format(
+            len(self.frame), self.last_scan_us, self.scan_rate_hz())
+
+
+def start_core1_scan(scanner):
+    """Run scanner.scan() on core 1; returns (sampler, frame for read())."""
+    from pico_dual_core import CoreSampler
+    
+    sampler = CoreSampler(scanner.scan, len(scanner.frame), CORE1_RATE_HZ)
+    frame = sampler.new_frame()
+    sampler.start()
+    return sampler, frame
+
+
+def main_scan():
+    """
+    Scan all muxes (MUXES) and print one CSV line of percentages per frame,
+    5 values per glove in Thumb..Pinky order. Scan rate is reported every
+    5 seconds on a line starting with '#'.
+    """
+    scanner = MuxScanner()
+    count = len(scanner.frame)
+    if count > len(PERCENT_TABLES):
+        # Never convert a second glove with the first glove's calibration
+        raise ValueError("{} sensors scanned but only {} calibrated - add "
+                         "CALIBRATION entries for the other muxes".format(
+                             count, len(PERCENT_TABLES)))
+    percents = array('H', [0] * count)
+    last_report = time.ticks_ms()
+    commands = ConsoleCommands()
+    
+    print(f"# Scan engine: {scanner.mux_count} mux(es), {count} sensors, "
+          f"{'shared' if scanner.shared else 'separate'} select lines")
+    
+    sampler = None
+    if DUAL_CORE:
+        sampler, frame = start_core1_scan(scanner)
+        print(f"# Scanning on core 1 at {CORE1_RATE_HZ or 'max'} Hz")
+    
+    try:
+        while True:
+            if sampler is None:
+                frame = scanner.scan()
+            elif sampler.read(frame) is None:
+                time.sleep_ms(1)
+                continue
+            for i in range(count):
+                percents[i] = raw_to_percent(i, frame[i])
+            # Integer-only formatting of percent x 100 as one decimal
+            print(",".join("%d.%d" % (p // 100, p % 100 // 10) for p in percents))
+            
+            now = time.ticks_ms()
+            if time.ticks_diff(now, last_report) >= 5000:
+                last_report = now
+                print("# " + scanner.report())
+                if sampler is not None:
+                    print("# " + sampler.report())
+            
+            check_console(commands, sampler)
+            if sampler is None:
+                time.sleep_ms(10)
+            
+    except KeyboardInterrupt:
+        print("# " + scanner.report())
+    finally:
+        if sampler is not None:
+            sampler.stop()
+            print("# " + sampler.report())
+
+
+# ============== OVERSAMPLING MEASUREMENT ==============
+
+def measure_oversampling(channel=0, reads=200, factors=(1, 4, 16, 64),
+                         reductions=REDUCTIONS):
+    """
+    Noise and speed of every oversampling setting, to pick one per booth.
+    
+    Keep the sensor on `channel` still. For each factor and reduction it
+    prints the RMS and peak-to-peak noise in 12-bit ADC steps (LSB) over
+    `reads` values, and the time for one 5-finger read (read_raw x 5,
+    including the mux settling). Set OVERSAMPLE / REDUCTION to the row
+    you like.
+    """
+    global oversampler
+    current = oversampler
+    lsb = 65536 / 4096      # read_u16() units per real ADC step
+    
+    print("\nOversampling on channel {} ({} reads each) - keep the sensor still".format(
+        channel, reads))
+    print("{:<26s} {:>9s} {:>9s} {:>10s} {:>8s}".format(
+        "setting", "rms LSB", "p-p LSB", "5-ch scan", "scans/s"))
+    
+    try:
+        for factor in factors:
+            for reduction in reductions:
+                if factor < 3 and reduction != "boxcar":
+                    continue    # Nothing to sort or trim
+                oversampler = Oversampler(adc, factor, reduction)
+                
+                select_channel(MUX_INPUTS[channel])
+                values = [oversampler.read() for _ in range(reads)]
+                mean = sum(values) / reads
+                rms = (sum((v - mean) ** 2 for v in values) / reads) ** 0.5
+                spread = max(values) - min(values)
+                
+                scans = 20
+                start = time.ticks_us()
+                for _ in range(scans):
+                    for ch in range(5):
+                        read_raw(ch)
+                scan_us = time.ticks_diff(time.ticks_us(), start) // scans
+                
+                print("{:<26s} {:>9.2f} {:>9.1f} {:>8d}us {:>8d}".format(
+                    oversampler.describe(), rms / lsb, spread / lsb,
+                    scan_us, 1000000 // max(1, scan_us)))
+    finally:
+        oversampler = current
+    print("\nCurrent setting: " + oversampler.describe())
 
 
 def print_sensor_bar(name, percent, width=30):
@@ -174,6 +578,7 @@ def main_live_display():
     print("    5 FLEX SENSORS - LIVE READINGS")
     print("="*50)
     print("Press Ctrl+C to stop\n")
+    commands = ConsoleCommands()
     
     try:
         while True:
@@ -185,20 +590,24 @@ def main_live_display():
             print("╠════════════════════════════════════════════════╣")
             
             for channel in range(5):
-                voltage = read_voltage(channel)
-                percent = voltage_to_percent(channel, voltage)
+                raw = read_raw(channel)
+                percent = raw_to_percent(channel, raw)      # x TABLE_SCALE
+                voltage = raw * 3.3 / 65535
                 name = CALIBRATION[channel]["name"]
                 
                 # Create visual bar
                 bar_width = 25
-                filled = int((percent / 100) * bar_width)
+                filled = percent * bar_width // (100 * TABLE_SCALE)
                 bar = "█" * filled + "░" * (bar_width - filled)
                 
-                print(f"║ {name:7s} │{bar}│ {percent:5.1f}% │ {voltage:.2f}V ║")
+                whole = percent // TABLE_SCALE
+                tenth = percent % TABLE_SCALE * 10 // TABLE_SCALE
+                print(f"║ {name:7s} │{bar}│ {whole:3d}.{tenth}% │ {voltage:.2f}V ║")
             
             print("╚════════════════════════════════════════════════╝")
-            print("\n[Press Ctrl+C to exit]")
+            print(f"\n[Profile: {CALIBRATION_PROFILE or 'defaults'} | c + Enter = calibrate | Ctrl+C = exit]")
             
+            check_console(commands)
             time.sleep_ms(100)
             
     except KeyboardInterrupt:
@@ -208,18 +617,19 @@ def main_live_display():
 def main_simple():
     """Simple main loop - prints raw values."""
     print("\n5 Flex Sensors - Simple Reading Mode")
-    print("Press Ctrl+C to stop\n")
+    print("Press Ctrl+C to stop, c + Enter to calibrate\n")
+    commands = ConsoleCommands()
     
     try:
         while True:
             values = []
             for channel in range(5):
-                voltage = read_voltage(channel)
-                percent = voltage_to_percent(channel, voltage)
+                percent = raw_to_percent(channel, read_raw(channel))
                 name = CALIBRATION[channel]["name"]
-                values.append(f"{name}:{percent:.0f}%")
+                values.append(f"{name}:{(percent + TABLE_SCALE // 2) // TABLE_SCALE}%")
             
             print(" | ".join(values))
+            check_console(commands)
             time.sleep_ms(200)
             
     except KeyboardInterrupt:
@@ -234,12 +644,12 @@ def main_json():
         while True:
             data = {}
             for channel in range(5):
-                voltage = read_voltage(channel)
-                percent = voltage_to_percent(channel, voltage)
+                raw = read_raw(channel)
+                percent = raw_to_percent(channel, raw)
                 name = CALIBRATION[channel]["name"].lower()
                 data[name] = {
-                    "voltage": round(voltage, 3),
-                    "percent": round(percent, 1)
+                    "voltage": round(raw * 3.3 / 65535, 3),
+                    "percent": round(percent / TABLE_SCALE, 1)
                 }
             
             import json
@@ -250,6 +660,55 @@ def main_json():
         print("\nStopped.")
 
 
+def main_binary():
+    """
+    Output readings as compact binary frames (see binary_protocol.py).
+    
+    Copy binary_protocol.py to the Pico next to this file.
+    Channels are percent x 100 (0-10000) in Thumb..Pinky order.
+    Read on the computer with: python five_sensor_bridge.py --binary
+    
+    With DUAL_CORE the mux is scanned on core 1 at CORE1_RATE_HZ and every
+    new frame is sent with the ticks_us of its scan; a stalled USB write
+    then only delays sending, never sampling.
+    """
+    import sys
+    from binary_protocol import FrameEncoder
+    
+    encoder = FrameEncoder(5)
+    values = [0] * 5
+    out = sys.stdout.buffer
+    
+    sampler = None
+    if DUAL_CORE:
+        sampler, frame = start_core1_scan(MuxScanner())
+    
+    try:
+        while True:
+            if sampler is None:
+                ticks = time.ticks_us()
+                for channel in range(5):
+                    # Table entries already are percent x 100
+                    values[channel] = raw_to_percent(channel, read_raw(channel))
+            else:
+                ticks = sampler.read(frame)
+                if ticks is None:
+                    time.sleep_ms(1)
+                    continue
+                for channel in range(5):
+                    values[channel] = raw_to_percent(channel, frame[channel])
+            
+            out.write(encoder.encode(ticks, values))
+            if sampler is None:
+                time.sleep_ms(10)
+            
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if sampler is not None:
+            sampler.stop()
+
+
 # ============== RUN ==============
 
 if __name__ == "__main__":
@@ -260,7 +719,14 @@ if __name__ == "__main__":
     print("  1. Run main_live_display() - Visual monitor")
     print("  2. Run main_simple() - Simple text output")
     print("  3. Run main_json() - JSON output for Unity/apps")
-    print("  4. Run calibrate_all() - Calibrate all sensors")
+    print("  4. Run calibrate_all() - Calibrate all sensors (saved to calibration.json)")
+    print("  5. Run main_binary() - Binary frames for five_sensor_bridge.py --binary")
+    print("  6. Run main_scan() - Multi-mux scan engine CSV output")
+    print("  7. Run measure_oversampling() - Noise vs scan time per setting")
+    if CALIBRATION_PROFILE is None:
+        print("\nNo calibration.json yet - using default calibration")
+    else:
+        print(f"\nLoaded calibration profile '{CALIBRATION_PROFILE}'")
     print("\nStarting live display in 3 seconds...")
     time.sleep(3)
     
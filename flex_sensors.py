@@ -6,11 +6,21 @@ Outputs percentage values: 0% = flat, 100% = fully bent.
 
 Wiring: Each sensor uses voltage divider with 10kΩ resistor and
         100nF + 1000nF capacitors for noise filtering.
+
+Copy pico_filters.py, pico_calibration.py and pico_percent_table.py to the
+Pico next to this file.
+Calibration is stored in calibration.json on the Pico and loaded at boot;
+type "c" + Enter in the serial console to recalibrate at any time.
 """
 
 from machine import ADC, Pin
+from array import array
 import time
 
+from pico_calibration import ConsoleCommands, load_calibration, save_calibration
+from pico_filters import MovingAverage
+from pico_percent_table import CODE_SHIFT, build_table
+
 
 # ============================================================================
 # CONFIGURATION
@@ -21,8 +31,8 @@ FLEX1_PIN = 26  # GP26 = ADC0
 FLEX2_PIN = 27  # GP27 = ADC1
 FLEX3_PIN = 28  # GP28 = ADC2
 
-# Calibration values (ADC readings 0-65535)
-# Adjust these after running calibration!
+# Default calibration values (ADC readings 0-65535)
+# Used until a calibration has been saved to calibration.json
 CALIBRATION = {
     "flex1": {"flat": 30000, "bent": 50000},
     "flex2": {"flat": 30000, "bent": 50000},
@@ -33,6 +43,15 @@ CALIBRATION = {
 SMOOTHING_SAMPLES = 10  # Number of samples for moving average
 READ_DELAY_MS = 50      # Delay between readings in milliseconds
 
+# Fixed-rate timer sampling (needs pico_sampler.py on the Pico)
+# 0 = sample in the main loop (old behaviour), e.g. 500 or 1000 = Hz
+SAMPLE_RATE_HZ = 0
+
+# Sample on the second core (needs pico_dual_core.py on the Pico), so a
+# slow USB write never delays sampling. Uses SAMPLE_RATE_HZ as the rate
+# (0 = as fast as the ADC allows)
+SAMPLE_ON_CORE1 = False
+
 
 # ============================================================================
 # SENSOR CLASS
@@ -53,12 +72,17 @@ class FlexSensor:
         """
         self.adc = ADC(Pin(pin_number))
         self.name = name
+        self.set_calibration(flat_value, bent_value)
+        
+        # Ring buffer with running total for smoothing
+        self.average = MovingAverage(SMOOTHING_SAMPLES)
+    
+    def set_calibration(self, flat_value, bent_value):
+        """Apply new flat/bent values and rebuild the percent table."""
         self.flat_value = flat_value
         self.bent_value = bent_value
-        
-        # Buffer for smoothing
-        self.samples = [0] * SMOOTHING_SAMPLES
-        self.sample_index = 0
+        # 4096-entry ADC code -> percent table: no float maths per sample
+        self.table = build_table(flat_value, bent_value)
         
     def read_raw(self):
         """Read raw ADC value (0-65535)."""
@@ -66,28 +90,35 @@ class FlexSensor:
     
     def add_sample(self, value):
         """Add a sample to the smoothing buffer."""
-        self.samples[self.sample_index] = value
-        self.sample_index = (self.sample_index + 1) % SMOOTHING_SAMPLES
+        self.average.update(value)
         
     def get_smoothed(self):
         """Get the smoothed (averaged) value."""
-        return sum(self.samples) // SMOOTHING_SAMPLES
+        return self.average.value()
     
     def read_smoothed(self):
         """Read a new sample and return smoothed value."""
-        raw = self.read_raw()
-        self.add_sample(raw)
-        return self.get_smoothed()
+        return self.average.update(self.adc.read_u16())
     
     def get_percentage(self):
         """
-        Calculate bend percentage.
+        Read a new sample and calculate bend percentage.
         
         Returns:
             Percentage from 0 (flat) to 100 (fully bent), clamped.
         """
-        smoothed = self.read_smoothed()
-        
+        return self.to_percentage(self.read_smoothed())
+    
+    def current_percentage(self):
+        """Bend percentage of the samples already in the buffer."""
+        return self.to_percentage(self.get_smoothed())
+    
+    def to_percentage(self, smoothed):
+        """Convert a smoothed ADC value to a clamped 0-100 percentage."""
+        return self.table[smoothed >> CODE_SHIFT]
+    
+    def to_percentage_float(self, smoothed):
+        """The same conversion in floating point (reference for the table)."""
         # Avoid division by zero
         range_value = self.bent_value - self.flat_value
         if range_value == 0:
@@ -113,7 +144,7 @@ def run_calibration(sensors):
     Instructions:
     1. Keep all sensors FLAT, press Enter
     2. Bend all sensors FULLY, press Enter
-    3. New calibration values are printed
+    3. New values are applied and saved to calibration.json
     """
     print("\n" + "=" * 50)
     print("        FLEX SENSOR CALIBRATION")
@@ -160,17 +191,20 @@ def run_calibration(sensors):
         bent_values.append(bent_val)
         print(f"  {sensor.name} BENT: {bent_val}")
     
-    # Print new calibration values
-    print("\n" + "=" * 50)
-    print("        NEW CALIBRATION VALUES")
-    print("=" * 50)
-    print("\nCopy this into the CALIBRATION section:\n")
-    print("CALIBRATION = {")
+    # Apply and store the new calibration
+    calibration = {}
     for i, sensor in enumerate(sensors):
+        sensor.set_calibration(flat_values[i], bent_values[i])
         name_key = sensor.name.lower().replace(" ", "")
-        print(f'    "{name_key}": {{"flat": {flat_values[i]}, "bent": {bent_values[i]}}},')
-    print("}")
+        calibration[name_key] = {"flat": flat_values[i], "bent": bent_values[i]}
+    
+    print("\nProfile name (Enter = default): ", end="")
+    profile = input().strip() or "default"
+    save_calibration(calibration, profile)
+    
     print("\n" + "=" * 50)
+    print(f"   Saved '{profile}' to calibration.json")
+    print("=" * 50)
 
 
 # ============================================================================
@@ -184,22 +218,25 @@ def main():
     print("   3 FLEX SENSOR READER - Raspberry Pi Pico")
     print("=" * 50)
     
+    # Stored calibration (falls back to the defaults above)
+    calibration, profile = load_calibration(CALIBRATION)
+    
     # Initialize sensors
     sensors = [
         FlexSensor(
             FLEX1_PIN, "Flex1",
-            CALIBRATION["flex1"]["flat"],
-            CALIBRATION["flex1"]["bent"]
+            calibration["flex1"]["flat"],
+            calibration["flex1"]["bent"]
         ),
         FlexSensor(
             FLEX2_PIN, "Flex2",
-            CALIBRATION["flex2"]["flat"],
-            CALIBRATION["flex2"]["bent"]
+            calibration["flex2"]["flat"],
+            calibration["flex2"]["bent"]
         ),
         FlexSensor(
             FLEX3_PIN, "Flex3",
-            CALIBRATION["flex3"]["flat"],
-            CALIBRATION["flex3"]["bent"]
+            calibration["flex3"]["flat"],
+            calibration["flex3"]["bent"]
         ),
     ]
     
@@ -208,21 +245,14 @@ def main():
     print(f"  - Flex2 on GP{FLEX2_PIN} (ADC1)")
     print(f"  - Flex3 on GP{FLEX3_PIN} (ADC2)")
     
-    # Ask for calibration
-    print("\nOptions:")
-    print("  [C] Run calibration")
-    print("  [R] Start reading (use existing calibration)")
-    print("\nChoice (C/R): ", end="")
+    if profile is None:
+        print("\nNo calibration.json yet - using default calibration")
+    else:
+        print(f"\nLoaded calibration profile '{profile}'")
+    print('Type "c" + Enter at any time to recalibrate')
     
-    try:
-        choice = input().strip().upper()
-    except:
-        choice = "R"  # Default to reading if no input
-    
-    if choice == "C":
-        run_calibration(sensors)
-        print("\nNow starting normal reading mode...\n")
-        time.sleep(1)
+    # Streaming starts right away; calibration is a console command
+    commands = ConsoleCommands()
     
     # Prime smoothing buffers before reading
     print("\nPriming sensors...")
@@ -231,6 +261,14 @@ def main():
             sensor.read_smoothed()
         time.sleep_ms(10)
     
+    if SAMPLE_ON_CORE1:
+        run_core1_sampling(sensors, commands)
+        return
+    
+    if SAMPLE_RATE_HZ:
+        run_timer_sampling(sensors, commands)
+        return
+    
     print("\nReading sensors (Ctrl+C to stop):\n")
     print("-" * 50)
     
@@ -246,12 +284,105 @@ def main():
             output = f"Flex1: {p1:3d}% | Flex2: {p2:3d}% | Flex3: {p3:3d}%"
             print(output)
             
+            if commands.poll() == "c":
+                run_calibration(sensors)
+            
             time.sleep_ms(READ_DELAY_MS)
             
     except KeyboardInterrupt:
         print("\n\nStopped by user.")
 
 
+def run_sampler_loop(sensors, commands, sampler, next_frame):
+    """
+    Shared loop of the timer and core 1 modes.
+    
+    Feeds every frame next_frame() returns (None = nothing new) into the
+    sensors, prints percentages every READ_DELAY_MS and the sampler report
+    every 5 s. Printing never delays sampling. The sampler is paused while
+    "c" runs the calibration, which reads the ADCs itself.
+    """
+    sampler.start()
+    last_print = time.ticks_ms()
+    last_report = last_print
+    
+    try:
+        while True:
+            while True:
+                frame = next_frame()
+                if frame is None:
+                    break
+                for i, sensor in enumerate(sensors):
+                    sensor.add_sample(frame[i])
+            
+            now = time.ticks_ms()
+            if time.ticks_diff(now, last_print) >= READ_DELAY_MS:
+                last_print = now
+                p1 = sensors[0].current_percentage()
+                p2 = sensors[1].current_percentage()
+                p3 = sensors[2].current_percentage()
+                print(f"Flex1: {p1:3d}% | Flex2: {p2:3d}% | Flex3: {p3:3d}%")
+            
+            if time.ticks_diff(now, last_report) >= 5000:
+                last_report = now
+                print(f"[Sampler] {sampler.report()}")
+            
+            if commands.poll() == "c":
+                sampler.stop()
+                run_calibration(sensors)
+                sampler.start()
+            
+            time.sleep_ms(1)
+            
+    except KeyboardInterrupt:
+        print("\n\nStopped by user.")
+    finally:
+        sampler.stop()
+        print(f"[Sampler] {sampler.report()}")
+
+
+def run_timer_sampling(sensors, commands):
+    """Sample at exactly SAMPLE_RATE_HZ from a hardware timer."""
+    from pico_sampler import FixedRateSampler
+    
+    sampler = FixedRateSampler([s.adc for s in sensors], rate_hz=SAMPLE_RATE_HZ)
+    frame = sampler.new_frame()
+    
+    def next_frame():
+        # Oldest frame the timer captured (drained until the ring is empty)
+        return frame if sampler.read(frame) is not None else None
+    
+    print(f"\nTimer sampling at {SAMPLE_RATE_HZ} Hz (Ctrl+C to stop):\n")
+    print("-" * 50)
+    run_sampler_loop(sensors, commands, sampler, next_frame)
+
+
+def run_core1_sampling(sensors, commands):
+    """Sample on core 1; filter and print on core 0."""
+    from pico_dual_core import CoreSampler
+    
+    adcs = [s.adc for s in sensors]
+    raw = array('H', [0] * len(adcs))
+    
+    def read_adcs():
+        # Runs on core 1: no allocation
+        for i in range(len(adcs)):
+            raw[i] = adcs[i].read_u16()
+        return raw
+    
+    sampler = CoreSampler(read_adcs, len(adcs), rate_hz=SAMPLE_RATE_HZ)
+    frame = sampler.new_frame()
+    
+    def next_frame():
+        # Newest frame from core 1, once
+        return frame if sampler.read(frame) is not None else None
+    
+    rate = f"{SAMPLE_RATE_HZ} Hz" if SAMPLE_RATE_HZ else "full speed"
+    print(f"\nCore 1 sampling at {rate} (Ctrl+C to stop):\n")
+    print("-" * 50)
+    run_sampler_loop(sensors, commands, sampler, next_frame)
+
+
 # Run the program
 if __name__ == "__main__":
     main()